@@ -8,6 +8,7 @@ from jose import jwt, JWTError
 from app.db.session import get_db
 from app.core.config import settings
 from app.crud import users as users_crud
+from app.services.auth_cache import auth_cache
 
 security = HTTPBearer(auto_error=False)
 
@@ -26,18 +27,28 @@ async def get_current_user(
 
     token = credentials.credentials
 
-    try:
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM],
-        )
-        user_id = int(payload.get("sub"))
-    except (JWTError, ValueError, TypeError):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-        )
+    # Signature and expiry are checked once per token, then cached
+    claims = auth_cache.get_claims(token)
+    if claims is None:
+        try:
+            payload = jwt.decode(
+                token,
+                settings.SECRET_KEY,
+                algorithms=[settings.JWT_ALGORITHM],
+            )
+            claims = (int(payload.get("sub")), int(payload.get("iat") or 0))
+            exp = float(payload["exp"])
+        except (JWTError, ValueError, TypeError, KeyError):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid authentication credentials",
+            )
+        auth_cache.put_claims(token, *claims, exp)
+
+    user_id, iat = claims
+    user = auth_cache.get_user(user_id, iat)
+    if user is not None:
+        return user
 
     user = await users_crud.get_user_by_id(db, user_id)
     if not user:
@@ -46,4 +57,7 @@ async def get_current_user(
             detail="User not found",
         )
 
+    # Detached, so the cached row never belongs to another request's session
+    db.expunge(user)
+    auth_cache.put_user(user_id, iat, user)
     return user
@@ -1,9 +1,9 @@
 from fastapi import APIRouter
-from app.services.instrument_registry import load_instruments
+from app.services.instrument_registry import refresh_instruments
 
 router = APIRouter()
 
 @router.get("/load-instruments")
-def load_all():
-    load_instruments()
+async def load_all():
+    await refresh_instruments(force=True)
     return {"status": "instruments loaded"}
@@ -7,19 +7,28 @@ from app.schemas import UserCreate, UserOut, UserLogin, Token
 from app.crud import users as users_crud
 from app.api.deps import get_db
 from app.core.config import settings
-from app.crud.users import verify_password
+from app.services.password_hasher import HasherBusy, password_hasher
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 def create_access_token(subject: str) -> str:
-    expire = datetime.utcnow() + timedelta(
+    issued = datetime.utcnow()
+    expire = issued + timedelta(
         minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
     )
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {"exp": expire, "iat": issued, "sub": str(subject)}
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
 
 
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many login attempts in progress, retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/signup", response_model=UserOut)
 async def signup(
     user_in: UserCreate,
@@ -31,7 +40,11 @@ async def signup(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
-    user = await users_crud.create_user(db, user_in)
+    try:
+        hashed = await password_hasher.hash(user_in.password)
+    except HasherBusy:
+        raise _busy()
+    user = await users_crud.create_user(db, user_in, hashed)
     return user
 
 
@@ -41,7 +54,13 @@ async def login(
     db: AsyncSession = Depends(get_db),
 ):
     user = await users_crud.get_user_by_email(db, credentials.email)
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    try:
+        valid = user is not None and await password_hasher.verify(
+            credentials.password, user.hashed_password
+        )
+    except HasherBusy:
+        raise _busy()
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
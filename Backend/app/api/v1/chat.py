@@ -1,40 +1,37 @@
 # app/api/v1/chat.py
 
-from fastapi import APIRouter, Depends
+import json
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas import ChatRequest, ChatResponse
-from app.services.llm_client import LLMClient
-from app.services.embeddings import EmbeddingsStore
-from app.api.deps import get_db, get_current_user
+from app.services.llm_client import get_llm_client
+from app.services.embeddings import get_embeddings_store
+from app.services.explanation_cache import explanation_cache
+from app.api.deps import get_current_user
+from app.db.session import get_read_db
+from app.crud import documents as documents_crud
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
-llm_client = LLMClient()
-emb_store = EmbeddingsStore()
-
 
-@router.post("/query", response_model=ChatResponse)
-async def chat_query(
-    payload: ChatRequest,
-    db: AsyncSession = Depends(get_db),
-    user=Depends(get_current_user),
-):
+async def _build_chat_prompt(payload: ChatRequest, db: AsyncSession):
     """
-    Main AI chat endpoint for BullSeye.
-    Uses:
-    - Embeddings (RAG-ready)
-    - Gemini LLM
-    - JWT-protected access
+    RAG step shared by the blocking and streaming endpoints:
+    returns (system_prompt, user_message, source doc ids).
     """
-
     question = payload.question
+    emb_store = get_embeddings_store()
 
     # 1️⃣ Embed user question
-    q_emb = emb_store.embed_text(question)
+    q_emb = await emb_store.aembed_text(question)
 
     # 2️⃣ Retrieve relevant documents (vector search)
-    docs = emb_store.similarity_search(q_emb, top_k=payload.top_k)
+    hits = emb_store.similarity_search(q_emb, top_k=payload.top_k)
+    rows = await documents_crud.get_documents_by_ids(db, [h["id"] for h in hits])
+    docs = [{"id": r.doc_id, "text": r.text} for r in rows]
 
     # 3️⃣ Build context from retrieved docs
     context_text = "\n\n".join(
@@ -59,8 +56,42 @@ User question:
 {question}
 """
 
+    return system_prompt, user_message, [d.get("id", "") for d in docs]
+
+
+def _llm_or_503():
+    """
+    The LLM client, or 503 if it is not configured (no GEMINI_API_KEY).
+    """
+    try:
+        return get_llm_client()
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+def _sse(data: dict, event: str | None = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+@router.post("/query", response_model=ChatResponse)
+async def chat_query(
+    payload: ChatRequest,
+    db: AsyncSession = Depends(get_read_db),
+    user=Depends(get_current_user),
+):
+    """
+    Main AI chat endpoint for BullSeye.
+    Uses:
+    - Embeddings (RAG-ready)
+    - Gemini LLM
+    - JWT-protected access
+    """
+    llm = _llm_or_503()
+    system_prompt, user_message, sources = await _build_chat_prompt(payload, db)
+
     # 4️⃣ Generate AI response via Gemini
-    answer = llm_client.chat(
+    answer = await llm.achat(
         system_prompt=system_prompt,
         user_message=user_message,
     )
@@ -68,9 +99,47 @@ User question:
     # 5️⃣ Return response
     return ChatResponse(
         answer=answer,
-        sources=[d.get("id", "") for d in docs],
+        sources=sources,
     )
-    
+
+
+@router.post("/query/stream")
+async def chat_query_stream(
+    payload: ChatRequest,
+    db: AsyncSession = Depends(get_read_db),
+    user=Depends(get_current_user),
+):
+    """
+    Same as /query, streamed as Server-Sent Events:
+
+        event: sources  data: {"sources": [...]}
+        (default)       data: {"token": "..."}   one per chunk
+        event: done     data: {}
+    """
+    # Configuration and request errors must surface before the 200
+    llm = _llm_or_503()
+
+    system_prompt, user_message, sources = await _build_chat_prompt(payload, db)
+
+    try:
+        tokens = await llm.aopen_stream(system_prompt, user_message)
+    except Exception as e:
+        print(f"Gemini API Error: {e}")
+        raise HTTPException(status_code=503, detail=f"AI service error: {e}")
+
+    async def events():
+        yield _sse({"sources": sources}, event="sources")
+        async for token in tokens:
+            yield _sse({"token": token})
+        yield _sse({}, event="done")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/explain-indicators")
 async def explain_indicators(
     payload: dict,
@@ -79,6 +148,7 @@ async def explain_indicators(
     """
     Explain technical indicators like RSI, SMA, EMA using AI.
     """
+    llm = _llm_or_503()
     symbol = payload.get("symbol")
     rsi = payload.get("rsi")
     sma = payload.get("sma")
@@ -106,9 +176,13 @@ Explain:
 3. Overall market sentiment (bullish / bearish / neutral)
 """
 
-    answer = llm_client.chat(
-        system_prompt=system_prompt,
-        user_message=user_message,
+    # Near-identical indicator states share one cached explanation
+    answer = await explanation_cache.get_or_generate(
+        symbol, rsi, sma, ema, price,
+        lambda: llm.achat(
+            system_prompt=system_prompt,
+            user_message=user_message,
+        ),
     )
 
     return {"explanation": answer}
@@ -0,0 +1,39 @@
+# app/api/v1/documents.py
+
+import asyncio
+from typing import List
+
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+
+from app.api.deps import get_current_user
+from app.schemas import DocumentIngestResult
+from app.services import ingestion
+
+router = APIRouter(prefix="/documents", tags=["documents"])
+
+
+@router.post("/upload", response_model=DocumentIngestResult)
+async def upload_documents(
+    files: List[UploadFile] = File(...),
+    user=Depends(get_current_user),
+):
+    """
+    Add text, Markdown or PDF files (e.g. filings) to the RAG store.
+    Re-uploading a file with the same name replaces its chunks.
+    """
+    documents = []
+    for f in files:
+        data = await f.read()
+        try:
+            documents.append(await asyncio.to_thread(
+                ingestion.document_from_bytes, f"upload:{f.filename}", f.filename, data
+            ))
+        except (ValueError, RuntimeError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return await ingestion.ingest(documents)
+
+
+@router.post("/ingest/news", response_model=DocumentIngestResult)
+async def ingest_news(limit: int = 50, user=Depends(get_current_user)):
+    return await ingestion.ingest(ingestion.news_documents(limit))
@@ -1,4 +1,19 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+from app.services import warmup
+from app.services.embeddings import get_embeddings_store
+
+from app.db.session import pool_stats as db_pool_stats
+from app.services.http_clients import pool_stats
+from app.services.quote_hub import quote_hub
+from app.services.candle_cache import candle_cache
+from app.services.explanation_cache import explanation_cache
+from app.services.collector import collector
+from app.services.bar_aggregator import bar_aggregator
+from app.services.auth_cache import auth_cache
+from app.services.password_hasher import password_hasher
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -6,3 +21,34 @@ router = APIRouter(prefix="/health", tags=["health"])
 @router.get("/ping")
 async def ping():
     return {"status": "ok"}
+
+
+@router.get("/ready")
+async def ready():
+    """
+    Readiness: 200 once heavy services are warmed up, 503 before.
+    With warm-up disabled they load lazily and the API is always ready.
+    """
+    components = warmup.status()
+    is_ready = warmup.is_ready() or not settings.WARMUP_ON_STARTUP
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content={"ready": is_ready, "components": components},
+    )
+
+
+@router.get("/metrics")
+async def metrics():
+    return {
+        "db": db_pool_stats(),
+        "http": pool_stats(),
+        "quote_hub": quote_hub.stats(),
+        "candle_cache": candle_cache.stats(),
+        "embeddings": get_embeddings_store().worker.stats(),
+        "embedding_cache": get_embeddings_store().cache.stats(),
+        "explain_cache": explanation_cache.stats(),
+        "collector": collector.stats(),
+        "bar_aggregator": bar_aggregator.stats(),
+        "auth_cache": auth_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+    }
@@ -1,15 +1,21 @@
 # app/api/v1/market.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas import PriceIn, PriceOut, AssetOut
+from app.schemas import PriceIn, PriceOut, AssetOut, PriceIngestResult
 from app.crud import assets as assets_crud, prices as prices_crud
 from app.api.deps import get_db, get_current_user
+from app.db.session import get_read_db
 
-from app.services.indicators import sma, ema, rsi
-from app.services.market_providers.router import get_provider
+from app.services.indicators import candles_to_arrays, compute_indicators, to_list
+from app.services.market_providers.router import get_provider, get_upstox_provider
+from app.services.symbol_resolver import get_canonical_symbol, get_instrument_key
+from app.services.instrument_registry import option_chain, search_instruments
 from app.services.market_providers.upstox import is_market_open
+from app.services.candle_cache import candle_cache
+from app.services.bar_aggregator import bar_aggregator, merge_forming
+from app.services import candle_store, price_ingest
 
 router = APIRouter(prefix="/market", tags=["market"])
 
@@ -36,21 +42,84 @@ async def ingest_price(
         low=payload.low,
         close=payload.close,
         volume=payload.volume,
+        resolution=payload.resolution,
     )
 
     return {"status": "ok", "price_id": price.id}
 
 
+# ===============================
+# BULK INGEST (bots)
+# ===============================
+@router.post("/prices/ingest/bulk", response_model=PriceIngestResult)
+async def ingest_prices_bulk(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    Bulk price ingest. Body is a JSON array of PriceIn, or a streamed
+    NDJSON (application/x-ndjson) / CSV (text/csv, header row) body.
+    Rows are upserted in chunks; invalid rows are reported by index.
+    """
+    try:
+        return await price_ingest.ingest(db, price_ingest.iter_records(request))
+    except price_ingest.MalformedBody as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# ===============================
+# INSTRUMENT SEARCH (autocomplete)
+# ===============================
+@router.get("/instruments/search")
+async def instruments_search(
+    q: str,
+    limit: int = 10,
+    user=Depends(get_current_user),
+):
+    """
+    Ranked instrument matches for `q`: exact symbol, symbol prefix,
+    company-name prefix, then fuzzy.
+    """
+    return search_instruments(q, limit=max(1, min(limit, 50)))
+
+
+@router.get("/instruments/option-chain")
+async def instruments_option_chain(
+    underlying: str,
+    expiry: str | None = None,
+    exchange: str | None = None,
+    user=Depends(get_current_user),
+):
+    """
+    Futures and options on `underlying` for one expiry (YYYY-MM-DD,
+    default nearest), plus the list of available expiries.
+    """
+    try:
+        return option_chain(underlying, expiry=expiry, exchange=exchange)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid expiry date")
+
+
 # ===============================
 # ASSET METADATA
 # ===============================
+async def _find_asset(db: AsyncSession, symbol: str):
+    """
+    Stored bars are keyed by canonical symbol; bulk-ingested assets
+    keep the symbol they were uploaded with.
+    """
+    asset = await assets_crud.get_asset_by_symbol(db, get_canonical_symbol(symbol))
+    return asset or await assets_crud.get_asset_by_symbol(db, symbol)
+
+
 @router.get("/assets/{symbol}", response_model=AssetOut)
 async def get_asset(
     symbol: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     user=Depends(get_current_user),
 ):
-    asset = await assets_crud.get_asset_by_symbol(db, symbol)
+    asset = await _find_asset(db, symbol)
     if not asset:
         raise HTTPException(404, "Asset not found")
     return asset
@@ -63,10 +132,10 @@ async def get_asset(
 async def get_recent_prices(
     symbol: str,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     user=Depends(get_current_user),
 ):
-    asset = await assets_crud.get_asset_by_symbol(db, symbol)
+    asset = await _find_asset(db, symbol)
     if not asset:
         raise HTTPException(404, "Asset not found")
 
@@ -83,7 +152,7 @@ async def get_quote(
     user=Depends(get_current_user),
 ):
     """
-    Latest LTP for the given NSE symbol.
+    Latest LTP for the given symbol ("TCS", or namespaced "BSE:RELIANCE").
     Resolves symbol via existing logic, fetches from Upstox.
     """
     try:
@@ -113,6 +182,48 @@ async def get_quote(
     }
 
 
+# ===============================
+# QUOTES (bulk LTP, INR)
+# ===============================
+@router.get("/quotes")
+async def get_quotes(
+    symbols: str,
+    user=Depends(get_current_user),
+):
+    """
+    Latest LTP for a comma-separated list of symbols (namespaces allowed).
+    Fetched in bulk (one upstream call per chunk of instrument keys).
+    Unknown symbols are returned with price=None.
+    """
+    requested = [s.strip().upper() for s in symbols.split(",") if s.strip()]
+    if not requested:
+        raise HTTPException(status_code=400, detail="No symbols given")
+
+    provider = get_upstox_provider()
+    keys = {}
+    for sym in requested:
+        try:
+            keys[sym] = get_instrument_key(sym)
+        except ValueError:
+            keys[sym] = None
+
+    quotes = await provider.fetch_quotes([k for k in keys.values() if k])
+    market_open = is_market_open()
+
+    results = []
+    for sym in requested:
+        quote = quotes.get(keys[sym]) if keys[sym] else None
+        price = quote.get("price") if quote else None
+        results.append({
+            "symbol": sym,
+            "price": float(price) if price is not None else None,
+            "currency": "INR",
+            "market_open": market_open,
+        })
+
+    return results
+
+
 # ===============================
 # CANDLES (Upstox)
 # ===============================
@@ -125,7 +236,8 @@ async def get_candles(
 ):
     """
     Unified candle endpoint.
-    Uses provider router (Upstox).
+    Uses provider router (Upstox); the forming bar is overlaid from
+    live ticks when the instrument is being streamed.
     """
 
     provider, resolved_symbol = await get_provider(symbol)
@@ -136,26 +248,36 @@ async def get_candles(
             detail=f"Invalid or unsupported symbol: {symbol}"
         )
 
-    candles = await provider.fetch_candles(
-        instrument_key=resolved_symbol,
-        resolution=resolution,
+    candles = await candle_cache.get_or_fetch(
+        resolved_symbol,
+        resolution,
+        100,
+        lambda limit: candle_store.get_candles(
+            get_canonical_symbol(symbol), resolved_symbol, resolution, limit,
+            provider,
+        ),
+    )
+
+    # Live bar from the tick stream, if this instrument is being watched
+    candles = merge_forming(
+        candles, bar_aggregator.forming(resolved_symbol, resolution)
     )
 
     if not candles:
         return []
 
     # ===============================
-    # Indicators
+    # Indicators (one vectorized pass)
     # ===============================
-    closes = [c["close"] for c in candles]
-
-    sma_vals = sma(closes, period)
-    ema_vals = ema(closes, period)
-    rsi_vals = rsi(closes, period)
+    values = compute_indicators(
+        candles_to_arrays(candles),
+        period=period,
+        intraday=resolution not in ("D", "W"),
+    )
+    columns = {name: to_list(arr) for name, arr in values.items()}
 
     for i, c in enumerate(candles):
-        c["sma"] = sma_vals[i] if i < len(sma_vals) else None
-        c["ema"] = ema_vals[i] if i < len(ema_vals) else None
-        c["rsi"] = rsi_vals[i] if i < len(rsi_vals) else None
+        for name, col in columns.items():
+            c[name] = col[i]
 
     return candles
@@ -1,44 +1,79 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
 from app.services.market_providers.router import get_provider
-import asyncio
+from app.services.quote_hub import quote_hub
+from app.services.bar_aggregator import bar_aggregator
+from app.services.indicator_state import IndicatorState
+from app.services.candle_cache import candle_cache
+from app.services import candle_store
+from app.services.sessions import is_valid_resolution
+from app.services.symbol_resolver import get_canonical_symbol
 
 router = APIRouter()
 
 
 @router.websocket("/ws/market/{symbol}")
-async def market_ws(websocket: WebSocket, symbol: str):
+async def market_ws(
+    websocket: WebSocket,
+    symbol: str,
+    resolution: str = "5",
+    period: int = 14,
+):
     """
     WebSocket endpoint for live market price updates.
     Auth intentionally disabled for stability.
+    Ticks come from the shared quote hub, so N sockets watching the
+    same symbol cost one upstream poll per second.
+    Each tick carries SMA/EMA/RSI for the forming bar at `resolution`,
+    seeded once from historical candles and updated incrementally,
+    plus the forming OHLCV bar built from the shared tick stream.
     """
 
     await websocket.accept()
 
+    if not is_valid_resolution(resolution) or period < 1:
+        await websocket.send_json({
+            "error": f"Unsupported resolution/period: {resolution}/{period}"
+        })
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
     try:
         # Resolve provider + instrument key
         provider, instrument_key = await get_provider(symbol)
+        # Stored bars are keyed by one name per instrument
+        asset_symbol = get_canonical_symbol(symbol)
 
-        # Send initial LTP
-        quote = await provider.fetch_quote(instrument_key)
-        await websocket.send_json({
-            "symbol": symbol,
-            "price": quote.get("price"),
-            "type": "initial"
-        })
+        state = IndicatorState(period=period, resolution=resolution)
+        state.seed(await candle_cache.get_or_fetch(
+            instrument_key,
+            resolution,
+            100,
+            lambda limit: candle_store.get_candles(
+                asset_symbol, instrument_key, resolution, limit, provider
+            ),
+        ))
+
+        bar_aggregator.track(resolution)
 
-        # Poll every 1 second
-        while True:
-            await asyncio.sleep(1)
+        async with await quote_hub.subscribe(
+            provider, instrument_key, asset_symbol
+        ) as sub:
+            msg_type = "initial"
+            while True:
+                quote = await sub.get()
 
-            quote = await provider.fetch_quote(instrument_key)
-            if not quote:
-                continue
+                indicators = state.on_tick(
+                    quote["price"], quote["timestamp"] * 1000
+                )
 
-            await websocket.send_json({
-                "symbol": symbol,
-                "price": quote.get("price"),
-                "type": "update"
-            })
+                await websocket.send_json({
+                    "symbol": symbol,
+                    "price": quote.get("price"),
+                    "indicators": indicators,
+                    "bar": bar_aggregator.forming(instrument_key, resolution),
+                    "type": msg_type
+                })
+                msg_type = "update"
 
     except WebSocketDisconnect:
         print(f"WebSocket disconnected for {symbol}")
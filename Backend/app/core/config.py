@@ -5,12 +5,35 @@ from pydantic import Field
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Bullseye Backend"
 
+    # Load heavy services (embedding model, LLM SDK) in the background
+    # on startup; otherwise they load on first use
+    WARMUP_ON_STARTUP: bool = True
+
     # =====================
     # DATABASE
     # =====================
     DATABASE_URL: str = Field(
         default="sqlite+aiosqlite:///./bullseye.db"
     )
+    # Optional read replica for lag-tolerant reads (get_read_db)
+    DATABASE_READ_URL: str | None = None
+
+    # Connection pool (server databases; file SQLite uses the sizing only)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 500  # asyncpg prepared statements per connection
+
+    # SQLite pragmas applied on every new connection
+    DB_SQLITE_MMAP_BYTES: int = 256 * 1024 * 1024
+    DB_SQLITE_BUSY_TIMEOUT_MS: int = 5000
+
+    # Monthly range partitioning of `prices` (PostgreSQL only)
+    PRICES_PARTITIONING: bool = False
+    PRICES_PARTITION_AHEAD_MONTHS: int = 3
+    PRICES_RETENTION_MONTHS: int = 0  # 0 = keep everything
 
     # =====================
     # AUTH / JWT
@@ -18,17 +41,53 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "dev-secret-key"
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    # Verified tokens are cached until they expire; user rows for this
+    # long (0 disables the user cache)
+    AUTH_TOKEN_CACHE_SIZE: int = 10000
+    AUTH_USER_CACHE_SIZE: int = 2048
+    AUTH_USER_CACHE_TTL_SECONDS: float = 30.0
+    # bcrypt runs in this many threads; logins beyond the queue limit
+    # get a 503 instead of piling up
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 256
 
     # =====================
     # AI / ML
     # =====================
     EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
+    EMBEDDING_BATCH_SIZE: int = 32
+    EMBEDDING_BATCH_WAIT_MS: float = 5.0
+    EMBEDDING_WORKERS: int = 1
+    EMBEDDING_CACHE_SIZE: int = 10000     # in-memory LRU entries
+    EMBEDDING_CACHE_PERSIST: bool = True  # also keep vectors in the DB
+    EMBEDDING_CACHE_DB_MAX_ENTRIES: int = 200000  # DB tier LRU bound (0 = unbounded)
     GEMINI_API_KEY: str | None = None
+    # Override the Gemini endpoint, e.g. a local stub server in tests
+    GEMINI_BASE_URL: str | None = None
+
+    # Vector index (RAG)
+    VECTOR_INDEX_DIR: str = "data/vector_index"
+    VECTOR_INDEX_NPROBE: int = 8
+    VECTOR_INDEX_IVF_THRESHOLD: int = 50000
 
     # =====================
     # MARKET DATA
     # =====================
     FINNHUB_API_KEY: str | None = None
+    NEWS_API_KEY: str | None = None
+
+    # =====================
+    # OUTBOUND HTTP
+    # =====================
+    HTTP_TIMEOUT_SECONDS: float = 10.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    HTTP_CANDLE_TIMEOUT_SECONDS: float = 15.0
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_UPSTOX_MAX_CONNECTIONS: int = 50
+    HTTP_FINNHUB_MAX_CONNECTIONS: int = 10
+    HTTP_NEWS_MAX_CONNECTIONS: int = 5
+    HTTP2_ENABLED: bool = True
 
     # =====================
     # UPSTOX
@@ -36,6 +95,53 @@ class Settings(BaseSettings):
     UPSTOX_API_KEY: str | None = None
     UPSTOX_API_SECRET: str | None = None
     UPSTOX_REDIRECT_URI: str | None = None
+    UPSTOX_LTP_MAX_KEYS: int = 500
+    UPSTOX_QUOTE_BATCH_WINDOW_MS: int = 10
+
+    # =====================
+    # CANDLE CACHE
+    # =====================
+    CANDLE_CACHE_MAX_ENTRIES: int = 512
+    CANDLE_CACHE_FORMING_TTL_SECONDS: float = 60.0
+    CANDLE_CACHE_CLOSED_TTL_SECONDS: float = 900.0
+
+    # =====================
+    # EXPLAIN-INDICATORS CACHE
+    # =====================
+    EXPLAIN_CACHE_TTL_SECONDS: float = 900.0
+    EXPLAIN_CACHE_MAX_ENTRIES: int = 1024
+    # Bucket granularity: RSI points per band, and percent steps for the
+    # EMA-vs-SMA and price-vs-SMA spreads. Larger = more cache hits.
+    EXPLAIN_CACHE_RSI_BUCKET: float = Field(default=5.0, gt=0)
+    EXPLAIN_CACHE_PCT_BUCKET: float = Field(default=0.5, gt=0)
+
+    # =====================
+    # PRICE COLLECTOR
+    # =====================
+    # Run the collector inside the API process (otherwise run it as its
+    # own worker: python -m app.services.collector)
+    COLLECTOR_ENABLED: bool = False
+    # Must give every bar of the shortest BAR_RESOLUTIONS at least
+    # BAR_MIN_TICKS ticks; the collector refuses to start otherwise
+    COLLECTOR_INTERVAL_SECONDS: float = Field(default=15.0, gt=0)
+    # Comma-separated symbols collected in addition to every tracked asset
+    COLLECTOR_SYMBOLS: str = ""
+
+    # =====================
+    # BAR AGGREGATOR
+    # =====================
+    # Comma-separated resolutions built from live ticks ("1", "5", ...);
+    # the market WebSocket adds the resolution it streams on demand
+    BAR_RESOLUTIONS: str = "1"
+    BAR_FLUSH_INTERVAL_SECONDS: float = 5.0
+    # Bars built from fewer ticks are served live but never persisted:
+    # one quote per bar would be stored as a flat O=H=L=C bar
+    BAR_MIN_TICKS: int = Field(default=2, ge=1)
+
+    # =====================
+    # CELERY
+    # =====================
+    REDIS_URL: str = "redis://localhost:6379/0"
 
     class Config:
         env_file = ".env"
@@ -1,5 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from app import models
 
 
@@ -8,6 +10,11 @@ async def get_asset_by_symbol(db: AsyncSession, symbol: str):
     return res.scalars().first()
 
 
+async def list_symbols(db: AsyncSession) -> list[str]:
+    res = await db.execute(select(models.Asset.symbol).order_by(models.Asset.id))
+    return list(res.scalars().all())
+
+
 async def create_asset_if_not_exists(
     db: AsyncSession, symbol: str, name: str | None = None, type_: str = "stock"
 ):
@@ -19,3 +26,33 @@ async def create_asset_if_not_exists(
     await db.commit()
     await db.refresh(new_asset)
     return new_asset
+
+
+async def get_or_create_asset_ids(
+    db: AsyncSession, symbols: list[str], type_: str = "stock"
+) -> dict[str, int]:
+    """
+    symbol -> asset id for many symbols: one SELECT, plus one
+    INSERT ... ON CONFLICT DO NOTHING for the missing ones.
+    Does not commit.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    if not symbols:
+        return {}
+
+    query = select(models.Asset.symbol, models.Asset.id).where(
+        models.Asset.symbol.in_(symbols)
+    )
+    ids = dict((await db.execute(query)).all())
+
+    missing = [s for s in symbols if s not in ids]
+    if missing:
+        insert = pg_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+        await db.execute(
+            insert(models.Asset)
+            .values([{"symbol": s, "type": type_} for s in missing])
+            .on_conflict_do_nothing(index_elements=["symbol"])
+        )
+        ids.update((await db.execute(query)).all())
+
+    return ids
@@ -0,0 +1,74 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app import models
+
+
+async def get_documents_by_ids(db: AsyncSession, ids: list[int]):
+    """
+    Documents for the given primary keys, in the order of `ids`.
+    """
+    if not ids:
+        return []
+    res = await db.execute(
+        select(models.DocumentEmbedding).where(models.DocumentEmbedding.id.in_(ids))
+    )
+    by_id = {d.id: d for d in res.scalars().all()}
+    return [by_id[i] for i in ids if i in by_id]
+
+
+async def stream_embeddings(db: AsyncSession, batch_size: int = 10000):
+    """
+    Yields lists of (id, embedding blob) without loading the table at once.
+    """
+    result = await db.stream(
+        select(models.DocumentEmbedding.id, models.DocumentEmbedding.embedding)
+        .execution_options(yield_per=batch_size)
+    )
+    async for partition in result.partitions(batch_size):
+        yield [tuple(row) for row in partition]
+
+
+async def get_chunk_hashes(db: AsyncSession, source_ids: list[str]) -> dict[str, tuple[int, str | None]]:
+    """
+    {doc_id: (id, content_hash)} for every stored chunk of the given
+    source documents (chunk doc_ids are "<source_id>#<n>").
+    """
+    if not source_ids:
+        return {}
+    doc_id = models.DocumentEmbedding.doc_id
+    res = await db.execute(
+        select(doc_id, models.DocumentEmbedding.id, models.DocumentEmbedding.content_hash)
+        .where(or_(*[doc_id.startswith(f"{s}#", autoescape=True) for s in source_ids]))
+    )
+    return {d: (pk, h) for d, pk, h in res.all()}
+
+
+async def upsert_documents(db: AsyncSession, rows: list[dict]) -> dict[str, int]:
+    """
+    Insert or update chunks by doc_id in one statement; returns
+    {doc_id: id}. Does not commit.
+    """
+    if not rows:
+        return {}
+    insert = pg_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(models.DocumentEmbedding).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["doc_id"],
+        set_={
+            "text": stmt.excluded.text,
+            "embedding": stmt.excluded.embedding,
+            "doc_meta": stmt.excluded.doc_meta,
+            "content_hash": stmt.excluded.content_hash,
+        },
+    ).returning(models.DocumentEmbedding.doc_id, models.DocumentEmbedding.id)
+    res = await db.execute(stmt)
+    return dict(res.all())
+
+
+async def delete_documents(db: AsyncSession, ids: list[int]):
+    if ids:
+        await db.execute(
+            delete(models.DocumentEmbedding).where(models.DocumentEmbedding.id.in_(ids))
+        )
@@ -0,0 +1,59 @@
+from datetime import datetime, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app import models
+
+
+async def get_vectors(db: AsyncSession, keys: list[str]) -> dict[str, bytes]:
+    if not keys:
+        return {}
+    res = await db.execute(
+        select(models.EmbeddingCacheEntry.key, models.EmbeddingCacheEntry.vector)
+        .where(models.EmbeddingCacheEntry.key.in_(keys))
+    )
+    return dict(res.all())
+
+
+async def store_vectors(db: AsyncSession, model: str, vectors: dict[str, bytes]):
+    if not vectors:
+        return
+    insert = pg_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+    now = datetime.now(timezone.utc)
+    await db.execute(
+        insert(models.EmbeddingCacheEntry)
+        .values([
+            {"key": key, "model": model, "vector": blob, "last_used_at": now}
+            for key, blob in vectors.items()
+        ])
+        .on_conflict_do_nothing(index_elements=["key"])
+    )
+    await db.commit()
+
+
+async def touch(db: AsyncSession, keys: list[str]):
+    if not keys:
+        return
+    await db.execute(
+        update(models.EmbeddingCacheEntry)
+        .where(models.EmbeddingCacheEntry.key.in_(keys))
+        .values(last_used_at=datetime.now(timezone.utc))
+    )
+    await db.commit()
+
+
+async def prune(db: AsyncSession, max_entries: int) -> int:
+    """
+    Delete all but the `max_entries` most recently used entries.
+    """
+    entry = models.EmbeddingCacheEntry
+    stale = (
+        select(entry.key)
+        .order_by(entry.last_used_at.desc())
+        .offset(max_entries)
+    )
+    res = await db.execute(delete(entry).where(entry.key.in_(stale)))
+    await db.commit()
+    return res.rowcount
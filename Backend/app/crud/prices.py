@@ -1,13 +1,28 @@
+from datetime import datetime, timezone
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from app import models
 
+# Keeps each statement under SQLite's bound-parameter limit
+UPSERT_CHUNK_SIZE = 500
+
+BAR_COLUMNS = ("open", "high", "low", "close", "volume")
+
 
 async def create_price(
-    db: AsyncSession, asset_id: int, timestamp, open, high, low, close, volume
+    db: AsyncSession, asset_id: int, timestamp, open, high, low, close, volume,
+    resolution: str = "1",
 ):
-    price = models.Price(
+    """
+    Insert one bar, or overwrite the stored bar with the same
+    (asset_id, resolution, timestamp), so re-sent bars are idempotent.
+    """
+    stmt = _insert(db).values(
         asset_id=asset_id,
+        resolution=resolution,
         timestamp=timestamp,
         open=open,
         high=high,
@@ -15,17 +30,88 @@ async def create_price(
         close=close,
         volume=volume,
     )
-    db.add(price)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["asset_id", "resolution", "timestamp"],
+        set_={col: stmt.excluded[col] for col in BAR_COLUMNS},
+    ).returning(models.Price.id)
+    price_id = (await db.execute(stmt)).scalar_one()
     await db.commit()
-    await db.refresh(price)
-    return price
+    return await db.get(models.Price, price_id, populate_existing=True)
 
 
-async def get_recent_prices(db: AsyncSession, asset_id: int, limit: int = 100):
+async def get_recent_prices(
+    db: AsyncSession, asset_id: int, limit: int = 100, resolution: str | None = None
+):
+    query = select(models.Price).where(models.Price.asset_id == asset_id)
+    if resolution is not None:
+        query = query.where(models.Price.resolution == resolution)
+
     res = await db.execute(
-        select(models.Price)
-        .where(models.Price.asset_id == asset_id)
-        .order_by(desc(models.Price.timestamp))
-        .limit(limit)
+        query.order_by(desc(models.Price.timestamp)).limit(limit)
     )
     return list(res.scalars().all())
+
+
+def _insert(db: AsyncSession):
+    if db.bind.dialect.name == "postgresql":
+        return pg_insert(models.Price)
+    return sqlite_insert(models.Price)
+
+
+async def upsert_prices(
+    db: AsyncSession, rows: list[dict], merge: bool = False
+) -> int:
+    """
+    Insert or update bars keyed by (asset_id, resolution, timestamp).
+    One multi-row INSERT ... ON CONFLICT per chunk, single commit.
+    Duplicate keys within `rows` collapse to the last occurrence.
+
+    By default an existing bar is overwritten. With `merge`, the new
+    values extend it instead (stored open kept, high/low widened, close
+    replaced), for bars built from only part of the interval.
+    """
+    rows = list({
+        (r["asset_id"], r["resolution"], r["timestamp"]): r for r in rows
+    }.values())
+    if not rows:
+        return 0
+
+    # SQLite's two-argument max()/min() are scalar functions
+    if db.bind.dialect.name == "postgresql":
+        greatest, least = func.greatest, func.least
+    else:
+        greatest, least = func.max, func.min
+
+    table = models.Price.__table__
+    for i in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        stmt = _insert(db).values(rows[i:i + UPSERT_CHUNK_SIZE])
+        if merge:
+            set_ = {
+                "high": greatest(table.c.high, stmt.excluded.high),
+                "low": least(table.c.low, stmt.excluded.low),
+                "close": stmt.excluded.close,
+                "volume": greatest(
+                    func.coalesce(table.c.volume, 0), stmt.excluded.volume
+                ),
+            }
+        else:
+            set_ = {col: stmt.excluded[col] for col in BAR_COLUMNS}
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["asset_id", "resolution", "timestamp"],
+            set_=set_,
+        )
+        await db.execute(stmt)
+
+    await db.commit()
+    return len(rows)
+
+
+def to_datetime(ms: int) -> datetime:
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+
+
+def to_millis(ts: datetime) -> int:
+    # SQLite hands back naive datetimes; they are stored as UTC
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return int(ts.timestamp() * 1000)
@@ -29,11 +29,17 @@ async def get_user_by_id(db: AsyncSession, user_id: int):
     return result.scalars().first()
 
 
-async def create_user(db: AsyncSession, user_in: UserCreate):
-    hashed = hash_password(user_in.password)
+async def create_user(
+    db: AsyncSession, user_in: UserCreate, hashed_password: str | None = None
+):
+    """
+    `hashed_password` lets callers hash off the event loop first.
+    """
+    if hashed_password is None:
+        hashed_password = hash_password(user_in.password)
     user = models.User(
         email=user_in.email,
-        hashed_password=hashed,
+        hashed_password=hashed_password,
         full_name=user_in.full_name,
     )
     db.add(user)
@@ -0,0 +1,90 @@
+# app/db/migrations.py
+
+# Lightweight in-place schema upgrades.
+# `Base.metadata.create_all` only creates missing tables, so columns and
+# indexes added to existing tables are applied here on startup. Every
+# step is idempotent.
+
+from sqlalchemy import inspect, text
+
+
+def _columns(conn, table: str) -> set[str]:
+    return {c["name"] for c in inspect(conn).get_columns(table)}
+
+
+def _indexes(conn, table: str) -> set[str]:
+    return {i["name"] for i in inspect(conn).get_indexes(table)}
+
+
+def _upgrade_prices(conn):
+    if "resolution" not in _columns(conn, "prices"):
+        conn.execute(text(
+            "ALTER TABLE prices ADD COLUMN resolution VARCHAR(8) NOT NULL DEFAULT '1'"
+        ))
+
+    if "uq_prices_asset_resolution_ts" not in _indexes(conn, "prices"):
+        # Older rows may contain duplicate bars; keep the first of each
+        conn.execute(text(
+            "DELETE FROM prices WHERE id NOT IN ("
+            " SELECT MIN(id) FROM prices GROUP BY asset_id, resolution, timestamp"
+            ")"
+        ))
+        conn.execute(text(
+            "CREATE UNIQUE INDEX uq_prices_asset_resolution_ts "
+            "ON prices (asset_id, resolution, timestamp)"
+        ))
+
+    if "ix_prices_asset_ts" not in _indexes(conn, "prices"):
+        conn.execute(text(
+            "CREATE INDEX ix_prices_asset_ts ON prices (asset_id, timestamp)"
+        ))
+
+
+def _upgrade_document_embeddings(conn):
+    # Ingestion skips unchanged chunks by hash
+    if "content_hash" not in _columns(conn, "document_embeddings"):
+        conn.execute(text(
+            "ALTER TABLE document_embeddings ADD COLUMN content_hash VARCHAR(64)"
+        ))
+
+    # Embeddings moved from JSON text to packed float32 bytes. SQLite
+    # stores either in the old column; Postgres needs the type changed.
+    # Rows still holding JSON are read transparently (unpack_vector).
+    if conn.dialect.name != "postgresql":
+        return
+
+    embedding = next(
+        c for c in inspect(conn).get_columns("document_embeddings")
+        if c["name"] == "embedding"
+    )
+    if embedding["type"].__class__.__name__.upper() != "BYTEA":
+        conn.execute(text(
+            "ALTER TABLE document_embeddings ALTER COLUMN embedding "
+            "TYPE BYTEA USING convert_to(embedding, 'UTF8')"
+        ))
+
+
+def _upgrade_embedding_cache(conn):
+    if "last_used_at" not in _columns(conn, "embedding_cache"):
+        # SQLite cannot add a column with a non-constant default
+        conn.execute(text(
+            "ALTER TABLE embedding_cache ADD COLUMN last_used_at TIMESTAMP"
+        ))
+        conn.execute(text(
+            "UPDATE embedding_cache SET last_used_at = created_at"
+        ))
+
+    if "ix_embedding_cache_last_used_at" not in _indexes(conn, "embedding_cache"):
+        conn.execute(text(
+            "CREATE INDEX ix_embedding_cache_last_used_at "
+            "ON embedding_cache (last_used_at)"
+        ))
+
+
+def run_migrations(conn):
+    """
+    Sync entry point, run via `await conn.run_sync(run_migrations)`.
+    """
+    _upgrade_prices(conn)
+    _upgrade_document_embeddings(conn)
+    _upgrade_embedding_cache(conn)
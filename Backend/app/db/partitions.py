@@ -0,0 +1,229 @@
+# app/db/partitions.py
+
+# Optional monthly range partitioning of `prices` on PostgreSQL.
+#
+#   PRICES_PARTITIONING=true          enable (ignored on other databases)
+#   PRICES_PARTITION_AHEAD_MONTHS=3   partitions created ahead of time
+#   PRICES_RETENTION_MONTHS=0         drop partitions older than this (0 = keep)
+#
+# An empty `prices` table is converted on startup. A populated one is
+# converted offline with:
+#
+#   python -m app.db.partitions migrate
+#
+# and `python -m app.db.partitions maintain` runs the create-ahead and
+# retention step (the API also runs it daily).
+
+import asyncio
+import re
+import sys
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+
+from app.core.config import settings
+
+PARTITION_NAME = re.compile(r"^prices_y(\d{4})m(\d{2})$")
+
+PARTITIONED_PRICES_DDL = """
+CREATE TABLE prices (
+    id BIGINT GENERATED BY DEFAULT AS IDENTITY,
+    asset_id INTEGER NOT NULL REFERENCES assets (id),
+    resolution VARCHAR(8) NOT NULL DEFAULT '1',
+    timestamp TIMESTAMPTZ NOT NULL,
+    open DOUBLE PRECISION,
+    high DOUBLE PRECISION,
+    low DOUBLE PRECISION,
+    close DOUBLE PRECISION,
+    volume DOUBLE PRECISION,
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp)
+"""
+
+PARTITIONED_PRICES_INDEXES = [
+    "CREATE UNIQUE INDEX uq_prices_asset_resolution_ts "
+    "ON prices (asset_id, resolution, timestamp)",
+    "CREATE INDEX ix_prices_asset_ts ON prices (asset_id, timestamp)",
+    "CREATE INDEX ix_prices_timestamp ON prices (timestamp)",
+]
+
+COLUMNS = "id, asset_id, resolution, timestamp, open, high, low, close, volume"
+
+
+def _add_months(d: date, months: int) -> date:
+    total = d.year * 12 + d.month - 1 + months
+    return date(total // 12, total % 12 + 1, 1)
+
+
+def _month_start(d: date) -> date:
+    return date(d.year, d.month, 1)
+
+
+def _partition_name(month: date) -> str:
+    return f"prices_y{month.year:04d}m{month.month:02d}"
+
+
+def is_partitioned(conn) -> bool:
+    relkind = conn.execute(text(
+        "SELECT relkind FROM pg_class "
+        "WHERE oid = to_regclass('prices')"
+    )).scalar()
+    return relkind == "p"
+
+
+def list_partitions(conn) -> list[str]:
+    return list(conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass('prices')"
+    )).scalars())
+
+
+def create_partition(conn, month: date):
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {_partition_name(month)} "
+        f"PARTITION OF prices FOR VALUES "
+        f"FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+    ))
+
+
+def ensure_partitions(conn, start: date | None = None, ahead: int | None = None):
+    """
+    Monthly partitions from `start` (default: this month) through
+    `ahead` months into the future, plus a DEFAULT partition.
+    """
+    if ahead is None:
+        ahead = settings.PRICES_PARTITION_AHEAD_MONTHS
+
+    today = datetime.now(timezone.utc).date()
+    month = _month_start(start or today)
+    last = _add_months(_month_start(today), ahead)
+
+    while month <= last:
+        create_partition(conn, month)
+        month = _add_months(month, 1)
+
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS prices_default PARTITION OF prices DEFAULT"
+    ))
+
+
+def drop_expired_partitions(conn, retention_months: int | None = None) -> list[str]:
+    if retention_months is None:
+        retention_months = settings.PRICES_RETENTION_MONTHS
+    if retention_months <= 0:
+        return []
+
+    today = datetime.now(timezone.utc).date()
+    cutoff = _add_months(_month_start(today), -retention_months)
+
+    dropped = []
+    for name in list_partitions(conn):
+        m = PARTITION_NAME.match(name)
+        if not m:
+            continue
+        month = date(int(m.group(1)), int(m.group(2)), 1)
+        if _add_months(month, 1) <= cutoff:
+            conn.execute(text(f"ALTER TABLE prices DETACH PARTITION {name}"))
+            conn.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+    return dropped
+
+
+def migrate_to_partitioned(conn):
+    """
+    Convert a plain `prices` table into the partitioned layout, copying
+    all rows. Runs inside the caller's transaction.
+    """
+    if is_partitioned(conn):
+        return
+
+    # Index names are schema-wide in Postgres; move the old ones aside
+    conn.execute(text("ALTER TABLE prices RENAME TO prices_legacy"))
+    for (index_name,) in conn.execute(text(
+        "SELECT indexname FROM pg_indexes WHERE tablename = 'prices_legacy'"
+    )).all():
+        conn.execute(text(
+            f'ALTER INDEX "{index_name}" RENAME TO "{index_name}_legacy"'
+        ))
+
+    conn.execute(text(PARTITIONED_PRICES_DDL))
+    for ddl in PARTITIONED_PRICES_INDEXES:
+        conn.execute(text(ddl))
+
+    oldest = conn.execute(text("SELECT MIN(timestamp) FROM prices_legacy")).scalar()
+    ensure_partitions(conn, start=oldest.date() if oldest else None)
+
+    conn.execute(text(
+        f"INSERT INTO prices ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM prices_legacy WHERE timestamp IS NOT NULL"
+    ))
+    conn.execute(text(
+        "SELECT setval(pg_get_serial_sequence('prices', 'id'), "
+        "COALESCE((SELECT MAX(id) FROM prices), 0) + 1, false)"
+    ))
+    conn.execute(text("DROP TABLE prices_legacy"))
+
+
+def maintain(conn):
+    ensure_partitions(conn)
+    dropped = drop_expired_partitions(conn)
+    if dropped:
+        print(f"Dropped expired price partitions: {', '.join(dropped)}")
+
+
+def setup_on_startup(conn):
+    """
+    Startup hook (sync, via run_sync). Converts `prices` only while it
+    is empty; populated tables must be migrated offline.
+    """
+    if not settings.PRICES_PARTITIONING or conn.dialect.name != "postgresql":
+        return
+
+    if not is_partitioned(conn):
+        has_rows = conn.execute(text("SELECT 1 FROM prices LIMIT 1")).first()
+        if has_rows:
+            print(
+                "⚠️ PRICES_PARTITIONING is enabled but 'prices' holds data; "
+                "run `python -m app.db.partitions migrate` to convert it."
+            )
+            return
+        migrate_to_partitioned(conn)
+
+    maintain(conn)
+
+
+async def maintenance_loop(interval_seconds: float = 86400):
+    from app.db.session import engine
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(setup_on_startup)
+        except Exception as e:
+            print(f"Price partition maintenance failed: {e}")
+
+
+async def _main(command: str):
+    from app.db.session import engine
+
+    if engine.dialect.name != "postgresql":
+        print("Partitioning is only supported on PostgreSQL.")
+        return
+
+    async with engine.begin() as conn:
+        if command == "migrate":
+            await conn.run_sync(migrate_to_partitioned)
+        await conn.run_sync(maintain)
+
+    await engine.dispose()
+    print(f"prices partitioning: {command} done")
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "maintain"
+    if command not in ("migrate", "maintain"):
+        print("usage: python -m app.db.partitions [migrate|maintain]")
+        sys.exit(2)
+    asyncio.run(_main(command))
@@ -1,14 +1,70 @@
 # app/db/session.py
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
 
 Base = declarative_base()
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=False,
-    future=True,
+
+def _sqlite_pragmas(dbapi_conn, connection_record):
+    """
+    WAL lets readers run alongside the writer; busy_timeout makes a
+    blocked writer wait instead of failing with "database is locked".
+    """
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.DB_SQLITE_MMAP_BYTES)}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.DB_SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.close()
+
+
+def make_engine(url: str):
+    """
+    Async engine configured from Settings: pool sizing for server
+    databases, asyncpg's prepared statement cache, SQLite pragmas.
+    """
+    parsed = make_url(url)
+    kwargs = {"echo": False, "future": True}
+
+    if parsed.get_backend_name() == "sqlite":
+        in_memory = parsed.database in (None, "", ":memory:")
+        if not in_memory:
+            # aiosqlite would otherwise open a fresh connection per checkout
+            kwargs["poolclass"] = AsyncAdaptedQueuePool
+            kwargs["pool_size"] = settings.DB_POOL_SIZE
+            kwargs["max_overflow"] = settings.DB_MAX_OVERFLOW
+            kwargs["pool_timeout"] = settings.DB_POOL_TIMEOUT_SECONDS
+        engine = create_async_engine(url, **kwargs)
+        if not in_memory:
+            event.listen(engine.sync_engine, "connect", _sqlite_pragmas)
+        return engine
+
+    kwargs.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    if parsed.get_driver_name() == "asyncpg":
+        kwargs["connect_args"] = {
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+    return create_async_engine(url, **kwargs)
+
+
+engine = make_engine(settings.DATABASE_URL)
+
+# Reads that tolerate replica lag go here; without a replica it is
+# the primary engine
+read_engine = (
+    make_engine(settings.DATABASE_READ_URL)
+    if settings.DATABASE_READ_URL
+    else engine
 )
 
 AsyncSessionLocal = sessionmaker(
@@ -17,8 +73,49 @@ AsyncSessionLocal = sessionmaker(
     expire_on_commit=False,
 )
 
+AsyncReadSessionLocal = sessionmaker(
+    bind=read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
 
 async def get_db():
     async with AsyncSessionLocal() as session:
             yield session
 
+
+async def get_read_db():
+    async with AsyncReadSessionLocal() as session:
+        yield session
+
+
+async def dispose_engines():
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
+
+
+def _pool_stats(eng) -> dict:
+    pool = eng.pool
+    stats = {"class": type(pool).__name__}
+    # Only QueuePool-style pools report sizing
+    if hasattr(pool, "checkedout"):
+        size = pool.size()
+        checked_out = pool.checkedout()
+        capacity = size + max(getattr(pool, "_max_overflow", 0), 0)
+        stats.update(
+            size=size,
+            checked_in=pool.checkedin(),
+            checked_out=checked_out,
+            overflow=pool.overflow(),
+            utilization=checked_out / capacity if capacity else 0,
+        )
+    return stats
+
+
+def pool_stats() -> dict:
+    stats = {"primary": _pool_stats(engine)}
+    if read_engine is not engine:
+        stats["replica"] = _pool_stats(read_engine)
+    return stats
@@ -1,14 +1,22 @@
 from dotenv import load_dotenv
 load_dotenv()
 
-from fastapi import FastAPI
+import asyncio
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
-from app.api.v1 import auth, market, chat, health, ws_market, news
-from app.services.instrument_registry import load_instruments
-from app.db.session import engine
+from app.api.v1 import auth, market, chat, health, ws_market, news, documents
+from app.services import instrument_registry
+from app.services.http_clients import start_clients, close_clients
+from app.services.vector_index import ensure_vector_index
+from app.services import warmup
+from app.services.collector import collector
+from app.services.bar_aggregator import bar_aggregator
+from app.db.session import engine, dispose_engines
 from app.models import Base
+from app.db.migrations import run_migrations
+from app.db import partitions
 
 # -----------------------------
 # Create FastAPI app
@@ -34,6 +42,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# -----------------------------
+# BACKGROUND TASKS
+# -----------------------------
+# Strong references (the event loop only keeps weak ones); cancelled on
+# shutdown
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _spawn(coro) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
 # -----------------------------
 # SAFE STARTUP TASKS (light only)
 # -----------------------------
@@ -42,9 +65,45 @@ async def on_startup():
     # Only lightweight DB init here
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(run_migrations)
+        await conn.run_sync(partitions.setup_on_startup)
+
+    if settings.PRICES_PARTITIONING and engine.dialect.name == "postgresql":
+        _spawn(partitions.maintenance_loop())
+
+    await start_clients()
+
+    # Instrument master: snapshot now (milliseconds), refresh in background
+    await asyncio.to_thread(instrument_registry.ensure_loaded)
+    _spawn(instrument_registry.refresh_loop())
+    _spawn(ensure_vector_index())
+
+    _spawn(bar_aggregator.run())
+    if settings.COLLECTOR_ENABLED:
+        # Fail startup on a misconfigured interval, not inside the task
+        collector.check_interval()
+        _spawn(collector.run())
+
+    if settings.WARMUP_ON_STARTUP:
+        _spawn(warmup.warm_up())
 
     print("✅ DB ready. Server started successfully.")
 
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    tasks = list(_background_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    try:
+        await bar_aggregator.flush()
+    except Exception as e:
+        print(f"Bar flush failed: {e}")
+    await close_clients()
+    await dispose_engines()
+
 # -----------------------------
 # Routers
 # -----------------------------
@@ -54,14 +113,18 @@ app.include_router(market.router, prefix="/api")
 app.include_router(chat.router, prefix="/api")
 app.include_router(ws_market.router)
 app.include_router(news.router, prefix="/api")
+app.include_router(documents.router, prefix="/api")
 
 # -----------------------------
-# Admin endpoint to load NSE instruments (run once)
+# Admin endpoint to force an instrument master refresh
 # -----------------------------
 @app.get("/admin/load-instruments")
-def load_all_instruments():
-    load_instruments()
-    return {"status": "NSE instruments loaded successfully"}
+async def load_all_instruments():
+    try:
+        await instrument_registry.refresh_instruments(force=True)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Instrument download failed: {e}")
+    return {"status": "Instruments loaded successfully"}
 
 # -----------------------------
 # Root endpoint
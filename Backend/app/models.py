@@ -1,6 +1,6 @@
 from sqlalchemy import (
     Column, Integer, String, Boolean, DateTime, Float,
-    ForeignKey, Text
+    ForeignKey, Text, Index, LargeBinary
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -37,6 +37,7 @@ class Price(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     asset_id = Column(Integer, ForeignKey("assets.id"), nullable=False)
+    resolution = Column(String(8), nullable=False, default="1", server_default="1")  # 1 / 5 / 15 / 60 / D
     timestamp = Column(DateTime(timezone=True), index=True)
     open = Column(Float)
     high = Column(Float)
@@ -46,6 +47,16 @@ class Price(Base):
 
     asset = relationship("Asset", back_populates="prices")
 
+    __table_args__ = (
+        Index(
+            "uq_prices_asset_resolution_ts",
+            "asset_id", "resolution", "timestamp",
+            unique=True,
+        ),
+        # Latest-N lookups across resolutions (get_recent_prices)
+        Index("ix_prices_asset_ts", "asset_id", "timestamp"),
+    )
+
 
 class Portfolio(Base):
     __tablename__ = "portfolios"
@@ -74,12 +85,29 @@ class ChatMessage(Base):
 class DocumentEmbedding(Base):
     """
     RAG storage (if you don't use external vector DB).
-    For now, we keep embedding as JSON/text; can be replaced later.
+    Embeddings are packed float32 bytes; the in-process vector index
+    (app.services.vector_index) is built from this table.
     """
     __tablename__ = "document_embeddings"
 
     id = Column(Integer, primary_key=True, index=True)
     doc_id = Column(String(255), unique=True, index=True)
     text = Column(Text, nullable=False)
-    embedding = Column(Text, nullable=False)  # JSON-string of vector
+    embedding = Column(LargeBinary, nullable=False)  # packed float32 vector
     doc_meta = Column(Text, nullable=True)
+    content_hash = Column(String(64), nullable=True)  # sha256 of the chunk text
+
+
+class EmbeddingCacheEntry(Base):
+    """
+    Persistent tier of the embedding cache, keyed by a hash of the
+    normalized text and the model name.
+    """
+    __tablename__ = "embedding_cache"
+
+    key = Column(String(64), primary_key=True)  # sha256 hex
+    model = Column(String(255), nullable=False)
+    vector = Column(LargeBinary, nullable=False)  # packed float32 vector
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Bumped on DB-tier hits; the oldest entries are pruned first
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
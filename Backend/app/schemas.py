@@ -1,6 +1,8 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, field_validator
 from typing import Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
+
+from app.services.sessions import is_valid_resolution
 
 
 # ---------- Auth / Users ----------
@@ -55,6 +57,47 @@ class PriceIn(BaseModel):
     low: float
     close: float
     volume: float
+    resolution: str = "1"
+
+    @field_validator("timestamp")
+    @classmethod
+    def _to_utc(cls, value: datetime) -> datetime:
+        # Bars are stored as UTC; naive timestamps are taken as UTC
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+
+    @field_validator("resolution")
+    @classmethod
+    def _known_resolution(cls, value: str) -> str:
+        # Only resolutions the candle store and resampler read back
+        value = value.strip().upper()
+        if not is_valid_resolution(value):
+            raise ValueError(f"unsupported resolution {value!r}")
+        return value
+
+
+class PriceIngestReject(BaseModel):
+    row: int
+    error: str
+
+
+class PriceIngestResult(BaseModel):
+    accepted: int  # bars written
+    rejected: List[PriceIngestReject] = []
+    # Rows superseded by a later row for the same bar in the same write
+    # chunk (last one wins); repeats across chunks simply overwrite
+    duplicates: List[int] = []
+
+
+class DocumentIngestResult(BaseModel):
+    documents: int = 0
+    chunks: int = 0
+    written: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    seconds: float = 0
+    chunks_per_second: float = 0
 
 
 class PriceOut(BaseModel):
@@ -0,0 +1,110 @@
+# app/services/auth_cache.py
+
+# In-process caches behind get_current_user:
+#
+#   token -> (user_id, iat)   verified JWT claims, kept until the token expires
+#   (user_id, iat) -> User    detached user rows, short TTL
+#
+# Users are dropped from the cache whenever a User row is updated or
+# deleted through the ORM in this process; other workers see the change
+# within AUTH_USER_CACHE_TTL_SECONDS.
+
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event
+
+from app import models
+from app.core.config import settings
+
+
+class _LRU:
+    """
+    Bounded LRU of (value, expires_at) entries.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.time():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value, expires_at: float):
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, predicate):
+        for key in [k for k in self._entries if predicate(k)]:
+            del self._entries[key]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0,
+        }
+
+
+class AuthCache:
+    def __init__(
+        self,
+        token_entries: int = 10000,
+        user_entries: int = 2048,
+        user_ttl: float = 30.0,
+    ):
+        self.user_ttl = user_ttl
+        self.tokens = _LRU(token_entries)
+        self.users = _LRU(user_entries)
+
+    # ============================
+    # TOKENS
+    # ============================
+    def get_claims(self, token: str) -> tuple[int, int] | None:
+        return self.tokens.get(token)
+
+    def put_claims(self, token: str, user_id: int, iat: int, exp: float):
+        self.tokens.put(token, (user_id, iat), exp)
+
+    # ============================
+    # USERS
+    # ============================
+    def get_user(self, user_id: int, iat: int):
+        return self.users.get((user_id, iat))
+
+    def put_user(self, user_id: int, iat: int, user):
+        if self.user_ttl > 0:
+            self.users.put((user_id, iat), user, time.time() + self.user_ttl)
+
+    def invalidate_user(self, user_id: int):
+        self.users.discard(lambda key: key[0] == user_id)
+
+    def stats(self) -> dict:
+        return {"tokens": self.tokens.stats(), "users": self.users.stats()}
+
+
+auth_cache = AuthCache(
+    token_entries=settings.AUTH_TOKEN_CACHE_SIZE,
+    user_entries=settings.AUTH_USER_CACHE_SIZE,
+    user_ttl=settings.AUTH_USER_CACHE_TTL_SECONDS,
+)
+
+
+@event.listens_for(models.User, "after_update")
+@event.listens_for(models.User, "after_delete")
+def _user_changed(mapper, connection, target):
+    auth_cache.invalidate_user(target.id)
@@ -0,0 +1,287 @@
+# app/services/bar_aggregator.py
+
+# Streaming OHLCV bars built from live ticks.
+#
+# Ticks from the quote hub (WebSocket pollers) and the price collector
+# are folded into one forming bar per (instrument, resolution). A bar
+# closes when a tick for a later bar arrives or once the clock has passed
+# its end; closed bars are queued and written in one batched upsert per
+# flush. The forming bar is readable at any time, so /candles and the
+# market WebSocket can show the live bar without a provider round trip.
+#
+# Ticks outside the 09:15-15:30 IST session are dropped: off-hours the
+# LTP endpoint keeps returning the last traded price, which would
+# otherwise become flat bars. LTP quotes carry no volume, so bars built
+# from them have volume 0; the persisted merge keeps the larger of the
+# stored and built volume, so provider candles keep their real volume.
+# Bars that saw fewer than BAR_MIN_TICKS ticks are not persisted either:
+# a single quote says nothing about the bar's high and low.
+
+import asyncio
+import time
+
+from app.core.config import settings
+from app.crud import assets as assets_crud, prices as prices_crud
+from app.db.session import AsyncSessionLocal
+from app.services.sessions import DAY_MS, bar_ms, bar_start, in_session
+
+# Late ticks for a bar are still accepted this long after it ends
+CLOSE_GRACE_MS = 2000
+
+# Closed bars kept while the DB is unavailable; oldest are dropped first
+MAX_PENDING_BARS = 50000
+
+
+def _resolutions(raw: str) -> list[str]:
+    return [r.strip().upper() for r in raw.split(",") if r.strip()]
+
+
+def merge_forming(candles: list[dict], bar: dict | None) -> list[dict]:
+    """
+    Overlay the forming bar on provider/stored candles (oldest first).
+    A bar with the same time extends the stored one, a newer bar is
+    appended. The input list and its dicts are left untouched.
+    """
+    if not bar:
+        return candles
+    if not candles or bar["time"] > candles[-1]["time"]:
+        return candles + [dict(bar)]
+    if bar["time"] < candles[-1]["time"]:
+        return candles
+
+    last = dict(candles[-1])
+    last["high"] = max(last["high"], bar["high"])
+    last["low"] = min(last["low"], bar["low"])
+    last["close"] = bar["close"]
+    last["volume"] = max(last.get("volume") or 0.0, bar["volume"])
+    return candles[:-1] + [last]
+
+
+class BarAggregator:
+    """
+    In-memory tick -> bar aggregation, keyed by instrument key.
+
+    A bar is only persisted if ticks were seen from (about) its start:
+    the first bar after startup, or after a gap longer than one bar, is
+    partial and only served live. The same goes for bars with fewer than
+    `min_ticks` ticks. Persisted bars are merged into existing
+    rows, so a provider bar for the same interval is extended rather than
+    replaced.
+    """
+
+    def __init__(
+        self,
+        resolutions: list[str],
+        flush_interval: float = 5.0,
+        min_ticks: int = 2,
+    ):
+        self.flush_interval = flush_interval
+        self.min_ticks = min_ticks
+        self._resolutions: list[str] = []
+        for resolution in resolutions:
+            self.track(resolution)
+
+        # (instrument_key, resolution) -> forming bar
+        self._forming: dict[tuple[str, str], dict] = {}
+        self._last_tick: dict[str, int] = {}
+        self._symbols: dict[str, str] = {}
+        self._pending: list[tuple[str, str, dict]] = []
+
+        self.ticks = 0
+        self.off_session_ticks = 0
+        self.late_ticks = 0
+        self.bars_closed = 0
+        self.bars_written = 0
+        self.partial_skipped = 0
+        self.sparse_skipped = 0
+        self.dropped = 0
+        self.flush_failures = 0
+        self.last_flush_seconds: float | None = None
+
+    def track(self, resolution: str) -> bool:
+        """
+        Start building bars at `resolution`. False if it is not a
+        resolution bar_start() understands.
+        """
+        if resolution in self._resolutions:
+            return True
+        try:
+            bar_start(0, resolution)
+        except KeyError:
+            return False
+        self._resolutions.append(resolution)
+        return True
+
+    def resolutions(self) -> list[str]:
+        return list(self._resolutions)
+
+    # ============================
+    # TICKS
+    # ============================
+    def on_tick(
+        self,
+        instrument_key: str,
+        price: float,
+        ts_ms: int,
+        volume: float = 0.0,
+        symbol: str | None = None,
+    ):
+        if not in_session(ts_ms):
+            self.off_session_ticks += 1
+            return
+
+        if symbol:
+            self._symbols.setdefault(instrument_key, symbol.upper())
+
+        self.ticks += 1
+        prev_tick = self._last_tick.get(instrument_key)
+        self._last_tick[instrument_key] = max(prev_tick or ts_ms, ts_ms)
+
+        for resolution in self._resolutions:
+            key = (instrument_key, resolution)
+            start = bar_start(ts_ms, resolution)
+            bar = self._forming.get(key)
+
+            if bar is not None and start < bar["time"]:
+                self.late_ticks += 1
+                continue
+
+            if bar is not None and start == bar["time"]:
+                bar["high"] = max(bar["high"], price)
+                bar["low"] = min(bar["low"], price)
+                bar["close"] = price
+                bar["volume"] += volume
+                bar["ticks"] += 1
+                continue
+
+            if bar is not None:
+                self._close(key, bar)
+
+            self._forming[key] = {
+                "time": start,
+                "open": price,
+                "high": price,
+                "low": price,
+                "close": price,
+                "volume": volume,
+                "ticks": 1,
+                "partial": prev_tick is None
+                or prev_tick < start - bar_ms(resolution),
+            }
+
+    def _close(self, key: tuple[str, str], bar: dict):
+        del self._forming[key]
+        self.bars_closed += 1
+
+        if bar.pop("partial") or key[0] not in self._symbols:
+            self.partial_skipped += 1
+            return
+        if bar.pop("ticks") < self.min_ticks:
+            self.sparse_skipped += 1
+            return
+
+        self._pending.append((key[0], key[1], bar))
+        if len(self._pending) > MAX_PENDING_BARS:
+            excess = len(self._pending) - MAX_PENDING_BARS
+            del self._pending[:excess]
+            self.dropped += excess
+
+    def close_expired(self, now_ms: int | None = None) -> int:
+        """
+        Close every bar whose interval (plus grace) has ended.
+        """
+        if now_ms is None:
+            now_ms = int(time.time() * 1000)
+
+        expired = [
+            (key, bar) for key, bar in self._forming.items()
+            if bar["time"] + bar_ms(key[1]) + CLOSE_GRACE_MS <= now_ms
+        ]
+        for key, bar in expired:
+            self._close(key, bar)
+
+        for instrument_key, ts in list(self._last_tick.items()):
+            if ts < now_ms - DAY_MS:
+                del self._last_tick[instrument_key]
+
+        return len(expired)
+
+    def forming(self, instrument_key: str, resolution: str) -> dict | None:
+        bar = self._forming.get((instrument_key, resolution))
+        if bar is None:
+            return None
+        return {k: v for k, v in bar.items() if k not in ("partial", "ticks")}
+
+    # ============================
+    # PERSISTENCE
+    # ============================
+    async def flush(self) -> int:
+        """
+        Write all closed bars: one transaction for asset rows and bars.
+        On failure the bars are re-queued for the next flush.
+        """
+        self.close_expired()
+        if not self._pending:
+            return 0
+
+        batch, self._pending = self._pending, []
+        started = time.monotonic()
+        try:
+            async with AsyncSessionLocal() as db:
+                asset_ids = await assets_crud.get_or_create_asset_ids(
+                    db, [self._symbols[key] for key, _, _ in batch]
+                )
+                written = await prices_crud.upsert_prices(db, [
+                    {
+                        "asset_id": asset_ids[self._symbols[key]],
+                        "resolution": resolution,
+                        "timestamp": prices_crud.to_datetime(bar["time"]),
+                        "open": bar["open"],
+                        "high": bar["high"],
+                        "low": bar["low"],
+                        "close": bar["close"],
+                        "volume": bar["volume"],
+                    }
+                    for key, resolution, bar in batch
+                ], merge=True)
+        except Exception:
+            self.flush_failures += 1
+            self._pending = batch + self._pending
+            raise
+
+        self.bars_written += written
+        self.last_flush_seconds = time.monotonic() - started
+        return written
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Bar flush failed: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "resolutions": list(self._resolutions),
+            "instruments": len(self._last_tick),
+            "forming": len(self._forming),
+            "pending": len(self._pending),
+            "ticks": self.ticks,
+            "off_session_ticks": self.off_session_ticks,
+            "late_ticks": self.late_ticks,
+            "bars_closed": self.bars_closed,
+            "bars_written": self.bars_written,
+            "partial_skipped": self.partial_skipped,
+            "sparse_skipped": self.sparse_skipped,
+            "dropped": self.dropped,
+            "flush_failures": self.flush_failures,
+            "last_flush_seconds": self.last_flush_seconds,
+        }
+
+
+bar_aggregator = BarAggregator(
+    _resolutions(settings.BAR_RESOLUTIONS),
+    flush_interval=settings.BAR_FLUSH_INTERVAL_SECONDS,
+    min_ticks=settings.BAR_MIN_TICKS,
+)
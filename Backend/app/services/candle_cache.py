@@ -0,0 +1,128 @@
+# app/services/candle_cache.py
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+from app.core.config import settings
+from app.services.sessions import bar_start, bar_ms, missing_bars
+from app.services.market_providers.upstox import is_market_open
+
+# fetch(limit) -> candles (oldest first)
+CandleFetch = Callable[[int], Awaitable[list[dict]]]
+
+
+class _Entry:
+    __slots__ = ("candles", "expires_at")
+
+    def __init__(self, candles: list[dict], expires_at: float):
+        self.candles = candles
+        self.expires_at = expires_at
+
+
+class CandleCache:
+    """
+    LRU cache of provider candle responses keyed by
+    (instrument_key, resolution, limit).
+
+    Closed bars never change, so an expired entry is refreshed by
+    fetching only the tail (bars since the last cached one) and merging
+    it in. Concurrent requests for the same key share one in-flight fetch.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._inflight: dict[tuple, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.coalesced = 0
+
+    def _ttl(self, resolution: str) -> float:
+        if not is_market_open():
+            return settings.CANDLE_CACHE_CLOSED_TTL_SECONDS
+
+        # Forming bar: refresh at the next bar boundary or the forming TTL
+        now_ms = int(time.time() * 1000)
+        try:
+            next_bar = bar_start(now_ms, resolution) + bar_ms(resolution)
+        except KeyError:
+            next_bar = now_ms
+        return max(
+            1.0,
+            min((next_bar - now_ms) / 1000, settings.CANDLE_CACHE_FORMING_TTL_SECONDS),
+        )
+
+    def _tail_limit(self, candles: list[dict], resolution: str, limit: int) -> int:
+        if not candles:
+            return limit
+        times = [c["time"] for c in candles[-2:]]
+        missing = missing_bars(times, resolution, int(time.time() * 1000))
+        return int(min(limit, missing))
+
+    async def _load(self, key: tuple, fetch: CandleFetch) -> list[dict]:
+        _, resolution, limit = key
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            candles = await fetch(limit)
+        else:
+            self.refreshes += 1
+            tail = await fetch(self._tail_limit(entry.candles, resolution, limit))
+            if tail:
+                # Replace the forming bar (and anything after it) with fresh data
+                first = tail[0]["time"]
+                candles = [c for c in entry.candles if c["time"] < first] + tail
+                candles = candles[-limit:]
+            else:
+                candles = entry.candles
+
+        if candles:
+            self._entries[key] = _Entry(candles, time.monotonic() + self._ttl(resolution))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return candles
+
+    async def get_or_fetch(
+        self,
+        instrument_key: str,
+        resolution: str,
+        limit: int,
+        fetch: CandleFetch,
+    ) -> list[dict]:
+        key = (instrument_key, resolution, limit)
+
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at > time.monotonic():
+            self.hits += 1
+            self._entries.move_to_end(key)
+            candles = entry.candles
+        else:
+            task = self._inflight.get(key)
+            if task is None:
+                task = asyncio.create_task(self._load(key, fetch))
+                self._inflight[key] = task
+                task.add_done_callback(lambda _: self._inflight.pop(key, None))
+            else:
+                self.coalesced += 1
+            candles = await asyncio.shield(task)
+
+        # Callers annotate candles in place (indicators); hand out copies
+        return [dict(c) for c in candles]
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "coalesced": self.coalesced,
+        }
+
+
+candle_cache = CandleCache(max_entries=settings.CANDLE_CACHE_MAX_ENTRIES)
@@ -0,0 +1,90 @@
+# app/services/candle_store.py
+
+import time
+
+from app.crud import assets as assets_crud, prices as prices_crud
+from app.db.session import AsyncSessionLocal
+from app.services.market_providers.base import MarketProvider
+from app.services.sessions import missing_bars
+
+
+def _row_to_candle(row) -> dict:
+    return {
+        "time": prices_crud.to_millis(row.timestamp),
+        "open": row.open,
+        "high": row.high,
+        "low": row.low,
+        "close": row.close,
+        "volume": row.volume,
+    }
+
+
+async def get_candles(
+    symbol: str,
+    instrument_key: str,
+    resolution: str,
+    limit: int,
+    provider: MarketProvider,
+) -> list[dict]:
+    """
+    Candles served from the local `prices` table.
+
+    Only the missing tail (bars after the newest stored one, including
+    that possibly still-forming bar) is fetched from the provider and
+    persisted; with fewer than `limit` stored bars the full window is
+    fetched. If the provider is unavailable the stored bars are served
+    as-is, which also keeps history beyond the provider's own window.
+    """
+    async with AsyncSessionLocal() as db:
+        asset = await assets_crud.get_asset_by_symbol(db, symbol.upper())
+
+        stored = []
+        if asset is not None:
+            rows = await prices_crud.get_recent_prices(
+                db, asset.id, limit, resolution=resolution
+            )
+            stored = [_row_to_candle(r) for r in reversed(rows)]
+
+        # -------- Gap detection --------
+        # A short history (e.g. only live-aggregated bars) is backfilled
+        # in full; otherwise only the tail since the newest bar is fetched
+        if len(stored) >= limit:
+            times = [c["time"] for c in stored[-2:]]
+            fetch_limit = min(
+                limit, missing_bars(times, resolution, int(time.time() * 1000))
+            )
+        else:
+            fetch_limit = limit
+
+        fetched = await provider.fetch_candles(
+            instrument_key=instrument_key,
+            resolution=resolution,
+            limit=fetch_limit,
+        )
+
+        if fetched:
+            # Assets are only created once there are bars to store;
+            # committed together with the bars
+            if asset is None:
+                asset_id = (await assets_crud.get_or_create_asset_ids(
+                    db, [symbol.upper()]
+                ))[symbol.upper()]
+            else:
+                asset_id = asset.id
+            await prices_crud.upsert_prices(db, [
+                {
+                    "asset_id": asset_id,
+                    "resolution": resolution,
+                    "timestamp": prices_crud.to_datetime(c["time"]),
+                    "open": c["open"],
+                    "high": c["high"],
+                    "low": c["low"],
+                    "close": c["close"],
+                    "volume": c["volume"],
+                }
+                for c in fetched
+            ])
+
+    merged = {c["time"]: c for c in stored}
+    merged.update((c["time"], c) for c in fetched or [])
+    return [merged[t] for t in sorted(merged)][-limit:]
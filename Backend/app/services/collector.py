@@ -0,0 +1,196 @@
+# app/services/collector.py
+
+# Watchlist price collector.
+#
+#   python -m app.services.collector
+#
+# A single long-lived async worker. While the market is open it runs one
+# cycle every COLLECTOR_INTERVAL_SECONDS (aligned to wall-clock
+# boundaries): quote the whole tracked universe — every row in `assets`
+# plus COLLECTOR_SYMBOLS — in batched provider calls and feed the quotes
+# to the bar aggregator, which writes closed OHLC bars in one transaction.
+# A shorter interval gives the bars more ticks; an interval that cannot
+# give each bar BAR_MIN_TICKS ticks is rejected, since the aggregator
+# would never persist a bar. Outside market hours it
+# sleeps until the next session open. With COLLECTOR_ENABLED the API
+# runs it in-process.
+
+import asyncio
+import sys
+import time
+
+from app.core.config import settings
+from app.crud import assets as assets_crud
+from app.db.session import AsyncSessionLocal
+from app.services.bar_aggregator import bar_aggregator
+from app.services.market_providers.router import get_upstox_provider
+from app.services.market_providers.upstox import is_market_open
+from app.services.sessions import bar_ms, next_session_open
+from app.services.symbol_resolver import get_canonical_symbol, get_instrument_key
+
+# Re-check the clock at least this often while waiting for the open
+MAX_IDLE_SLEEP_SECONDS = 3600
+
+
+def _configured_symbols() -> list[str]:
+    return [s.strip().upper() for s in settings.COLLECTOR_SYMBOLS.split(",") if s.strip()]
+
+
+class PriceCollector:
+    def __init__(self, interval_seconds: float = 15.0):
+        self.interval = interval_seconds
+
+        self.cycles = 0
+        self.failures = 0
+        self.bars_written = 0
+        self.last_symbols = 0
+        self.last_quoted = 0
+        self.last_cycle_seconds: float | None = None
+        self.last_lag_seconds: float | None = None
+        self.last_run_at: float | None = None
+
+    async def universe(self) -> list[str]:
+        async with AsyncSessionLocal() as db:
+            symbols = await assets_crud.list_symbols(db)
+        return list(dict.fromkeys(symbols + _configured_symbols()))
+
+    async def collect_once(self, symbols: list[str] | None = None) -> dict:
+        """
+        One cycle: one bulk quote call (chunked by the provider), ticks
+        folded into live bars, closed bars flushed in one transaction.
+        """
+        started = time.monotonic()
+        if symbols is None:
+            symbols = await self.universe()
+
+        # Keyed by canonical symbol, so spellings of one instrument
+        # ("reliance", "NSE:RELIANCE") are quoted and stored once
+        keys = {}
+        for symbol in symbols:
+            try:
+                key = get_instrument_key(symbol)
+            except ValueError:
+                continue
+            keys[get_canonical_symbol(symbol)] = key
+
+        quotes = await get_upstox_provider().fetch_quotes(list(set(keys.values())))
+        priced = {
+            symbol: quotes[key] for symbol, key in keys.items()
+            if isinstance(quotes.get(key), dict) and "price" in quotes[key]
+        }
+
+        for symbol, quote in priced.items():
+            bar_aggregator.on_tick(
+                keys[symbol],
+                quote["price"],
+                int(quote["timestamp"]) * 1000,
+                volume=quote.get("volume", 0.0),
+                symbol=symbol,
+            )
+
+        # Writes the bars this cycle's ticks closed (one transaction)
+        written = await bar_aggregator.flush()
+
+        seconds = time.monotonic() - started
+        self.cycles += 1
+        self.bars_written += written
+        self.last_symbols = len(symbols)
+        self.last_quoted = len(priced)
+        self.last_cycle_seconds = seconds
+        self.last_run_at = time.time()
+
+        return {
+            "symbols": len(symbols),
+            "quoted": len(priced),
+            "written": written,
+            "seconds": seconds,
+        }
+
+    def check_interval(self):
+        """
+        Raise ValueError unless each bar at the shortest tracked
+        resolution gets at least BAR_MIN_TICKS ticks.
+        """
+        resolutions = bar_aggregator.resolutions()
+        if not resolutions:
+            return
+        shortest = min(bar_ms(r) for r in resolutions) / 1000
+        if self.interval * bar_aggregator.min_ticks > shortest:
+            raise ValueError(
+                f"COLLECTOR_INTERVAL_SECONDS={self.interval:g} gives bars of "
+                f"{shortest:g}s fewer than BAR_MIN_TICKS={bar_aggregator.min_ticks} "
+                f"ticks; use at most {shortest / bar_aggregator.min_ticks:g}s"
+            )
+
+    async def run(self):
+        self.check_interval()
+        while True:
+            if not is_market_open():
+                now_ms = int(time.time() * 1000)
+                wait = (next_session_open(now_ms) - now_ms) / 1000
+                await asyncio.sleep(min(max(wait, 1.0), MAX_IDLE_SLEEP_SECONDS))
+                continue
+
+            # Next wall-clock boundary; missed ticks are skipped, not replayed
+            scheduled = (time.time() // self.interval + 1) * self.interval
+            await asyncio.sleep(max(0.0, scheduled - time.time()))
+
+            try:
+                result = await self.collect_once()
+            except Exception as e:
+                self.failures += 1
+                print(f"Collector cycle failed: {e}")
+                continue
+
+            # Lag: how far behind its scheduled tick the cycle finished
+            self.last_lag_seconds = time.time() - scheduled
+            print(
+                f"Collector cycle: {result['quoted']}/{result['symbols']} symbols, "
+                f"{result['written']} bars in {result['seconds']:.2f}s "
+                f"(lag {self.last_lag_seconds:.2f}s)"
+            )
+
+    def stats(self) -> dict:
+        return {
+            "cycles": self.cycles,
+            "failures": self.failures,
+            "bars_written": self.bars_written,
+            "last_symbols": self.last_symbols,
+            "last_quoted": self.last_quoted,
+            "last_cycle_seconds": self.last_cycle_seconds,
+            "last_lag_seconds": self.last_lag_seconds,
+            "last_run_at": self.last_run_at,
+        }
+
+
+collector = PriceCollector(interval_seconds=settings.COLLECTOR_INTERVAL_SECONDS)
+
+
+async def _main():
+    from app.db.migrations import run_migrations
+    from app.db.session import engine
+    from app.models import Base
+    from app.services import instrument_registry
+    from app.services.http_clients import close_clients, start_clients
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(run_migrations)
+
+    await start_clients()
+    await asyncio.to_thread(instrument_registry.ensure_loaded)
+    refresh = asyncio.create_task(instrument_registry.refresh_loop())
+
+    try:
+        await collector.run()
+    finally:
+        refresh.cancel()
+        await close_clients()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        sys.exit(0)
@@ -0,0 +1,125 @@
+# app/services/embedding_cache.py
+
+import hashlib
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+
+from app.crud import embedding_cache as cache_crud
+from app.db.session import AsyncSessionLocal
+from app.services.vector_index import pack_vector, unpack_vector
+
+# The DB tier is trimmed to `db_max_entries` after this many new rows
+PRUNE_EVERY_WRITES = 1000
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def cache_key(text: str, model: str) -> str:
+    return hashlib.sha256(
+        f"{model}\0{normalize_text(text)}".encode("utf-8")
+    ).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding cache: an in-memory LRU in front of the
+    `embedding_cache` table. Vectors are kept as float32 in both tiers.
+    Both tiers are LRU-bounded. A failing DB tier or an undecodable row
+    only costs hit rate, never the request.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        max_entries: int = 10000,
+        persist: bool = True,
+        db_max_entries: int = 200000,
+    ):
+        self.model = model
+        self.max_entries = max_entries
+        self.persist = persist
+        self.db_max_entries = db_max_entries
+        self._writes_since_prune = 0
+        self._memory: OrderedDict[str, np.ndarray] = OrderedDict()
+
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.db_pruned = 0
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        found = {}
+        for key in keys:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                found[key] = vector
+
+        missing = [k for k in dict.fromkeys(keys) if k not in found]
+        self.memory_hits += len(found)
+
+        if missing and self.persist:
+            vectors = {}
+            try:
+                async with AsyncSessionLocal() as db:
+                    for key, blob in (await cache_crud.get_vectors(db, missing)).items():
+                        try:
+                            vectors[key] = unpack_vector(blob)
+                        except ValueError:
+                            continue  # undecodable row: a miss, re-embedded
+                    await cache_crud.touch(db, list(vectors))
+            except Exception as e:
+                print(f"Embedding cache lookup failed: {e}")
+
+            for key, vector in vectors.items():
+                self._remember(key, vector)
+                found[key] = vector
+            self.db_hits += len(vectors)
+
+        self.misses += sum(1 for k in missing if k not in found)
+        return found
+
+    async def put_many(self, vectors: dict[str, np.ndarray]):
+        for key, vector in vectors.items():
+            self._remember(key, np.asarray(vector, dtype=np.float32))
+
+        if vectors and self.persist:
+            try:
+                async with AsyncSessionLocal() as db:
+                    await cache_crud.store_vectors(
+                        db,
+                        self.model,
+                        {k: pack_vector(v) for k, v in vectors.items()},
+                    )
+                    self._writes_since_prune += len(vectors)
+                    if (
+                        self.db_max_entries
+                        and self._writes_since_prune >= PRUNE_EVERY_WRITES
+                    ):
+                        self._writes_since_prune = 0
+                        self.db_pruned += await cache_crud.prune(
+                            db, self.db_max_entries
+                        )
+            except Exception as e:
+                print(f"Embedding cache write failed: {e}")
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.db_hits + self.misses
+        return {
+            "entries": len(self._memory),
+            "memory_hits": self.memory_hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "db_pruned": self.db_pruned,
+            "hit_rate": (self.memory_hits + self.db_hits) / lookups if lookups else 0,
+        }
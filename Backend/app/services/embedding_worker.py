@@ -0,0 +1,108 @@
+# app/services/embedding_worker.py
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+import numpy as np
+
+
+class EmbeddingWorker:
+    """
+    Runs a blocking `encode(texts) -> (n, dim) array` function in a
+    thread pool and micro-batches concurrent requests.
+
+    Requests are collected for up to `max_wait_ms` (or until
+    `max_batch_size` texts are queued) and encoded in one forward pass,
+    keeping the model off the event loop. At most `workers` batches run
+    at once.
+    """
+
+    def __init__(
+        self,
+        encode: Callable[[list[str]], np.ndarray],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5,
+        workers: int = 1,
+    ):
+        self.encode = encode
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.workers = workers
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="embedding"
+        )
+        self._queue: asyncio.Queue | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._collector: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+        self.batches = 0
+        self.texts = 0
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._collector and not self._collector.done():
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._collector = loop.create_task(self._collect())
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._slots.acquire()
+            loop.create_task(self._run_batch(batch))
+
+    async def _run_batch(self, batch: list[tuple[str, asyncio.Future]]):
+        try:
+            texts = [text for text, _ in batch]
+            vectors = await asyncio.get_running_loop().run_in_executor(
+                self._executor, self.encode, texts
+            )
+            self.batches += 1
+            self.texts += len(texts)
+            for (_, fut), vec in zip(batch, vectors):
+                if not fut.done():
+                    fut.set_result(np.asarray(vec, dtype=np.float32).tolist())
+        except Exception as e:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+        finally:
+            self._slots.release()
+
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        self._ensure_started()
+        loop = asyncio.get_running_loop()
+        futures = []
+        for text in texts:
+            fut = loop.create_future()
+            self._queue.put_nowait((text, fut))
+            futures.append(fut)
+        return list(await asyncio.gather(*futures))
+
+    async def embed(self, text: str) -> list[float]:
+        return (await self.embed_many([text]))[0]
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "texts": self.texts,
+            "avg_batch_size": self.texts / self.batches if self.batches else 0,
+            "queued": self._queue.qsize() if self._queue else 0,
+        }
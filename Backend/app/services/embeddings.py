@@ -1,23 +1,110 @@
-import json
-from sentence_transformers import SentenceTransformer
+import threading
+
 import numpy as np
+
 from app.core.config import settings
+from app.services.embedding_cache import EmbeddingCache, cache_key
+from app.services.embedding_worker import EmbeddingWorker
+from app.services.vector_index import get_vector_index
 
 
 class EmbeddingsStore:
     """
-    For now, this just provides embed() and a stub similarity_search().
-    Later you can connect Pinecone / Chroma / Qdrant here.
+    Provides embed() and similarity_search() over the in-process
+    vector index (app.services.vector_index).
     """
 
     def __init__(self):
-        self.model = SentenceTransformer(settings.EMBEDDING_MODEL)
+        self._model = None
+        self._model_lock = threading.Lock()
+        self.worker = EmbeddingWorker(
+            self._encode,
+            max_batch_size=settings.EMBEDDING_BATCH_SIZE,
+            max_wait_ms=settings.EMBEDDING_BATCH_WAIT_MS,
+            workers=settings.EMBEDDING_WORKERS,
+        )
+        self.cache = EmbeddingCache(
+            settings.EMBEDDING_MODEL,
+            max_entries=settings.EMBEDDING_CACHE_SIZE,
+            persist=settings.EMBEDDING_CACHE_PERSIST,
+            db_max_entries=settings.EMBEDDING_CACHE_DB_MAX_ENTRIES,
+        )
+
+    @property
+    def model(self):
+        """
+        The SentenceTransformer, loaded on first use. The import pulls in
+        torch, so it is deferred until then as well.
+        """
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+                    self._model = SentenceTransformer(settings.EMBEDDING_MODEL)
+        return self._model
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def load(self):
+        self.model
+
+    def _encode(self, texts: list[str]):
+        return self.model.encode(
+            texts, batch_size=len(texts), show_progress_bar=False
+        )
 
     def embed_text(self, text: str) -> list[float]:
+        """
+        Blocking; use aembed_text() from async code.
+        """
         emb = self.model.encode([text], show_progress_bar=False)[0]
         return emb.tolist()
 
+    async def aembed_text(self, text: str) -> list[float]:
+        return (await self.embed_many([text]))[0]
+
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        """
+        Batched, off-event-loop embedding of many texts. Texts seen
+        before (by normalized content) are served from the cache and
+        duplicates within the call are encoded once.
+        """
+        keys = [cache_key(text, settings.EMBEDDING_MODEL) for text in texts]
+        found = await self.cache.get_many(keys)
+
+        pending = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                pending.setdefault(key, text)
+
+        if pending:
+            vectors = await self.worker.embed_many(list(pending.values()))
+            fresh = dict(zip(pending.keys(), vectors))
+            await self.cache.put_many(fresh)
+            found.update(fresh)
+
+        return [np.asarray(found[key], dtype=np.float32).tolist() for key in keys]
+
     def similarity_search(self, query_emb: list[float], top_k: int = 5):
-        # TODO: hook to real vector DB
-        # For now, return empty list
-        return []
+        """
+        Top-k documents as [{"id": DocumentEmbedding.id, "score": cosine}].
+        """
+        index = get_vector_index(len(query_emb))
+        if not len(index):
+            return []
+        return [
+            {"id": doc_pk, "score": score}
+            for doc_pk, score in index.search(query_emb, top_k)
+        ]
+
+
+_store: EmbeddingsStore | None = None
+
+
+def get_embeddings_store() -> EmbeddingsStore:
+    global _store
+    if _store is None:
+        _store = EmbeddingsStore()
+    return _store
@@ -0,0 +1,118 @@
+# app/services/explanation_cache.py
+
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+from app.core.config import settings
+
+# Answers LLMClient returns on failure; never cached
+UNCACHEABLE_PREFIXES = ("AI service error", "No response generated.")
+
+
+def _number(value) -> float | None:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def _pct_bucket(value: float | None, base: float | None, step: float):
+    if value is None or not base:
+        return None
+    return math.floor((value - base) / base * 100 / step)
+
+
+def indicator_bucket(rsi, sma, ema, price) -> tuple:
+    """
+    Coarse market state the explanation depends on:
+    RSI band, EMA-vs-SMA spread (its sign is the crossover state) and
+    price-vs-SMA spread, each quantized by the configured step.
+    """
+    rsi, sma, ema, price = map(_number, (rsi, sma, ema, price))
+    rsi_band = None
+    if rsi is not None:
+        rsi_band = math.floor(min(max(rsi, 0), 100) / settings.EXPLAIN_CACHE_RSI_BUCKET)
+
+    step = settings.EXPLAIN_CACHE_PCT_BUCKET
+    return (rsi_band, _pct_bucket(ema, sma, step), _pct_bucket(price, sma, step))
+
+
+class _Entry:
+    __slots__ = ("answer", "expires_at")
+
+    def __init__(self, answer: str, expires_at: float):
+        self.answer = answer
+        self.expires_at = expires_at
+
+
+class ExplanationCache:
+    """
+    TTL + LRU cache of explain-indicators answers keyed by
+    (symbol, indicator_bucket). Dashboards re-request near-identical
+    explanations on every refresh; those land in the same bucket and
+    are served without an LLM call. Concurrent misses for the same key
+    share one generation.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._inflight: dict[tuple, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def _generate(self, key: tuple, generate: Callable[[], Awaitable[str]]) -> str:
+        self.misses += 1
+        answer = await generate()
+        if not answer.startswith(UNCACHEABLE_PREFIXES):
+            self._entries[key] = _Entry(
+                answer, time.monotonic() + settings.EXPLAIN_CACHE_TTL_SECONDS
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return answer
+
+    async def get_or_generate(
+        self,
+        symbol: str | None,
+        rsi,
+        sma,
+        ema,
+        price,
+        generate: Callable[[], Awaitable[str]],
+    ) -> str:
+        key = ((symbol or "").upper(),) + indicator_bucket(rsi, sma, ema, price)
+
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at > time.monotonic():
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry.answer
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._generate(key, generate))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0,
+        }
+
+
+explanation_cache = ExplanationCache(max_entries=settings.EXPLAIN_CACHE_MAX_ENTRIES)
@@ -0,0 +1,130 @@
+# app/services/http_clients.py
+
+import asyncio
+import httpx
+from app.core.config import settings
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+def _client_configs() -> dict[str, dict]:
+    """
+    Per-provider pool settings. HTTP/2 is only negotiated where the
+    upstream supports it (falls back to HTTP/1.1 via ALPN otherwise).
+    """
+    return {
+        "upstox": {
+            "max_connections": settings.HTTP_UPSTOX_MAX_CONNECTIONS,
+            "http2": True,
+        },
+        "finnhub": {
+            "max_connections": settings.HTTP_FINNHUB_MAX_CONNECTIONS,
+            "http2": True,
+        },
+        "news": {
+            "max_connections": settings.HTTP_NEWS_MAX_CONNECTIONS,
+            "http2": False,
+        },
+    }
+
+
+class _ClientStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+
+    async def on_request(self, request: httpx.Request):
+        self.requests += 1
+
+    async def on_response(self, response: httpx.Response):
+        if response.status_code >= 400:
+            self.errors += 1
+
+
+# name -> (client, loop it was created on, stats)
+_clients: dict[str, tuple[httpx.AsyncClient, asyncio.AbstractEventLoop, _ClientStats]] = {}
+
+
+def _build_client(name: str, stats: _ClientStats) -> httpx.AsyncClient:
+    config = _client_configs()[name]
+
+    max_connections = config["max_connections"]
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=min(
+            settings.HTTP_MAX_KEEPALIVE_CONNECTIONS, max_connections
+        ),
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    )
+    timeout = httpx.Timeout(
+        settings.HTTP_TIMEOUT_SECONDS,
+        connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+    )
+
+    return httpx.AsyncClient(
+        limits=limits,
+        timeout=timeout,
+        http2=config["http2"] and settings.HTTP2_ENABLED and HTTP2_AVAILABLE,
+        event_hooks={
+            "request": [stats.on_request],
+            "response": [stats.on_response],
+        },
+    )
+
+
+def get_client(name: str) -> httpx.AsyncClient:
+    """
+    Shared, long-lived client for the given provider.
+    Created lazily; a new one is built if the owning event loop changed
+    (e.g. Celery tasks each running their own `asyncio.run`).
+    """
+    loop = asyncio.get_running_loop()
+    entry = _clients.get(name)
+
+    if entry is not None:
+        client, client_loop, stats = entry
+        if client_loop is loop and not client.is_closed:
+            return client
+    else:
+        stats = _ClientStats()
+
+    client = _build_client(name, stats)
+    _clients[name] = (client, loop, stats)
+    return client
+
+
+async def start_clients():
+    for name in _client_configs():
+        get_client(name)
+
+
+async def close_clients():
+    entries = list(_clients.values())
+    _clients.clear()
+    for client, client_loop, _ in entries:
+        if client_loop is asyncio.get_running_loop() and not client.is_closed:
+            await client.aclose()
+
+
+def _pool(client: httpx.AsyncClient):
+    # httpcore internals; tolerate layout changes between versions
+    return getattr(client._transport, "_pool", None)
+
+
+def pool_stats() -> dict:
+    stats = {}
+    for name, (client, _, client_stats) in _clients.items():
+        pool = _pool(client)
+        connections = list(getattr(pool, "connections", []) or [])
+        stats[name] = {
+            "requests": client_stats.requests,
+            "errors": client_stats.errors,
+            "connections": len(connections),
+            "idle_connections": sum(1 for c in connections if c.is_idle()),
+            "http2": bool(getattr(pool, "_http2", False)),
+        }
+    return stats
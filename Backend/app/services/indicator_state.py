@@ -0,0 +1,171 @@
+# app/services/indicator_state.py
+
+# Incremental counterparts of app.services.indicators.
+# Each object is seeded from closed candles and then advanced in O(1)
+# per bar. `update()` commits a closed bar, `peek()` evaluates a forming
+# bar (live tick) without changing state. Values match the batch
+# versions bar for bar.
+
+from app.services.sessions import bar_start, in_session
+
+
+class StreamingSMA:
+    """
+    Mean of the `period` closes before the current bar (ring buffer).
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._buf = [0.0] * period
+        self._idx = 0
+        self._count = 0
+        self._total = 0.0
+
+    def peek(self, close: float | None = None) -> float | None:
+        if self._count < self.period:
+            return None
+        return self._total / self.period
+
+    def update(self, close: float) -> float | None:
+        value = self.peek()
+        self._total += close - self._buf[self._idx]
+        self._buf[self._idx] = close
+        self._idx = (self._idx + 1) % self.period
+        self._count += 1
+        return value
+
+
+class StreamingEMA:
+    def __init__(self, period: int = 14):
+        self.k = 2 / (period + 1)
+        self._prev: float | None = None
+
+    def peek(self, close: float) -> float:
+        if self._prev is None:
+            return close
+        return close * self.k + self._prev * (1 - self.k)
+
+    def update(self, close: float) -> float:
+        self._prev = self.peek(close)
+        return self._prev
+
+
+class StreamingRSI:
+    """
+    Wilder RSI, seeded from the first `period` price changes.
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._last: float | None = None
+        self._changes = 0
+        self._gain_sum = 0.0
+        self._loss_sum = 0.0
+        self._avg_gain: float | None = None
+        self._avg_loss: float | None = None
+
+    def _advance(self, close: float):
+        """
+        State after `close`, as (changes, gain_sum, loss_sum, avg_gain, avg_loss).
+        """
+        changes = self._changes
+        gain_sum, loss_sum = self._gain_sum, self._loss_sum
+        avg_gain, avg_loss = self._avg_gain, self._avg_loss
+
+        if self._last is None:
+            return changes, gain_sum, loss_sum, avg_gain, avg_loss
+
+        delta = close - self._last
+        gain, loss = max(delta, 0), abs(min(delta, 0))
+        changes += 1
+        p = self.period
+
+        if avg_gain is None:
+            gain_sum += gain
+            loss_sum += loss
+            if changes < p:
+                return changes, gain_sum, loss_sum, None, None
+            avg_gain, avg_loss = gain_sum / p, loss_sum / p
+
+        avg_gain = (avg_gain * (p - 1) + gain) / p
+        avg_loss = (avg_loss * (p - 1) + loss) / p
+        return changes, gain_sum, loss_sum, avg_gain, avg_loss
+
+    @staticmethod
+    def _value(avg_gain: float | None, avg_loss: float | None) -> float | None:
+        if avg_gain is None:
+            return None
+        rs = avg_gain / avg_loss if avg_loss != 0 else 0
+        return 100 - (100 / (1 + rs))
+
+    def peek(self, close: float) -> float | None:
+        _, _, _, avg_gain, avg_loss = self._advance(close)
+        return self._value(avg_gain, avg_loss)
+
+    def update(self, close: float) -> float | None:
+        (
+            self._changes, self._gain_sum, self._loss_sum,
+            self._avg_gain, self._avg_loss,
+        ) = self._advance(close)
+        self._last = close
+        return self._value(self._avg_gain, self._avg_loss)
+
+
+class IndicatorState:
+    """
+    SMA/EMA/RSI for one instrument at one resolution, driven by live ticks.
+
+    The last seeded candle is treated as the forming bar; a tick that falls
+    into a later bar closes it and commits its close to the indicators.
+    Ticks outside the trading session are ignored.
+    """
+
+    def __init__(self, period: int = 14, resolution: str = "D"):
+        self.resolution = resolution
+        self.sma = StreamingSMA(period)
+        self.ema = StreamingEMA(period)
+        self.rsi = StreamingRSI(period)
+        self._bar_time: int | None = None
+        self._bar_close: float | None = None
+
+    def _commit(self, close: float):
+        self.sma.update(close)
+        self.ema.update(close)
+        self.rsi.update(close)
+
+    def seed(self, candles: list[dict]):
+        """
+        Seed from historical candles (oldest first).
+        """
+        if not candles:
+            return
+        for c in candles[:-1]:
+            self._commit(c["close"])
+        self._bar_time = bar_start(candles[-1]["time"], self.resolution)
+        self._bar_close = candles[-1]["close"]
+
+    def on_tick(self, price: float, ts_ms: int) -> dict:
+        # Off-hours LTP is just the last close; committing it as new
+        # bars would flatten SMA/EMA and pull RSI to neutral
+        if not in_session(ts_ms):
+            return self.values()
+
+        start = bar_start(ts_ms, self.resolution)
+
+        if self._bar_time is not None and start > self._bar_time:
+            self._commit(self._bar_close)
+
+        if self._bar_time is None or start >= self._bar_time:
+            self._bar_time = start
+            self._bar_close = price
+
+        return self.values()
+
+    def values(self) -> dict:
+        if self._bar_close is None:
+            return {"sma": None, "ema": None, "rsi": None}
+        return {
+            "sma": self.sma.peek(self._bar_close),
+            "ema": self.ema.peek(self._bar_close),
+            "rsi": self.rsi.peek(self._bar_close),
+        }
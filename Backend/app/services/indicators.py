@@ -1,46 +1,233 @@
-def sma(values, period=14):
-    result = []
-    for i in range(len(values)):
-        if i < period:
-            result.append(None)
-        else:
-            result.append(sum(values[i-period:i]) / period)
-    return result
+import numpy as np
+import pandas as pd
 
+IST_OFFSET_MS = 19800 * 1000  # UTC+05:30
+DAY_MS = 86400 * 1000
 
-def ema(values, period=14):
-    result = []
+
+# ===============================
+# ARRAY ENGINE
+# ===============================
+# All functions take 1-D float arrays (oldest first) and return float64
+# arrays of the same length, with NaN where the indicator is undefined.
+
+def _as_array(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def _rolling_mean(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Mean of the `period` values ending at each index (cumulative-sum form).
+    """
+    out = np.full(len(values), np.nan)
+    if period <= 0 or len(values) < period:
+        return out
+    csum = np.concatenate(([0.0], np.cumsum(values)))
+    out[period - 1:] = (csum[period:] - csum[:-period]) / period
+    return out
+
+
+def _wilder(seed: float, values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Wilder smoothing: avg = (avg * (period - 1) + x) / period, starting
+    from `seed`. Returns one value per element of `values`.
+    """
+    series = pd.Series(np.concatenate(([seed], values)))
+    return series.ewm(alpha=1 / period, adjust=False).mean().to_numpy()[1:]
+
+
+def sma_array(close, period: int = 14) -> np.ndarray:
+    """
+    Simple moving average of the `period` closes *before* each bar
+    (matches the historical list-based `sma`).
+    """
+    close = _as_array(close)
+    out = np.full(len(close), np.nan)
+    if len(close) > period:
+        out[period:] = _rolling_mean(close, period)[period - 1:-1]
+    return out
+
+
+def ema_array(close, period: int = 14) -> np.ndarray:
+    """
+    Exponential moving average seeded with the first close,
+    k = 2 / (period + 1). Runs as a recursive filter in pandas.
+    """
+    close = _as_array(close)
+    if not len(close):
+        return close
     k = 2 / (period + 1)
-    ema_prev = None
+    return pd.Series(close).ewm(alpha=k, adjust=False).mean().to_numpy()
 
-    for price in values:
-        if ema_prev is None:
-            ema_prev = price
-        else:
-            ema_prev = price * k + ema_prev * (1 - k)
-        result.append(ema_prev)
 
-    return result
+def rsi_array(close, period: int = 14) -> np.ndarray:
+    """
+    Wilder RSI. Defined from index `period` onwards.
+    As in the list-based version, RSI is 0 when there are no losses.
+    """
+    close = _as_array(close)
+    n = len(close)
+    out = np.full(n, np.nan)
+    if n <= period:
+        return out
+
+    delta = np.diff(close)
+    gains = np.clip(delta, 0, None)
+    losses = np.clip(-delta, 0, None)
+
+    avg_gain = _wilder(gains[:period].sum() / period, gains[period - 1:], period)
+    avg_loss = _wilder(losses[:period].sum() / period, losses[period - 1:], period)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = np.where(avg_loss != 0, avg_gain / avg_loss, 0.0)
+    out[period:] = 100 - (100 / (1 + rs))
+    return out
+
+
+def macd_array(close, fast: int = 12, slow: int = 26, signal: int = 9):
+    """
+    Returns (macd, signal, histogram).
+    """
+    close = _as_array(close)
+    macd = ema_array(close, fast) - ema_array(close, slow)
+    signal_line = ema_array(macd, signal)
+    return macd, signal_line, macd - signal_line
+
+
+def bollinger_array(close, period: int = 20, num_std: float = 2.0):
+    """
+    Returns (middle, upper, lower) using the population standard
+    deviation over the `period` closes ending at each bar.
+    Each window is reduced directly (two-pass), so the deviation stays
+    exact at high price levels where sum-of-squares forms cancel.
+    """
+    close = _as_array(close)
+    n = len(close)
+    mid = np.full(n, np.nan)
+    std = np.full(n, np.nan)
+    if period > 0 and n >= period:
+        windows = np.lib.stride_tricks.sliding_window_view(close, period)
+        mid[period - 1:] = windows.mean(axis=1)
+        std[period - 1:] = windows.std(axis=1)
+    return mid, mid + num_std * std, mid - num_std * std
 
-def rsi(values, period=14):
-    gains = []
-    losses = []
 
-    for i in range(1, len(values)):
-        delta = values[i] - values[i - 1]
-        gains.append(max(delta, 0))
-        losses.append(abs(min(delta, 0)))
+def atr_array(high, low, close, period: int = 14) -> np.ndarray:
+    """
+    Wilder Average True Range. First value at index `period - 1`.
+    """
+    high, low, close = _as_array(high), _as_array(low), _as_array(close)
+    n = len(close)
+    out = np.full(n, np.nan)
+    if n < period or period <= 0:
+        return out
 
-    avg_gain = sum(gains[:period]) / period
-    avg_loss = sum(losses[:period]) / period
+    prev_close = np.concatenate(([close[0]], close[:-1]))
+    tr = np.maximum.reduce([
+        high - low,
+        np.abs(high - prev_close),
+        np.abs(low - prev_close),
+    ])
+    tr[0] = high[0] - low[0]
 
-    rsi_values = [None] * period
+    seed = tr[:period].mean()
+    out[period - 1] = seed
+    if n > period:
+        out[period:] = _wilder(seed, tr[period:], period)
+    return out
 
-    for i in range(period, len(values)):
-        avg_gain = (avg_gain * (period - 1) + gains[i - 1]) / period
-        avg_loss = (avg_loss * (period - 1) + losses[i - 1]) / period
 
-        rs = avg_gain / avg_loss if avg_loss != 0 else 0
-        rsi_values.append(100 - (100 / (1 + rs)))
+def vwap_array(high, low, close, volume, time=None) -> np.ndarray:
+    """
+    Volume-weighted average of the typical price.
+    When `time` (epoch ms) is given, accumulation resets every IST day.
+    """
+    high, low, close = _as_array(high), _as_array(low), _as_array(close)
+    volume = _as_array(volume)
+    n = len(close)
+    if not n:
+        return close
 
-    return rsi_values
+    pv = (high + low + close) / 3 * volume
+    cum_pv = np.cumsum(pv)
+    cum_v = np.cumsum(volume)
+
+    if time is not None:
+        session = (np.asarray(time, dtype=np.int64) + IST_OFFSET_MS) // DAY_MS
+        is_start = np.concatenate(([True], session[1:] != session[:-1]))
+        starts = np.flatnonzero(is_start)
+        seg = np.cumsum(is_start) - 1
+        cum_pv = cum_pv - (cum_pv - pv)[starts][seg]
+        cum_v = cum_v - (cum_v - volume)[starts][seg]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(cum_v != 0, cum_pv / cum_v, np.nan)
+
+
+def candles_to_arrays(candles: list[dict]) -> dict[str, np.ndarray]:
+    """
+    Row-oriented candle dicts -> columnar OHLCV arrays.
+    """
+    return {
+        "time": np.fromiter((c["time"] for c in candles), np.int64, len(candles)),
+        **{
+            col: np.fromiter((c[col] for c in candles), np.float64, len(candles))
+            for col in ("open", "high", "low", "close", "volume")
+        },
+    }
+
+
+def compute_indicators(
+    ohlcv: dict[str, np.ndarray], period: int = 14, intraday: bool = True
+) -> dict[str, np.ndarray]:
+    """
+    All indicators for one OHLCV series in a single pass over the arrays.
+    VWAP resets per session for intraday bars and is cumulative otherwise.
+    """
+    close = ohlcv["close"]
+    macd, macd_signal, macd_hist = macd_array(close)
+    bb_mid, bb_upper, bb_lower = bollinger_array(close)
+
+    return {
+        "sma": sma_array(close, period),
+        "ema": ema_array(close, period),
+        "rsi": rsi_array(close, period),
+        "macd": macd,
+        "macd_signal": macd_signal,
+        "macd_hist": macd_hist,
+        "bb_middle": bb_mid,
+        "bb_upper": bb_upper,
+        "bb_lower": bb_lower,
+        "atr": atr_array(ohlcv["high"], ohlcv["low"], close, period),
+        "vwap": vwap_array(
+            ohlcv["high"], ohlcv["low"], close, ohlcv["volume"],
+            time=ohlcv.get("time") if intraday else None,
+        ),
+    }
+
+
+def to_list(values: np.ndarray) -> list:
+    """
+    NaN -> None, numpy floats -> Python floats (JSON-safe).
+    """
+    out = values.astype(object)
+    out[np.isnan(values)] = None
+    return out.tolist()
+
+
+# ===============================
+# LIST API (compatibility)
+# ===============================
+
+def sma(values, period=14):
+    return to_list(sma_array(values, period))
+
+
+def ema(values, period=14):
+    return to_list(ema_array(values, period))
+
+
+def rsi(values, period=14):
+    if len(values) <= period:
+        return [None] * period
+    return to_list(rsi_array(values, period))
@@ -0,0 +1,335 @@
+# app/services/ingestion.py
+
+# Document ingestion for the RAG store:
+#
+#   source -> chunk -> skip unchanged (content hash) -> embed in batches
+#          -> bulk upsert into document_embeddings -> vector index
+#
+# Sources: NewsAPI articles, and text / Markdown / PDF files (filings,
+# reports, uploads). PDF support needs the optional `pypdf` package.
+#
+#   python -m app.services.ingestion news [--limit 50]
+#   python -m app.services.ingestion files PATH [PATH ...]
+#
+# Each source document is split into chunks stored as "<source_id>#<n>";
+# re-ingesting a document only re-embeds chunks whose text changed and
+# removes chunks it no longer has.
+
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+from typing import AsyncIterable, Iterable
+
+from app.crud import documents as documents_crud
+from app.db.session import AsyncSessionLocal
+from app.schemas import DocumentIngestResult
+from app.services.embedding_cache import normalize_text
+from app.services.embeddings import get_embeddings_store
+from app.services.news_service import fetch_breaking_news
+from app.services.vector_index import (
+    get_loaded_index,
+    get_vector_index,
+    index_lock,
+    pack_vector,
+    save_vector_index,
+)
+
+CHUNK_CHARS = 1500
+CHUNK_OVERLAP = 200
+INGEST_BATCH_CHUNKS = 256
+
+# doc_id is VARCHAR(255); leave room for the "#<n>" chunk suffix
+MAX_SOURCE_ID = 240
+
+TEXT_EXTENSIONS = {".txt", ".md"}
+PDF_EXTENSIONS = {".pdf"}
+
+
+# ============================
+# CHUNKING
+# ============================
+def _split_long(text: str, max_chars: int, overlap: int) -> list[str]:
+    """
+    Overlapping windows of at most `max_chars`, cut at whitespace.
+    """
+    pieces = []
+    start = 0
+    while start < len(text):
+        end = min(start + max_chars, len(text))
+        if end < len(text):
+            cut = text.rfind(" ", start + max_chars // 2, end)
+            if cut > start:
+                end = cut
+        pieces.append(text[start:end].strip())
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return [p for p in pieces if p]
+
+
+def chunk_text(
+    text: str,
+    max_chars: int = CHUNK_CHARS,
+    overlap: int = CHUNK_OVERLAP,
+) -> list[str]:
+    """
+    Pack paragraphs into chunks of up to `max_chars`; paragraphs longer
+    than that are split into overlapping windows.
+    """
+    chunks = []
+    current = ""
+    for para in re.split(r"\n\s*\n", text):
+        para = " ".join(para.split())
+        if not para:
+            continue
+        for piece in _split_long(para, max_chars, overlap):
+            if current and len(current) + 2 + len(piece) > max_chars:
+                chunks.append(current)
+                current = piece
+            else:
+                current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def source_id(raw: str) -> str:
+    if len(raw) <= MAX_SOURCE_ID:
+        return raw
+    digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+    return f"{raw[:MAX_SOURCE_ID - 17]}~{digest}"
+
+
+# ============================
+# SOURCES
+# Each yields {"id": ..., "text": ..., "meta": {...}}
+# ============================
+async def news_documents(limit: int = 50):
+    for a in await fetch_breaking_news(limit):
+        text = "\n\n".join(
+            part for part in (a["title"], a.get("description"), a.get("content"))
+            if part
+        )
+        yield {
+            "id": a["url"],
+            "text": text,
+            "meta": {
+                "type": "news",
+                "title": a["title"],
+                "source": a["source"],
+                "url": a["url"],
+                "published_at": a["published_at"],
+            },
+        }
+
+
+def _pdf_text(data: bytes) -> str:
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise RuntimeError("PDF ingestion needs the 'pypdf' package")
+
+    reader = PdfReader(io.BytesIO(data))
+    return "\n\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def extract_text(filename: str, data: bytes) -> str:
+    ext = os.path.splitext(filename)[1].lower()
+    if ext in PDF_EXTENSIONS:
+        return _pdf_text(data)
+    if ext in TEXT_EXTENSIONS:
+        return data.decode("utf-8", errors="replace")
+    raise ValueError(f"Unsupported file type: {filename}")
+
+
+def document_from_bytes(doc_id: str, filename: str, data: bytes) -> dict:
+    return {
+        "id": doc_id,
+        "text": extract_text(filename, data),
+        "meta": {"type": "file", "filename": filename},
+    }
+
+
+def _iter_paths(paths: Iterable[str]):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                for name in sorted(names):
+                    ext = os.path.splitext(name)[1].lower()
+                    if ext in TEXT_EXTENSIONS | PDF_EXTENSIONS:
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def _read_file(path: str) -> dict:
+    with open(path, "rb") as f:
+        data = f.read()
+    path = os.path.abspath(path)
+    return document_from_bytes(f"file:{path}", os.path.basename(path), data)
+
+
+async def file_documents(paths: Iterable[str]):
+    for path in _iter_paths(paths):
+        yield await asyncio.to_thread(_read_file, path)
+
+
+# ============================
+# PIPELINE
+# ============================
+async def _aiter(documents):
+    if hasattr(documents, "__aiter__"):
+        async for doc in documents:
+            yield doc
+    else:
+        for doc in documents:
+            yield doc
+
+
+async def _flush(batch: list[tuple[str, list[str], dict | None]], result: DocumentIngestResult):
+    # 1. Dedupe against stored chunk hashes (one query per batch)
+    async with AsyncSessionLocal() as db:
+        stored = await documents_crud.get_chunk_hashes(db, [src for src, _, _ in batch])
+
+    by_source = defaultdict(dict)
+    for doc_id, (pk, digest) in stored.items():
+        src, _, n = doc_id.rpartition("#")
+        if n.isdigit():
+            by_source[src][doc_id] = (pk, digest, int(n))
+
+    rows: dict[str, dict] = {}
+    stale: list[int] = []
+    for src, chunks, meta in batch:
+        existing = by_source.get(src, {})
+        doc_meta = json.dumps(meta) if meta else None
+        for n, chunk in enumerate(chunks):
+            doc_id = f"{src}#{n}"
+            digest = content_hash(chunk)
+            if existing.get(doc_id, (None, None, None))[1] == digest:
+                result.unchanged += 1
+                continue
+            rows[doc_id] = {
+                "doc_id": doc_id,
+                "text": chunk,
+                "doc_meta": doc_meta,
+                "content_hash": digest,
+            }
+        stale += [pk for pk, _, n in existing.values() if n >= len(chunks)]
+
+    if not rows and not stale:
+        return
+
+    # 2. Embed changed chunks in batches (shared embedding cache)
+    rows_list = list(rows.values())
+    vectors = await get_embeddings_store().embed_many([r["text"] for r in rows_list])
+    for row, vector in zip(rows_list, vectors):
+        row["embedding"] = pack_vector(vector)
+
+    # 3. One transaction per batch
+    async with AsyncSessionLocal() as db:
+        ids = await documents_crud.upsert_documents(db, rows_list)
+        await documents_crud.delete_documents(db, stale)
+        await db.commit()
+
+    # 4. Vector index: delta segment now, compaction in ingest()
+    async with index_lock:
+        if vectors:
+            index = get_vector_index(len(vectors[0]))
+            index.add([ids[r["doc_id"]] for r in rows_list], vectors)
+        index = get_loaded_index()
+        if stale and index is not None:
+            index.remove(stale)
+
+    result.written += len(rows_list)
+    result.removed += len(stale)
+
+
+async def ingest(
+    documents: AsyncIterable[dict] | Iterable[dict],
+    batch_chunks: int = INGEST_BATCH_CHUNKS,
+) -> DocumentIngestResult:
+    """
+    Run documents through the pipeline, flushing every ~`batch_chunks`
+    chunks, then persist the vector index.
+    """
+    result = DocumentIngestResult()
+    started = time.perf_counter()
+
+    batch = []
+    pending = 0
+    async for doc in _aiter(documents):
+        chunks = chunk_text(doc.get("text") or "")
+        result.documents += 1
+        result.chunks += len(chunks)
+        batch.append((source_id(str(doc["id"])), chunks, doc.get("meta")))
+        pending += len(chunks)
+        if pending >= batch_chunks:
+            await _flush(batch, result)
+            batch, pending = [], 0
+
+    if batch:
+        await _flush(batch, result)
+
+    if result.written or result.removed:
+        async with index_lock:
+            await save_vector_index()
+
+    result.seconds = time.perf_counter() - started
+    if result.seconds > 0:
+        result.chunks_per_second = result.chunks / result.seconds
+    return result
+
+
+# ============================
+# CLI
+# ============================
+async def _main(argv: list[str]):
+    from app.db.migrations import run_migrations
+    from app.db.session import engine
+    from app.models import Base
+    from app.services.http_clients import close_clients
+
+    parser = argparse.ArgumentParser(prog="python -m app.services.ingestion")
+    sources = parser.add_subparsers(dest="source", required=True)
+    news = sources.add_parser("news", help="latest NewsAPI articles")
+    news.add_argument("--limit", type=int, default=50)
+    files = sources.add_parser("files", help=".txt/.md/.pdf files or directories")
+    files.add_argument("paths", nargs="+")
+    args = parser.parse_args(argv)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(run_migrations)
+
+    if args.source == "news":
+        documents = news_documents(args.limit)
+    else:
+        documents = file_documents(args.paths)
+
+    try:
+        result = await ingest(documents)
+    finally:
+        await close_clients()
+        await engine.dispose()
+
+    print(
+        f"Ingested {result.documents} documents / {result.chunks} chunks: "
+        f"{result.written} written, {result.unchanged} unchanged, "
+        f"{result.removed} removed in {result.seconds:.1f}s "
+        f"({result.chunks_per_second:.0f} chunks/s)"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(sys.argv[1:]))
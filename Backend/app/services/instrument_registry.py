@@ -1,74 +1,604 @@
+import asyncio
 import os
-import csv
 import gzip
-import requests
 import io
-from datetime import datetime, timedelta
+import time
+from datetime import date
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
+from app.services.http_clients import get_client
+
+INSTRUMENT_URL = "https://assets.upstox.com/market-quote/instruments/exchange/{exchange}.csv.gz"
+# Exchange masters loaded into the registry
+EXCHANGES = ("NSE", "BSE", "MCX")
+# Segment order an unqualified symbol resolves in ("BSE:RELIANCE" picks
+# the exchange explicitly); unlisted segments come last
+SEGMENT_PRIORITY = ("NSE_EQ", "NSE_INDEX", "BSE_EQ", "BSE_INDEX", "NSE_FO", "BSE_FO", "MCX_FO")
 
-INSTRUMENT_URL = "https://assets.upstox.com/market-quote/instruments/exchange/NSE.csv.gz"
 CACHE_DIR = "data"
-CACHE_FILE = os.path.join(CACHE_DIR, "nse_instruments.csv")
+# Binary snapshot of the built table (columns + indexes), loaded on startup
+SNAPSHOT_FILE = os.path.join(CACHE_DIR, "instruments.npz")
+SNAPSHOT_VERSION = 2
+# Bundled master, used only when there is no snapshot yet
+SEED_CSV_FILE = os.path.join(CACHE_DIR, "nse_instruments.csv")
 CACHE_TTL_HOURS = 24
+DOWNLOAD_TIMEOUT_SECONDS = 60
+REFRESH_RETRY_SECONDS = 300
 
-_symbol_map = {}
+# Column name variants across Upstox CSV formats
+SYMBOL_COLUMNS = ("tradingsymbol", "trading_symbol", "symbol")
 
+FUZZY_MIN_QUERY = 3
+FUZZY_CANDIDATES = 20
+FUZZY_MIN_SCORE = 0.5
 
-def _cache_valid():
-    if not os.path.exists(CACHE_FILE):
-        return False
-    mtime = datetime.fromtimestamp(os.path.getmtime(CACHE_FILE))
-    return datetime.now() - mtime < timedelta(hours=CACHE_TTL_HOURS)
+# Match ranks, best first
+MATCH_EXACT = 0
+MATCH_SYMBOL_PREFIX = 1
+MATCH_NAME_PREFIX = 2
+MATCH_FUZZY = 3
+MATCH_LABELS = ("exact", "symbol", "name", "fuzzy")
+
+
+NO_EXPIRY = -1  # expiry column: days since 1970-01-01, or NO_EXPIRY
+
+
+def _segment_rank(segment: str) -> int:
+    try:
+        return SEGMENT_PRIORITY.index(segment)
+    except ValueError:
+        return len(SEGMENT_PRIORITY)
+
+
+def _in_namespace(segment: str, namespace: str | None) -> bool:
+    """
+    "BSE" matches BSE_EQ, BSE_FO, ...; "NSE_FO" matches only itself.
+    """
+    return not namespace or segment == namespace or segment.startswith(namespace + "_")
+
+
+def split_namespace(symbol: str) -> tuple[str | None, str]:
+    """
+    "BSE:RELIANCE" -> ("BSE", "RELIANCE"); "TCS" -> (None, "TCS").
+    """
+    namespace, sep, rest = symbol.upper().partition(":")
+    return (namespace.strip(), rest.strip()) if sep else (None, symbol.upper().strip())
+
+
+def _to_days(d: date | str) -> int:
+    return int(np.datetime64(d, "D").astype(np.int64))
+
+
+def _from_days(days: int) -> str | None:
+    return None if days == NO_EXPIRY else str(np.datetime64(int(days), "D"))
+
+
+def _isin(instrument_key: str) -> str:
+    """
+    Upstox equity keys embed the ISIN: "NSE_EQ|INE002A01018".
+    """
+    code = instrument_key.partition("|")[2]
+    return code if len(code) == 12 and code[:2].isalpha() else ""
+
+
+def _trigrams(text: str) -> set[str]:
+    text = "".join(text.split())
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _sorted_index(keys: list[str], rows: list[int]) -> tuple[np.ndarray, np.ndarray]:
+    keys = np.asarray(keys, dtype=str)
+    rows = np.asarray(rows, dtype=np.int32)
+    order = np.argsort(keys, kind="stable")
+    return keys[order], rows[order]
+
+
+def _prefix_range(sorted_keys: np.ndarray, prefix: str) -> tuple[int, int]:
+    lo = np.searchsorted(sorted_keys, prefix, side="left")
+    hi = np.searchsorted(sorted_keys, prefix + "\uffff", side="left")
+    return int(lo), int(hi)
+
+
+class InstrumentTable:
+    """
+    Column-oriented instrument master.
+
+    Row i of every column describes one instrument; all exchanges share
+    one table and `exchange` holds the Upstox segment (NSE_EQ, BSE_FO,
+    MCX_FO, ...). Lookups go through sorted key arrays (binary search)
+    rather than per-row Python objects:
+
+      symbol index      exact and prefix matches on the trading symbol,
+                        ordered by SEGMENT_PRIORITY within a symbol
+      name-word index   prefix matches on any word of the name
+      trigram index     candidate generation for fuzzy matches
+      derivative index  (underlying, expiry, strike, contract) for
+                        futures and options
+
+    Derivatives stay out of the name and trigram indexes: they share
+    their underlying's name and would swamp both.
+    """
+
+    COLUMNS = (
+        "symbol", "name", "isin", "instrument_key", "exchange", "lot_size",
+        "instrument_type", "contract", "expiry", "strike",
+    )
+    INDEXES = (
+        "_sym_keys", "_sym_rows", "_sym_lens",
+        "_word_keys", "_word_rows",
+        "_tri_keys", "_tri_offsets", "_tri_rows",
+        "_drv_under", "_drv_expiry", "_drv_strike", "_drv_contract", "_drv_rows",
+    )
+
+    def __init__(self, columns: dict[str, np.ndarray], indexes: dict[str, np.ndarray] | None = None):
+        self.columns = columns
+        if indexes is not None:
+            for name in self.INDEXES:
+                setattr(self, name, indexes[name])
+        else:
+            self._build_indexes()
+
+    def _build_indexes(self):
+        columns = self.columns
+        symbols = columns["symbol"]
+        names = columns["name"]
+        derivative = columns["contract"] != ""
+
+        ranks = np.array([_segment_rank(s) for s in columns["exchange"].tolist()], dtype=np.int16)
+        order = np.lexsort((ranks, symbols)).astype(np.int32)
+        self._sym_keys, self._sym_rows = symbols[order], order
+        self._sym_lens = np.char.str_len(self._sym_keys).astype(np.int16)
+
+        listed = np.flatnonzero(~derivative).tolist()
+
+        words, word_rows = [], []
+        for i in listed:
+            for word in set(names[i].upper().split()):
+                words.append(word)
+                word_rows.append(i)
+        self._word_keys, self._word_rows = _sorted_index(words, word_rows)
+
+        # Trigram postings as CSR: rows for _tri_keys[j] are
+        # _tri_rows[_tri_offsets[j]:_tri_offsets[j + 1]]
+        grams, gram_rows = [], []
+        for i in listed:
+            for gram in _trigrams(symbols[i]) | _trigrams(names[i].upper()):
+                grams.append(gram)
+                gram_rows.append(i)
+        keys, self._tri_rows = _sorted_index(grams, gram_rows)
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.empty(0, int)
+        self._tri_keys = keys[starts]
+        self._tri_offsets = np.r_[starts, len(keys)].astype(np.int64)
+
+        # Derivatives sorted by underlying, then expiry, strike, contract:
+        # each narrowing step is a binary search inside the previous range
+        rows = np.flatnonzero(derivative).astype(np.int32)
+        under = np.char.upper(names[rows])
+        expiry = columns["expiry"][rows]
+        strike = columns["strike"][rows]
+        contract = columns["contract"][rows]
+        order = np.lexsort((contract, strike, expiry, under))
+        self._drv_under = under[order]
+        self._drv_expiry = expiry[order]
+        self._drv_strike = strike[order]
+        self._drv_contract = contract[order]
+        self._drv_rows = rows[order]
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "InstrumentTable":
+        instrument_type = df["instrument_type"].str.upper()
+        option_type = df["option_type"].str.upper()
+        contract = np.where(
+            option_type.isin(["CE", "PE"]),
+            option_type,
+            np.where(instrument_type.str.startswith("FUT"), "FUT", ""),
+        )
+        expiry = pd.to_datetime(df["expiry"], errors="coerce").to_numpy(dtype="datetime64[D]")
+        expiry_days = np.where(
+            np.isnat(expiry), NO_EXPIRY, expiry.astype(np.int64)
+        ).astype(np.int32)
+
+        return cls({
+            "symbol": df["symbol"].str.upper().to_numpy(dtype=str),
+            "name": df["name"].to_numpy(dtype=str),
+            "isin": df["instrument_key"].map(_isin).to_numpy(dtype=str),
+            "instrument_key": df["instrument_key"].to_numpy(dtype=str),
+            "exchange": df["exchange"].to_numpy(dtype=str),
+            "lot_size": df["lot_size"].to_numpy(dtype=np.int32),
+            "instrument_type": instrument_type.to_numpy(dtype=str),
+            "contract": contract.astype(str),
+            "expiry": expiry_days,
+            "strike": pd.to_numeric(df["strike"], errors="coerce").to_numpy(dtype=np.float64),
+        })
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        arrays = {f"col{name}": self.columns[name] for name in self.COLUMNS}
+        arrays.update({f"idx{name}": getattr(self, name) for name in self.INDEXES})
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays) -> "InstrumentTable":
+        return cls(
+            {name: arrays[f"col{name}"] for name in cls.COLUMNS},
+            {name: arrays[f"idx{name}"] for name in cls.INDEXES},
+        )
+
+    def __len__(self):
+        return len(self.columns["symbol"])
+
+    def row(self, i: int) -> dict:
+        out = {c: self.columns[c][i].item() for c in self.COLUMNS}
+        out["expiry"] = _from_days(out["expiry"])
+        if out["strike"] != out["strike"]:  # NaN: not an option
+            out["strike"] = None
+        return out
+
+    # ============================
+    # LOOKUPS
+    # ============================
+    def find(self, symbol: str, namespace: str | None = None) -> int | None:
+        """
+        Row of `symbol`, from the best-ranked segment or the given
+        exchange / segment namespace.
+        """
+        lo = int(np.searchsorted(self._sym_keys, symbol, side="left"))
+        hi = int(np.searchsorted(self._sym_keys, symbol, side="right"))
+        segments = self.columns["exchange"]
+        for i in self._sym_rows[lo:hi].tolist():
+            if _in_namespace(segments[i], namespace):
+                return i
+        return None
 
+    def expiries(self, underlying: str) -> list[str]:
+        lo, hi = self._underlying_range(underlying)
+        return [_from_days(d) for d in np.unique(self._drv_expiry[lo:hi]).tolist()]
 
-def _get_symbol(row: dict) -> str | None:
+    def _underlying_range(self, underlying: str) -> tuple[int, int]:
+        under = underlying.upper()
+        lo = int(np.searchsorted(self._drv_under, under, side="left"))
+        hi = int(np.searchsorted(self._drv_under, under, side="right"))
+        return lo, hi
+
+    @staticmethod
+    def _narrow(keys: np.ndarray, lo: int, hi: int, value) -> tuple[int, int]:
+        part = keys[lo:hi]
+        return (
+            lo + int(np.searchsorted(part, value, side="left")),
+            lo + int(np.searchsorted(part, value, side="right")),
+        )
+
+    def derivatives(
+        self,
+        underlying: str,
+        expiry: date | str | None = None,
+        strike: float | None = None,
+        contract: str | None = None,
+    ) -> list[int]:
+        """
+        Rows of futures/options on `underlying`, optionally narrowed to
+        an expiry, strike and contract (FUT / CE / PE). Each filter is a
+        binary search, so a single contract resolves in O(log n).
+        """
+        lo, hi = self._underlying_range(underlying)
+        if expiry is not None:
+            lo, hi = self._narrow(self._drv_expiry, lo, hi, _to_days(expiry))
+            if strike is not None:
+                lo, hi = self._narrow(self._drv_strike, lo, hi, float(strike))
+                if contract is not None:
+                    lo, hi = self._narrow(self._drv_contract, lo, hi, contract.upper())
+
+        rows = self._drv_rows[lo:hi]
+        if expiry is None and strike is not None:
+            rows = rows[self._drv_strike[lo:hi] == float(strike)]
+        if contract is not None and (expiry is None or strike is None):
+            rows = rows[self.columns["contract"][rows] == contract.upper()]
+        return rows.tolist()
+
+    def _symbol_prefix(self, prefix: str, limit: int) -> np.ndarray:
+        lo, hi = _prefix_range(self._sym_keys, prefix)
+        rows = self._sym_rows[lo:hi]
+        if len(rows) > limit:
+            # Shortest symbols are the most likely completions
+            rows = rows[np.argsort(self._sym_lens[lo:hi], kind="stable")[:limit]]
+        return rows
+
+    def _name_prefix(self, prefix: str, limit: int) -> np.ndarray:
+        lo, hi = _prefix_range(self._word_keys, prefix)
+        return np.unique(self._word_rows[lo:hi])[: limit * 4]
+
+    def _fuzzy(self, query: str) -> list[tuple[float, int]]:
+        grams = sorted(_trigrams(query))
+        if not grams or not len(self._tri_keys):
+            return []
+        grams = np.asarray(grams)
+        pos = np.minimum(np.searchsorted(self._tri_keys, grams), len(self._tri_keys) - 1)
+        pos = pos[self._tri_keys[pos] == grams]
+        if not len(pos):
+            return []
+
+        postings = np.concatenate([
+            self._tri_rows[self._tri_offsets[p]:self._tri_offsets[p + 1]] for p in pos
+        ])
+        rows, votes = np.unique(postings, return_counts=True)
+        candidates = rows[np.argsort(-votes, kind="stable")[:FUZZY_CANDIDATES]]
+
+        symbols = self.columns["symbol"]
+        names = self.columns["name"]
+        scored = []
+        for i in candidates.tolist():
+            # Compare against the name's head only: the query is a
+            # misspelt symbol or company name, not a full legal name
+            score = max(
+                SequenceMatcher(None, query, symbols[i]).ratio(),
+                SequenceMatcher(None, query, names[i][:len(query) + 2].upper()).ratio(),
+            )
+            if score >= FUZZY_MIN_SCORE:
+                scored.append((score, i))
+        scored.sort(key=lambda s: -s[0])
+        return scored
+
+    def search(self, query: str, limit: int = 10) -> list[dict]:
+        """
+        Ranked matches: exact symbol, symbol prefix, name-word prefix
+        (every query word must prefix a word of the name). Fuzzy matches
+        are only computed when none of those hit. "BSE:REL" restricts
+        matches to one exchange or segment.
+        """
+        namespace, query = split_namespace(query)
+        query = " ".join(query.split())
+        if not query:
+            return []
+
+        symbols = self.columns["symbol"]
+        segments = self.columns["exchange"]
+        ranked: dict[int, tuple] = {}
+
+        def add(i: int, rank: int, score: float = 1.0):
+            if not _in_namespace(segments[i], namespace):
+                return
+            key = (rank, -score, _segment_rank(segments[i]), len(symbols[i]), symbols[i])
+            if i not in ranked or key < ranked[i]:
+                ranked[i] = key
+
+        # Leave headroom for rows the namespace filter drops
+        fetch = limit * 4 if namespace else limit
+
+        compact = query.replace(" ", "")
+        for i in self._symbol_prefix(compact, fetch).tolist():
+            add(i, MATCH_EXACT if symbols[i] == compact else MATCH_SYMBOL_PREFIX)
+
+        words = query.split()
+        names = self.columns["name"]
+        for i in self._name_prefix(words[0], fetch).tolist():
+            name_words = names[i].upper().split()
+            if all(any(w.startswith(q) for w in name_words) for q in words[1:]):
+                add(i, MATCH_NAME_PREFIX)
+
+        if not ranked and len(compact) >= FUZZY_MIN_QUERY:
+            for score, i in self._fuzzy(compact):
+                add(i, MATCH_FUZZY, score)
+
+        best = sorted(ranked.items(), key=lambda item: item[1])[:limit]
+        return [
+            {**self.row(i), "match": MATCH_LABELS[key[0]]}
+            for i, key in best
+        ]
+
+
+# The live table is replaced wholesale on refresh (a single reference
+# assignment), so readers always see a complete table.
+_table: InstrumentTable | None = None
+_built_at: float = 0.0  # when the live table's master was downloaded
+_refresh_lock = asyncio.Lock()
+
+
+def _read_master(source) -> pd.DataFrame:
     """
-    Handles different Upstox CSV formats safely
+    Parse an Upstox instrument CSV into the registry's columns.
     """
-    return (
-        row.get("tradingsymbol")
-        or row.get("trading_symbol")
-        or row.get("symbol")
+    df = pd.read_csv(source, dtype=str, keep_default_na=False)
+    symbol_col = next(c for c in SYMBOL_COLUMNS if c in df.columns)
+    df = df.rename(columns={symbol_col: "symbol"})
+    df = df[(df["symbol"] != "") & (df["instrument_key"] != "")]
+    for col in ("instrument_type", "option_type", "expiry", "strike"):
+        if col not in df.columns:
+            df[col] = ""
+    df["lot_size"] = pd.to_numeric(df["lot_size"], errors="coerce").fillna(1)
+    return df
+
+
+# ============================
+# SNAPSHOT
+# ============================
+def save_snapshot(table: InstrumentTable, built_at: float, path: str = SNAPSHOT_FILE):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path[:-len(".npz")] + ".tmp.npz"
+    np.savez(
+        tmp,
+        version=np.int32(SNAPSHOT_VERSION),
+        built_at=np.float64(built_at),
+        **table.to_arrays(),
     )
+    os.replace(tmp, path)
+
+
+def load_snapshot(path: str = SNAPSHOT_FILE) -> bool:
+    global _table, _built_at
+
+    if not os.path.exists(path):
+        return False
+    try:
+        with np.load(path) as z:
+            if int(z["version"]) != SNAPSHOT_VERSION:
+                return False
+            table = InstrumentTable.from_arrays({k: z[k] for k in z.files})
+            built_at = float(z["built_at"])
+    except Exception as e:
+        print(f"Instrument snapshot unreadable: {e}")
+        return False
 
+    _table, _built_at = table, built_at
+    return True
 
-def load_instruments():
-    global _symbol_map
 
-    os.makedirs(CACHE_DIR, exist_ok=True)
+def ensure_loaded() -> InstrumentTable | None:
+    """
+    Load the snapshot (milliseconds), or build from the bundled CSV
+    when there is none yet. A seeded table counts as stale, so the
+    next refresh downloads a fresh master.
+    """
+    global _table
+    if _table is None and not load_snapshot() and os.path.exists(SEED_CSV_FILE):
+        _table = InstrumentTable.from_frame(_read_master(SEED_CSV_FILE))
+    return _table
+
+
+# ============================
+# BACKGROUND REFRESH
+# ============================
+def _is_fresh() -> bool:
+    return time.time() - _built_at < CACHE_TTL_HOURS * 3600
+
+
+def _build_from_download(contents: list[bytes]) -> tuple[InstrumentTable, float]:
+    frames = []
+    for content in contents:
+        with gzip.open(io.BytesIO(content), "rt", encoding="utf-8") as gz:
+            frames.append(_read_master(gz))
+    table = InstrumentTable.from_frame(pd.concat(frames, ignore_index=True))
+    built_at = time.time()
+    save_snapshot(table, built_at)
+    return table, built_at
+
 
-    # -------- Download if cache missing or stale --------
-    if not _cache_valid():
-        print("Downloading NSE instrument master...")
+async def _download(exchange: str) -> bytes:
+    res = await get_client("upstox").get(
+        INSTRUMENT_URL.format(exchange=exchange), timeout=DOWNLOAD_TIMEOUT_SECONDS
+    )
+    res.raise_for_status()
+    return res.content
 
-        r = requests.get(INSTRUMENT_URL, timeout=30)
-        r.raise_for_status()
 
-        with gzip.open(io.BytesIO(r.content), "rt", encoding="utf-8") as gz:
-            reader = csv.DictReader(gz)
-            with open(CACHE_FILE, "w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, reader.fieldnames)
-                writer.writeheader()
+async def refresh_instruments(force: bool = False):
+    """
+    Download all exchange masters concurrently and build table +
+    snapshot in a worker thread, then swap it in. Request handlers keep
+    using the old table meanwhile; if any download fails the old table
+    stays.
+    """
+    global _table, _built_at
 
-                for row in reader:
-                    if row.get("exchange") == "NSE_EQ":
-                        writer.writerow(row)
+    async with _refresh_lock:
+        if not force and _is_fresh():
+            return
 
-    # -------- Load into memory --------
-    _symbol_map.clear()
+        print(f"Downloading instrument masters: {', '.join(EXCHANGES)}...")
+        contents = await asyncio.gather(*(_download(e) for e in EXCHANGES))
 
-    with open(CACHE_FILE, encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            symbol = _get_symbol(row)
-            instrument_key = row.get("instrument_key")
+        table, built_at = await asyncio.to_thread(_build_from_download, list(contents))
+        _table, _built_at = table, built_at
 
-            if not symbol or not instrument_key:
-                continue
+    print(f"Instruments loaded: {len(table)} across {', '.join(EXCHANGES)}")
 
-            _symbol_map[symbol.upper()] = instrument_key
 
-    print(f"NSE instruments loaded: {len(_symbol_map)} symbols")
+async def refresh_loop():
+    """
+    Startup task: refresh whenever the loaded master passes its TTL.
+    """
+    while True:
+        try:
+            await refresh_instruments()
+            delay = max(60.0, CACHE_TTL_HOURS * 3600 - (time.time() - _built_at))
+        except Exception as e:
+            print(f"Instrument refresh failed: {e}")
+            delay = REFRESH_RETRY_SECONDS
+        await asyncio.sleep(delay)
 
 
+# ============================
+# LOOKUPS
+# ============================
 def resolve_symbol(symbol: str):
-    return _symbol_map.get(symbol.upper())
+    """
+    Instrument key for "TCS" (best-ranked segment) or a namespaced
+    "BSE:RELIANCE" / "NSE_FO:NIFTY24DECFUT".
+    """
+    table = ensure_loaded()
+    if table is None:
+        return None
+    namespace, symbol = split_namespace(symbol)
+    i = table.find(symbol, namespace)
+    return None if i is None else table.columns["instrument_key"][i].item()
+
+
+def canonical_symbol(symbol: str) -> str | None:
+    """
+    One stable name per instrument, used as the stored asset symbol:
+    the bare trading symbol when that alone resolves to the same
+    instrument, else "SEGMENT:SYMBOL". "reliance", "NSE:RELIANCE" and
+    "NSE_EQ:RELIANCE" all give "RELIANCE"; "BSE:RELIANCE" gives
+    "BSE_EQ:RELIANCE". None if the symbol does not resolve.
+    """
+    table = ensure_loaded()
+    if table is None:
+        return None
+    namespace, symbol = split_namespace(symbol)
+    i = table.find(symbol, namespace)
+    if i is None:
+        return None
+    symbol = table.columns["symbol"][i].item()
+    if table.find(symbol) == i:
+        return symbol
+    return f"{table.columns['exchange'][i].item()}:{symbol}"
+
+
+def option_chain(
+    underlying: str,
+    expiry: date | str | None = None,
+    exchange: str | None = None,
+) -> dict:
+    """
+    Contracts on `underlying` for one expiry (default: the nearest one
+    not yet expired), sorted by strike. `underlying` may be the
+    derivative name ("NIFTY") or an equity symbol ("RELIANCE").
+    """
+    table = ensure_loaded()
+    empty = {"underlying": underlying.upper(), "expiry": None, "expiries": [], "contracts": []}
+    if table is None:
+        return empty
+
+    expiries = table.expiries(underlying)
+    if not expiries:
+        # Equity symbol -> the company name its derivatives are listed under
+        i = table.find(split_namespace(underlying)[1])
+        if i is not None:
+            underlying = table.columns["name"][i].item()
+            expiries = table.expiries(underlying)
+    if not expiries:
+        return empty
+
+    if expiry is None:
+        today = str(date.today())
+        expiry = next((e for e in expiries if e and e >= today), expiries[-1])
+
+    segments = table.columns["exchange"]
+    rows = [
+        i for i in table.derivatives(underlying, expiry=expiry)
+        if _in_namespace(segments[i], exchange.upper() if exchange else None)
+    ]
+    return {
+        "underlying": underlying.upper(),
+        "expiry": str(expiry),
+        "expiries": [e for e in expiries if e],
+        "contracts": [table.row(i) for i in rows],
+    }
+
+
+def search_instruments(query: str, limit: int = 10) -> list[dict]:
+    table = ensure_loaded()
+    if table is None:
+        return []
+    return table.search(query, limit)
@@ -1,16 +1,20 @@
 # app/services/llm_client.py
 
 import os
-from google import genai
-from google.genai import types
+from typing import AsyncIterator
+
+from app.core.config import settings
+
 
 class LLMClient:
     """
     Gemini-based LLM client for Bullseye.
-    Uses the modern `google-genai` SDK.
+    Uses the modern `google-genai` SDK. `http_options` are passed to the
+    SDK client, e.g. {"async_client_args": {"transport": ...}} to run
+    against a stub in tests.
     """
 
-    def __init__(self):
+    def __init__(self, http_options: dict | None = None):
         api_key = os.getenv("GEMINI_API_KEY")
 
         if not api_key:
@@ -19,47 +23,106 @@ class LLMClient:
                 "Ensure it is set in backend/.env and the server is restarted."
             )
 
-        self.client = genai.Client(api_key=api_key)
+        # Imported here: the SDK is slow to import and only needed once
+        # the first chat request (or warm-up) arrives
+        from google import genai
+
+        http_options = dict(http_options or {})
+        if settings.GEMINI_BASE_URL:
+            http_options.setdefault("base_url", settings.GEMINI_BASE_URL)
+
+        self.client = genai.Client(api_key=api_key, http_options=http_options or None)
         # Note: 'gemini-2.5-flash' does not currently exist. 
         # Using 'gemini-2.0-flash' which is the latest fast model.
         # If you have early access to a specific version, change this back.
         self.model_name = "gemini-2.5-flash" 
 
-    def chat(self, system_prompt: str, user_message: str) -> str:
+    def _request(self, system_prompt: str, user_message: str) -> dict:
+        from google.genai import types
+
+        return {
+            "model": self.model_name,
+            "contents": [
+                {
+                    "role": "user",
+                    "parts": [
+                        {
+                            # Combined prompt strategy is fine, but ensure
+                            # the instruction is clear.
+                            "text": f"{system_prompt}\n\n{user_message}"
+                        }
+                    ],
+                }
+            ],
+            "config": {
+                "temperature": 0.4,
+                # FIX 1: Increased from 512 to 2048 to prevent cutoff
+                "max_output_tokens": 2048,
+                # FIX 2: Enable Google Search Grounding for live data
+                "tools": [
+                    types.Tool(
+                        google_search=types.GoogleSearchRetrieval()
+                    )
+                ]
+            },
+        }
+
+    @staticmethod
+    def _answer(response) -> str:
+        if not response or not response.text:
+            return "No response generated."
+        return response.text.strip()
+
+    async def achat(self, system_prompt: str, user_message: str) -> str:
         try:
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=[
-                    {
-                        "role": "user",
-                        "parts": [
-                            {
-                                # Combined prompt strategy is fine, but ensure
-                                # the instruction is clear.
-                                "text": f"{system_prompt}\n\n{user_message}"
-                            }
-                        ],
-                    }
-                ],
-                config={
-                    "temperature": 0.4,
-                    # FIX 1: Increased from 512 to 2048 to prevent cutoff
-                    "max_output_tokens": 2048, 
-                    # FIX 2: Enable Google Search Grounding for live data
-                    "tools": [
-                        types.Tool(
-                            google_search=types.GoogleSearchRetrieval()
-                        )
-                    ]
-                },
+            response = await self.client.aio.models.generate_content(
+                **self._request(system_prompt, user_message)
             )
+            return self._answer(response)
+
+        except Exception as e:
+            print(f"Gemini API Error: {e}")
+            return f"AI service error: {str(e)}"
 
-            if not response or not response.text:
-                return "No response generated."
+    async def aopen_stream(
+        self, system_prompt: str, user_message: str
+    ) -> AsyncIterator[str]:
+        """
+        Start a streamed generation and return its text chunks.
+        The first chunk is awaited here (the SDK only sends the request
+        once iteration starts), so a rejected request (bad key, quota)
+        raises before callers start a response.
+        """
+        stream = await self.client.aio.models.generate_content_stream(
+            **self._request(system_prompt, user_message)
+        )
+        chunks = stream.__aiter__()
+        try:
+            first = await chunks.__anext__()
+        except StopAsyncIteration:
+            first = None
+        return self._texts(first, chunks)
 
-            return response.text.strip()
+    async def _texts(self, first, chunks) -> AsyncIterator[str]:
+        try:
+            if first is None:
+                return
+            if first.text:
+                yield first.text
+            async for chunk in chunks:
+                if chunk.text:
+                    yield chunk.text
 
         except Exception as e:
-            # Print error to console for debugging
             print(f"Gemini API Error: {e}")
-            return f"AI service error: {str(e)}"
\ No newline at end of file
+            yield f"AI service error: {str(e)}"
+
+
+_client: LLMClient | None = None
+
+
+def get_llm_client() -> LLMClient:
+    global _client
+    if _client is None:
+        _client = LLMClient()
+    return _client
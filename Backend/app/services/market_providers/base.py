@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 
 class MarketProvider(ABC):
@@ -14,3 +15,13 @@ class MarketProvider(ABC):
     @abstractmethod
     async def fetch_quote(self, instrument_key: str):
         pass
+
+    async def fetch_quotes(self, instrument_keys: list[str]) -> dict[str, dict]:
+        """
+        Bulk quote lookup, keyed by instrument key.
+        Providers with a multi-instrument endpoint should override this;
+        the default falls back to concurrent single-quote calls.
+        """
+        keys = list(dict.fromkeys(instrument_keys))
+        quotes = await asyncio.gather(*(self.fetch_quote(k) for k in keys))
+        return {k: q for k, q in zip(keys, quotes) if q}
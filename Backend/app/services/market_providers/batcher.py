@@ -0,0 +1,68 @@
+# app/services/market_providers/batcher.py
+
+import asyncio
+from typing import Awaitable, Callable
+
+
+class QuoteBatcher:
+    """
+    Coalesces concurrent single-key quote requests.
+
+    Callers awaiting `get(key)` within the same window are answered by one
+    call to `fetch_many(keys)`, so N concurrent lookups (REST polls, hub
+    pollers) cost one upstream round trip. A key that is already being
+    fetched joins that call instead of starting another one.
+    """
+
+    def __init__(
+        self,
+        fetch_many: Callable[[list[str]], Awaitable[dict[str, dict]]],
+        window_seconds: float = 0.01,
+    ):
+        self.fetch_many = fetch_many
+        self.window_seconds = window_seconds
+        # One shared future per key: waiting for the next window, or in
+        # the upstream call that is running now
+        self._pending: dict[str, asyncio.Future] = {}
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._flush_task: asyncio.Task | None = None
+
+    async def get(self, key: str) -> dict:
+        fut = self._inflight.get(key) or self._pending.get(key)
+        if fut is None:
+            fut = asyncio.get_running_loop().create_future()
+            self._pending[key] = fut
+
+            if self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._flush())
+
+        # Shielded: a cancelled caller must not cancel the shared future
+        return await asyncio.shield(fut)
+
+    async def _flush(self):
+        await asyncio.sleep(self.window_seconds)
+
+        pending, self._pending = self._pending, {}
+        self._inflight.update(pending)
+        # Keys not in flight may open the next window while this call runs
+        self._flush_task = None
+
+        try:
+            quotes = await self.fetch_many(list(pending))
+        except asyncio.CancelledError:
+            for fut in pending.values():
+                fut.cancel()
+            raise
+        except Exception as e:
+            for fut in pending.values():
+                if not fut.done():
+                    fut.set_exception(e)
+                    fut.exception()  # retrieved, even if every caller left
+        else:
+            for key, fut in pending.items():
+                if not fut.done():
+                    fut.set_result(quotes.get(key, {}))
+        finally:
+            for key, fut in pending.items():
+                if self._inflight.get(key) is fut:
+                    del self._inflight[key]
@@ -1,8 +1,8 @@
 # app/services/market_providers/finnhub.py
 
 import os
-import httpx
 from datetime import datetime
+from app.services.http_clients import get_client
 from .base import MarketProvider
 
 FINNHUB_BASE_URL = "https://finnhub.io/api/v1"
@@ -42,11 +42,11 @@ class FinnhubProvider(MarketProvider):
             "token": self.api_key,
         }
 
-        async with httpx.AsyncClient(timeout=10) as client:
-            r = await client.get(
-                f"{FINNHUB_BASE_URL}/stock/candle",
-                params=params,
-            )
+        client = get_client("finnhub")
+        r = await client.get(
+            f"{FINNHUB_BASE_URL}/stock/candle",
+            params=params,
+        )
 
         if r.status_code != 200:
             return []
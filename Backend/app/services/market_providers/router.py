@@ -1,8 +1,18 @@
 from app.services.symbol_resolver import get_instrument_key
 from app.services.market_providers.upstox import UpstoxProvider
 
+# Shared so concurrent quote requests coalesce in one batcher
+_upstox_provider: UpstoxProvider | None = None
+
+
+def get_upstox_provider() -> UpstoxProvider:
+    global _upstox_provider
+    if _upstox_provider is None:
+        _upstox_provider = UpstoxProvider()
+    return _upstox_provider
+
 
 async def get_provider(symbol: str):
     instrument_key = get_instrument_key(symbol)
-    provider = UpstoxProvider()
+    provider = get_upstox_provider()
     return provider, instrument_key
@@ -1,10 +1,15 @@
 # app/services/market_providers/upstox.py
 
 import os
+import asyncio
 import httpx
 from datetime import datetime, timedelta, time
 import pytz
+from app.core.config import settings
+from app.services.http_clients import get_client
 from .base import MarketProvider
+from .batcher import QuoteBatcher
+from app.services.resample import resample_candles
 
 UPSTOX_BASE_URL = "https://api.upstox.com/v2"
 IST = pytz.timezone("Asia/Kolkata")
@@ -23,6 +28,10 @@ class UpstoxProvider(MarketProvider):
 
     def __init__(self):
         self.access_token = os.getenv("UPSTOX_ACCESS_TOKEN")
+        self._quote_batcher = QuoteBatcher(
+            self.fetch_quotes,
+            window_seconds=settings.UPSTOX_QUOTE_BATCH_WINDOW_MS / 1000,
+        )
 
     def _headers(self):
         return {
@@ -34,27 +43,55 @@ class UpstoxProvider(MarketProvider):
     # LIVE QUOTE (LTP)
     # ============================
     async def fetch_quote(self, instrument_key: str) -> dict:
+        """
+        Single LTP lookup. Concurrent calls are coalesced into one
+        bulk request via fetch_quotes().
+        """
         if not self.access_token:
             return {}
 
+        return await self._quote_batcher.get(instrument_key)
+
+    async def fetch_quotes(self, instrument_keys: list[str]) -> dict[str, dict]:
+        if not self.access_token or not instrument_keys:
+            return {}
+
+        keys = list(dict.fromkeys(instrument_keys))
+        max_keys = settings.UPSTOX_LTP_MAX_KEYS
+        chunks = [keys[i:i + max_keys] for i in range(0, len(keys), max_keys)]
+
+        quotes = {}
+        for chunk_quotes in await asyncio.gather(
+            *(self._fetch_ltp_chunk(chunk) for chunk in chunks)
+        ):
+            quotes.update(chunk_quotes)
+        return quotes
+
+    async def _fetch_ltp_chunk(self, instrument_keys: list[str]) -> dict[str, dict]:
         url = f"{UPSTOX_BASE_URL}/market-quote/ltp"
-        params = {"instrument_key": instrument_key}
+        params = {"instrument_key": ",".join(instrument_keys)}
 
-        async with httpx.AsyncClient(timeout=10) as client:
-            r = await client.get(url, headers=self._headers(), params=params)
+        client = get_client("upstox")
+        r = await client.get(url, headers=self._headers(), params=params)
 
         if r.status_code != 200:
+            print(f"Upstox LTP error ({r.status_code}): {r.text}")
             return {}
 
-        data = r.json().get("data", {})
-        q = data.get(instrument_key)
-        if not q:
-            return {}
+        timestamp = int(datetime.now(IST).timestamp())
+        quotes = {}
 
-        return {
-            "price": float(q["last_price"]),
-            "timestamp": int(datetime.now(IST).timestamp()),
-        }
+        # Response is keyed by "EXCHANGE:SYMBOL"; map back via instrument_token
+        for response_key, q in r.json().get("data", {}).items():
+            instrument_key = q.get("instrument_token") or response_key
+            if q.get("last_price") is None:
+                continue
+            quotes[instrument_key] = {
+                "price": float(q["last_price"]),
+                "timestamp": timestamp,
+            }
+
+        return quotes
 
     # ============================
     # CANDLES (HISTORICAL + INTRADAY)
@@ -63,47 +100,60 @@ class UpstoxProvider(MarketProvider):
         if not self.access_token:
             return []
 
+        # Upstox only serves 1minute / 30minute / day bars; other
+        # resolutions are aggregated from the finest base that divides them
         interval_map = {
             "1": "1minute",
-            "5": "1minute",      # Upstox only supports 1minute, not 5minute
-            "15": "30minute",
+            "5": "1minute",
+            "15": "1minute",
             "30": "30minute",
             "60": "30minute",
             "D": "day",
+            "W": "day",
         }
-
-        interval = interval_map.get(resolution, "day")
-
-        async with httpx.AsyncClient(timeout=15) as client:
-
-            # ======================
-            # DAILY CANDLES
-            # ======================
-            if interval == "day":
-                # Cap to_date at UPSTOX_MAX_DATE to avoid requesting unavailable future data
-                real_now = datetime.now(IST).date()
-                to_date = min(real_now, UPSTOX_MAX_DATE)
-                from_date = to_date - timedelta(days=limit)
-
-                from_date_str = from_date.strftime("%Y-%m-%d")
-                to_date_str = to_date.strftime("%Y-%m-%d")
-
-                url = (
-                    f"{UPSTOX_BASE_URL}/historical-candle/"
-                    f"{instrument_key}/day/"
-                    f"{to_date_str}/{from_date_str}"  # Upstox expects to_date first, then from_date
-                )
-
-            # ======================
-            # INTRADAY CANDLES
-            # ======================
-            else:
-                url = (
-                    f"{UPSTOX_BASE_URL}/historical-candle/intraday/"
-                    f"{instrument_key}/{interval}"
-                )
-
-            r = await client.get(url, headers=self._headers())
+        native = {"1", "30", "D"}
+
+        if resolution not in interval_map:
+            resolution = "D"
+        interval = interval_map[resolution]
+
+        # ======================
+        # DAILY CANDLES
+        # ======================
+        if interval == "day":
+            # Cap to_date at UPSTOX_MAX_DATE to avoid requesting unavailable future data
+            real_now = datetime.now(IST).date()
+            to_date = min(real_now, UPSTOX_MAX_DATE)
+            days = limit * 7 if resolution == "W" else limit
+            from_date = to_date - timedelta(days=days)
+
+            from_date_str = from_date.strftime("%Y-%m-%d")
+            to_date_str = to_date.strftime("%Y-%m-%d")
+
+            url = (
+                f"{UPSTOX_BASE_URL}/historical-candle/"
+                f"{instrument_key}/day/"
+                f"{to_date_str}/{from_date_str}"  # Upstox expects to_date first, then from_date
+            )
+
+        # ======================
+        # INTRADAY CANDLES
+        # ======================
+        else:
+            url = (
+                f"{UPSTOX_BASE_URL}/historical-candle/intraday/"
+                f"{instrument_key}/{interval}"
+            )
+
+        client = get_client("upstox")
+        r = await client.get(
+            url,
+            headers=self._headers(),
+            timeout=httpx.Timeout(
+                settings.HTTP_CANDLE_TIMEOUT_SECONDS,
+                connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+            ),
+        )
 
         if r.status_code != 200:
             if r.status_code == 401 and interval != "day":
@@ -119,11 +169,8 @@ class UpstoxProvider(MarketProvider):
             print(f"No candle data returned for {instrument_key} with interval {interval}")
             return []
 
-        # Take the last 'limit' candles (or all if fewer than limit)
-        candles_to_process = raw[-limit:] if len(raw) > limit else raw
-        
         candles = []
-        for i, c in enumerate(candles_to_process):
+        for i, c in enumerate(raw):
             try:
                 # Parse timestamp - Upstox returns ISO format string
                 timestamp = int(datetime.fromisoformat(c[0]).timestamp() * 1000)
@@ -142,6 +189,12 @@ class UpstoxProvider(MarketProvider):
         
         # Sort by time to ensure chronological order (oldest first)
         candles.sort(key=lambda x: x["time"])
-        
-        print(f"Returning {len(candles)} candles for {instrument_key} ({interval})")
+
+        if resolution not in native:
+            candles = resample_candles(candles, resolution)
+
+        # Keep the most recent 'limit' candles
+        candles = candles[-limit:]
+
+        print(f"Returning {len(candles)} candles for {instrument_key} ({resolution} from {interval})")
         return candles
@@ -1,6 +1,6 @@
-import httpx
 from datetime import datetime
 from app.core.config import settings
+from app.services.http_clients import get_client
 
 NEWS_API_URL = "https://newsapi.org/v2/everything"
 
@@ -18,10 +18,10 @@ async def fetch_breaking_news(limit: int = 10):
         "apiKey": settings.NEWS_API_KEY,
     }
 
-    async with httpx.AsyncClient(timeout=10) as client:
-        res = await client.get(NEWS_API_URL, params=params)
-        res.raise_for_status()
-        data = res.json()
+    client = get_client("news")
+    res = await client.get(NEWS_API_URL, params=params)
+    res.raise_for_status()
+    data = res.json()
 
     articles = []
     for a in data.get("articles", []):
@@ -30,6 +30,8 @@ async def fetch_breaking_news(limit: int = 10):
             "source": a["source"]["name"],
             "url": a["url"],
             "published_at": a["publishedAt"],
+            "description": a.get("description"),
+            "content": a.get("content"),
         })
 
     return articles
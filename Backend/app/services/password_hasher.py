@@ -0,0 +1,103 @@
+# app/services/password_hasher.py
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import settings
+from app.crud.users import hash_password, verify_password
+
+
+class HasherBusy(Exception):
+    """
+    Raised when more than `max_queued` calls are already waiting.
+    """
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hash/verify in a small thread pool instead of on the
+    event loop (bcrypt releases the GIL while it works).
+
+    At most `workers` calls run at once; further calls wait on a
+    semaphore, and beyond `max_queued` waiters they are rejected so a
+    login storm cannot pile up unbounded work.
+    """
+
+    def __init__(self, workers: int = 2, max_queued: int = 256):
+        self.workers = workers
+        self.max_queued = max_queued
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="bcrypt"
+        )
+        self._slots: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+        self.waiting = 0
+        self.running = 0
+        self.max_waiting = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self.run_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.workers)
+
+    async def _run(self, fn, *args):
+        self._ensure_started()
+        if self.waiting >= self.max_queued:
+            self.rejected += 1
+            raise HasherBusy("Too many concurrent password checks")
+
+        queued = time.perf_counter()
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        started = time.perf_counter()
+        wait = started - queued
+        self.wait_seconds += wait
+        self.max_wait_seconds = max(self.max_wait_seconds, wait)
+        self.running += 1
+        try:
+            return await self._loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self.run_seconds += time.perf_counter() - started
+            self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain: str, hashed: str) -> bool:
+        return await self._run(verify_password, plain, hashed)
+
+    def stats(self) -> dict:
+        done = self.completed or 1
+        return {
+            "workers": self.workers,
+            "running": self.running,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": self.wait_seconds / done * 1000,
+            "max_wait_ms": self.max_wait_seconds * 1000,
+            "avg_run_ms": self.run_seconds / done * 1000,
+        }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queued=settings.PASSWORD_HASH_MAX_QUEUE,
+)
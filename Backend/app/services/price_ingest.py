@@ -0,0 +1,207 @@
+# app/services/price_ingest.py
+
+import csv
+import json
+from collections import deque
+from typing import AsyncIterator
+
+from fastapi import Request
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import assets as assets_crud, prices as prices_crud
+from app.schemas import PriceIn, PriceIngestReject, PriceIngestResult
+
+INGEST_CHUNK_SIZE = 5000
+# A quoted CSV field may span lines; a record still open after this many
+# lines is rejected rather than buffered indefinitely
+CSV_MAX_RECORD_LINES = 1000
+
+
+class MalformedBody(ValueError):
+    """
+    The request body as a whole could not be decoded.
+    """
+
+
+async def _iter_lines(request: Request) -> AsyncIterator[str]:
+    buf = b""
+    async for chunk in request.stream():
+        buf += chunk
+        *lines, buf = buf.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8", errors="replace").rstrip("\r")
+    if buf:
+        yield buf.decode("utf-8", errors="replace").rstrip("\r")
+
+
+async def iter_records(request: Request) -> AsyncIterator[tuple[int, object]]:
+    """
+    Yields (row number, raw record) from a JSON array, NDJSON or CSV body.
+    NDJSON and CSV are parsed as the body streams in. A record that cannot
+    be decoded is yielded as the exception instead.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+
+    if content_type in ("application/x-ndjson", "application/ndjson"):
+        row = 0
+        async for line in _iter_lines(request):
+            if not line.strip():
+                continue
+            try:
+                yield row, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield row, e
+            row += 1
+
+    elif content_type == "text/csv":
+        async for item in _iter_csv(_iter_lines(request)):
+            yield item
+
+    else:
+        try:
+            body = await request.json()
+        except ValueError as e:
+            raise MalformedBody(f"Malformed JSON body: {e}")
+        if not isinstance(body, list):
+            body = [body]
+        for row, record in enumerate(body):
+            yield row, record
+
+
+class _LineFeed:
+    """
+    Iterator over queued lines for one long-lived csv.reader. Lines are
+    only queued once they complete a record, so the reader never runs dry
+    in the middle of one.
+    """
+
+    def __init__(self):
+        self.lines: deque[str] = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+
+async def _iter_csv(lines: AsyncIterator[str]) -> AsyncIterator[tuple[int, object]]:
+    """
+    CSV records from a line stream, header first. A quoted field may
+    contain newlines: physical lines are collected until the quotes
+    balance, then the record goes through a single csv.reader.
+    """
+    feed = _LineFeed()
+    reader = csv.reader(feed)
+    header = None
+    record: list[str] = []
+    quotes = 0
+    row = 0
+
+    async for line in lines:
+        if not record and not line.strip():
+            continue
+        record.append(line + "\n")
+        quotes += line.count('"')
+        if quotes % 2:
+            if len(record) < CSV_MAX_RECORD_LINES:
+                continue
+            yield row, ValueError("unterminated quoted field")
+            record, quotes = [], 0
+            row += 1
+            continue
+
+        feed.lines.extend(record)
+        record, quotes = [], 0
+        try:
+            values = next(reader)
+        except csv.Error as e:
+            if header is None:
+                raise MalformedBody(f"Malformed CSV header: {e}")
+            feed.lines.clear()
+            yield row, e
+            row += 1
+            continue
+
+        if header is None:
+            header = [h.strip() for h in values]
+            continue
+        if len(values) != len(header):
+            yield row, ValueError(
+                f"expected {len(header)} columns, got {len(values)}"
+            )
+        else:
+            yield row, dict(zip(header, values))
+        row += 1
+
+    if record:
+        yield row, ValueError("unterminated quoted field")
+
+
+async def _write_chunk(db: AsyncSession, chunk: list[tuple[int, PriceIn]]) -> int:
+    asset_ids = await assets_crud.get_or_create_asset_ids(
+        db, [p.asset_symbol for _, p in chunk]
+    )
+    return await prices_crud.upsert_prices(db, [
+        {
+            "asset_id": asset_ids[p.asset_symbol],
+            "resolution": p.resolution,
+            "timestamp": p.timestamp,
+            "open": p.open,
+            "high": p.high,
+            "low": p.low,
+            "close": p.close,
+            "volume": p.volume,
+        }
+        for _, p in chunk
+    ])
+
+
+async def ingest(
+    db: AsyncSession, records: AsyncIterator[tuple[int, object]]
+) -> PriceIngestResult:
+    """
+    Validates records and upserts them in chunks: one asset lookup and
+    one transaction per chunk. Invalid rows are reported, not fatal.
+    A bar repeated within a chunk is reported as a duplicate and the last
+    one is kept; across chunks the upsert simply overwrites it, so memory
+    stays bounded by the chunk size however long the body is.
+    """
+    rejected = []
+    duplicates = []
+    accepted = 0
+    # bar key -> (row, price) of its latest occurrence in this chunk
+    chunk: dict[tuple, tuple[int, PriceIn]] = {}
+
+    async for row, record in records:
+        if isinstance(record, Exception):
+            rejected.append(PriceIngestReject(row=row, error=str(record)))
+            continue
+        try:
+            price = PriceIn.model_validate(record)
+        except ValidationError as e:
+            errors = "; ".join(
+                f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()
+            )
+            rejected.append(PriceIngestReject(row=row, error=errors))
+            continue
+
+        key = (price.asset_symbol, price.resolution, price.timestamp)
+        previous = chunk.pop(key, None)
+        if previous is not None:
+            duplicates.append(previous[0])
+        chunk[key] = (row, price)
+
+        if len(chunk) >= INGEST_CHUNK_SIZE:
+            accepted += await _write_chunk(db, list(chunk.values()))
+            chunk = {}
+
+    if chunk:
+        accepted += await _write_chunk(db, list(chunk.values()))
+
+    return PriceIngestResult(
+        accepted=accepted, rejected=rejected, duplicates=sorted(duplicates)
+    )
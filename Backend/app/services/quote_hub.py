@@ -0,0 +1,159 @@
+# app/services/quote_hub.py
+
+import asyncio
+from dataclasses import dataclass, field
+
+from app.services.bar_aggregator import bar_aggregator
+from app.services.market_providers.base import MarketProvider
+
+POLL_INTERVAL_SECONDS = 1.0
+SUBSCRIBER_QUEUE_SIZE = 4
+
+
+@dataclass
+class _Topic:
+    """
+    One upstream poller per instrument key, shared by every subscriber.
+    """
+    instrument_key: str
+    provider: MarketProvider
+    symbol: str | None = None
+    subscribers: set = field(default_factory=set)
+    last_quote: dict | None = None
+    task: asyncio.Task | None = None
+
+
+class Subscription:
+    """
+    A single client's view of a topic.
+    Ticks are delivered through a bounded queue; when the client falls
+    behind, the oldest (stale) tick is dropped to make room for the newest.
+    """
+
+    def __init__(self, hub: "QuoteHub", instrument_key: str, maxsize: int):
+        self.hub = hub
+        self.instrument_key = instrument_key
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def _offer(self, quote: dict):
+        while self.queue.full():
+            try:
+                self.queue.get_nowait()
+                self.dropped += 1
+            except asyncio.QueueEmpty:
+                break
+        self.queue.put_nowait(quote)
+
+    async def get(self) -> dict:
+        return await self.queue.get()
+
+    async def close(self):
+        await self.hub.unsubscribe(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+
+class QuoteHub:
+    """
+    Process-wide quote fan-out.
+
+    Instead of every WebSocket polling the provider on its own, clients
+    subscribe to an instrument key. The first subscriber starts a poller,
+    every new tick is broadcast to all subscribers (and folded into live
+    bars), and the poller is cancelled when the last subscriber leaves.
+    """
+
+    def __init__(
+        self,
+        poll_interval: float = POLL_INTERVAL_SECONDS,
+        queue_size: int = SUBSCRIBER_QUEUE_SIZE,
+    ):
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self._topics: dict[str, _Topic] = {}
+        self._lock = asyncio.Lock()
+
+    async def subscribe(
+        self,
+        provider: MarketProvider,
+        instrument_key: str,
+        symbol: str | None = None,
+    ) -> Subscription:
+        sub = Subscription(self, instrument_key, self.queue_size)
+
+        async with self._lock:
+            topic = self._topics.get(instrument_key)
+            if topic is None:
+                topic = _Topic(
+                    instrument_key=instrument_key, provider=provider, symbol=symbol
+                )
+                self._topics[instrument_key] = topic
+                topic.task = asyncio.create_task(self._poll(topic))
+
+            topic.subscribers.add(sub)
+
+            # Late joiners get the latest known tick immediately
+            if topic.last_quote:
+                sub._offer(topic.last_quote)
+
+        return sub
+
+    async def unsubscribe(self, sub: Subscription):
+        async with self._lock:
+            topic = self._topics.get(sub.instrument_key)
+            if topic is None:
+                return
+
+            topic.subscribers.discard(sub)
+            if topic.subscribers:
+                return
+
+            del self._topics[sub.instrument_key]
+            task = topic.task
+
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _poll(self, topic: _Topic):
+        while True:
+            try:
+                quote = await topic.provider.fetch_quote(topic.instrument_key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Quote poll error for {topic.instrument_key}: {e}")
+                quote = None
+
+            if quote:
+                topic.last_quote = quote
+                bar_aggregator.on_tick(
+                    topic.instrument_key,
+                    quote["price"],
+                    int(quote["timestamp"]) * 1000,
+                    symbol=topic.symbol,
+                )
+                for sub in list(topic.subscribers):
+                    sub._offer(quote)
+
+            await asyncio.sleep(self.poll_interval)
+
+    def stats(self) -> dict:
+        return {
+            "topics": len(self._topics),
+            "subscribers": sum(len(t.subscribers) for t in self._topics.values()),
+            "dropped": sum(
+                s.dropped for t in self._topics.values() for s in t.subscribers
+            ),
+        }
+
+
+quote_hub = QuoteHub()
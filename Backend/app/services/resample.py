@@ -0,0 +1,47 @@
+# app/services/resample.py
+
+import numpy as np
+
+from app.services.indicators import candles_to_arrays
+from app.services.sessions import bar_start
+
+
+def resample_arrays(ohlcv: dict[str, np.ndarray], resolution: str) -> dict[str, np.ndarray]:
+    """
+    Aggregate base bars (oldest first) into `resolution` bars.
+    Buckets follow NSE session alignment (see app.services.sessions);
+    each output bar is stamped with its bucket start.
+    """
+    times = ohlcv["time"]
+    if not len(times):
+        return {k: v[:0] for k, v in ohlcv.items()}
+
+    buckets = bar_start(times, resolution)
+    starts = np.flatnonzero(
+        np.concatenate(([True], buckets[1:] != buckets[:-1]))
+    )
+    ends = np.concatenate((starts[1:], [len(times)])) - 1
+
+    return {
+        "time": buckets[starts],
+        "open": ohlcv["open"][starts],
+        "high": np.maximum.reduceat(ohlcv["high"], starts),
+        "low": np.minimum.reduceat(ohlcv["low"], starts),
+        "close": ohlcv["close"][ends],
+        "volume": np.add.reduceat(ohlcv["volume"], starts),
+    }
+
+
+def resample_candles(candles: list[dict], resolution: str) -> list[dict]:
+    """
+    List-of-dict wrapper around resample_arrays.
+    """
+    if not candles:
+        return []
+
+    out = resample_arrays(candles_to_arrays(candles), resolution)
+    cols = {k: v.tolist() for k, v in out.items()}
+    return [
+        {k: cols[k][i] for k in ("time", "open", "high", "low", "close", "volume")}
+        for i in range(len(cols["time"]))
+    ]
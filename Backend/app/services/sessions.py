@@ -0,0 +1,109 @@
+# app/services/sessions.py
+
+# NSE session helpers working on epoch milliseconds.
+# Intraday bars are aligned to the 09:15 IST session open, daily bars
+# to IST midnight and weekly bars to Monday IST midnight.
+
+IST_OFFSET_MS = 19800 * 1000  # UTC+05:30
+MINUTE_MS = 60 * 1000
+DAY_MS = 86400 * 1000
+WEEK_MS = 7 * DAY_MS
+SESSION_OPEN_MS = (9 * 60 + 15) * MINUTE_MS  # 09:15 IST
+SESSION_CLOSE_MS = (15 * 60 + 30) * MINUTE_MS  # 15:30 IST
+
+# 1970-01-01 was a Thursday; shift so weeks start on Monday
+_MONDAY_SHIFT_MS = 3 * DAY_MS
+
+RESOLUTION_MINUTES = {
+    "1": 1,
+    "5": 5,
+    "15": 15,
+    "30": 30,
+    "60": 60,
+}
+
+
+def day_start(ts_ms: int) -> int:
+    """
+    Epoch ms of IST midnight for the day containing ts_ms.
+    """
+    return (ts_ms + IST_OFFSET_MS) // DAY_MS * DAY_MS - IST_OFFSET_MS
+
+
+def bar_start(ts_ms: int, resolution: str) -> int:
+    """
+    Epoch ms at which the bar containing ts_ms opens.
+    Pure integer arithmetic, so it also works element-wise on
+    NumPy int64 arrays.
+    """
+    if resolution == "D":
+        return day_start(ts_ms)
+
+    if resolution == "W":
+        local = ts_ms + IST_OFFSET_MS + _MONDAY_SHIFT_MS
+        return local // WEEK_MS * WEEK_MS - _MONDAY_SHIFT_MS - IST_OFFSET_MS
+
+    interval = RESOLUTION_MINUTES[resolution] * MINUTE_MS
+    session_open = day_start(ts_ms) + SESSION_OPEN_MS
+    return session_open + (ts_ms - session_open) // interval * interval
+
+
+def weekday(ts_ms: int) -> int:
+    """
+    IST weekday, Monday = 0.
+    """
+    return ((ts_ms + IST_OFFSET_MS) // DAY_MS + 3) % 7
+
+
+def in_session(ts_ms: int) -> bool:
+    """
+    True if ts_ms falls inside the 09:15-15:30 IST weekday session.
+    Exchange holidays are not modelled.
+    """
+    if weekday(ts_ms) >= 5:
+        return False
+    offset = ts_ms - day_start(ts_ms)
+    return SESSION_OPEN_MS <= offset <= SESSION_CLOSE_MS
+
+
+def is_valid_resolution(resolution: str) -> bool:
+    return resolution in RESOLUTION_MINUTES or resolution in ("D", "W")
+
+
+def next_session_open(ts_ms: int) -> int:
+    """
+    Epoch ms of the next 09:15 IST open on a weekday after ts_ms.
+    Exchange holidays are not modelled.
+    """
+    open_ms = day_start(ts_ms) + SESSION_OPEN_MS
+    if open_ms <= ts_ms:
+        open_ms += DAY_MS
+    while weekday(open_ms) >= 5:
+        open_ms += DAY_MS
+    return open_ms
+
+
+def bar_ms(resolution: str) -> int:
+    """
+    Nominal bar length in ms.
+    """
+    if resolution == "D":
+        return DAY_MS
+    if resolution == "W":
+        return WEEK_MS
+    return RESOLUTION_MINUTES.get(resolution, 1) * MINUTE_MS
+
+
+def missing_bars(times: list[int], resolution: str, now_ms: int) -> int:
+    """
+    Upper bound on bars between the last known bar (inclusive, it may
+    still be forming) and now. `times` are the latest bar times, oldest
+    first. The observed spacing is used if the stored bars are finer
+    than the nominal resolution.
+    """
+    if not times:
+        return 0
+    step = bar_ms(resolution)
+    if len(times) >= 2 and times[-1] > times[-2]:
+        step = min(step, times[-1] - times[-2])
+    return max(1, (now_ms - times[-1]) // step + 1)
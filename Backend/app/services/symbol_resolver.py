@@ -1,12 +1,20 @@
 # app/services/symbol_resolver.py
 
-from app.services.instrument_registry import resolve_symbol
+from app.services.instrument_registry import canonical_symbol, resolve_symbol
 
 
 def get_instrument_key(symbol: str) -> str:
     key = resolve_symbol(symbol)
     if not key:
-        raise ValueError(f"Unsupported NSE symbol: {symbol}")
+        raise ValueError(f"Unsupported symbol: {symbol}")
     return key
 
 
+def get_canonical_symbol(symbol: str) -> str:
+    """
+    Asset symbol to store bars under, so every spelling of one
+    instrument shares a row. Unresolvable symbols are kept as given.
+    """
+    return canonical_symbol(symbol) or symbol.strip().upper()
+
+
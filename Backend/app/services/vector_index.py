@@ -0,0 +1,574 @@
+# app/services/vector_index.py
+
+import asyncio
+import json
+import os
+
+import numpy as np
+
+from app.core.config import settings
+
+# Files inside the index directory. Array files carry the generation
+# from meta.json ("vectors.<gen>.npy"), so a save never rewrites files
+# another process may have memory-mapped; generation 0 is the legacy
+# unversioned layout.
+VECTORS_FILE = "vectors.npy"         # float32 (n, dim), L2-normalized
+IDS_FILE = "ids.npy"                 # int64 (n,), DocumentEmbedding.id per row
+CENTROIDS_FILE = "ivf_centroids.npy" # float32 (nlist, dim)
+OFFSETS_FILE = "ivf_offsets.npy"     # int64 (nlist + 1,), row range per list
+META_FILE = "meta.json"
+ARRAY_FILES = (VECTORS_FILE, IDS_FILE, CENTROIDS_FILE, OFFSETS_FILE)
+
+KMEANS_ITERATIONS = 10
+KMEANS_MAX_SAMPLE = 100_000
+ASSIGN_BATCH = 65536
+
+
+def _versioned(name: str, generation: int) -> str:
+    if not generation:
+        return name
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{generation}{ext}"
+
+
+def _meta_stamp(path: str) -> tuple | None:
+    """
+    Identity of the current meta.json. Every save replaces the file, so
+    the inode or size changes even where mtime resolution is coarse.
+    """
+    try:
+        st = os.stat(os.path.join(path, META_FILE))
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+
+def _disk_generation(path: str) -> int:
+    try:
+        with open(os.path.join(path, META_FILE), encoding="utf-8") as f:
+            return json.load(f).get("generation", 0)
+    except FileNotFoundError:
+        return 0
+
+
+def pack_vector(vector) -> bytes:
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def unpack_vector(blob, dim: int | None = None) -> np.ndarray:
+    """
+    Packed float32 bytes -> array. Also accepts legacy JSON-encoded
+    vectors (str, or bytes holding a UTF-8 JSON list). Raises ValueError
+    for blobs that are neither, or whose length is not `dim`.
+
+    A float32 blob may itself start with b"[" (0x5B is a valid low
+    mantissa byte), so bytes are only read as JSON if they also end
+    with b"]" and actually parse.
+    """
+    vector = None
+    if isinstance(blob, str):
+        vector = np.asarray(json.loads(blob), dtype=np.float32)
+    else:
+        blob = bytes(blob)
+        if blob[:1] == b"[" and blob[-1:] == b"]":
+            try:
+                vector = np.asarray(json.loads(blob.decode("utf-8")), dtype=np.float32)
+            except ValueError:
+                vector = None
+        if vector is None:
+            if len(blob) % 4:
+                raise ValueError(f"Vector blob of {len(blob)} bytes is not float32")
+            vector = np.frombuffer(blob, dtype=np.float32)
+
+    if vector.ndim != 1 or (dim is not None and len(vector) != dim):
+        raise ValueError(f"Vector has shape {vector.shape}, expected ({dim},)")
+    return vector
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1
+    return vectors / norms
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k best scores, best first.
+    """
+    if k >= len(scores):
+        return np.argsort(-scores)
+    idx = np.argpartition(-scores, k)[:k]
+    return idx[np.argsort(-scores[idx])]
+
+
+class VectorIndex:
+    """
+    In-process cosine similarity index.
+
+    The base segment is a contiguous float32 matrix, memory-mapped from
+    disk. New vectors go to an in-memory delta segment and deletions are
+    tombstones, so neither needs a rebuild; `save()` compacts both into a
+    new base. With `nlist > 0` the base is organized as an IVF index
+    (rows grouped by nearest k-means centroid) and only the `nprobe`
+    closest lists are scanned per query.
+
+    Every save bumps the on-disk generation. Tombstones since the last
+    save are remembered so unsaved changes can be replayed onto a newer
+    generation written by another process (see `replay`).
+    """
+
+    def __init__(self, dim: int, path: str | None = None, nprobe: int = 8):
+        self.dim = dim
+        self.path = path
+        self.nprobe = nprobe
+        self.generation = 0
+        self._stamp: tuple | None = None
+
+        self._base = np.empty((0, dim), dtype=np.float32)
+        self._base_ids = np.empty(0, dtype=np.int64)
+        self._alive = np.empty(0, dtype=bool)
+        self._sorted_ids = np.empty(0, dtype=np.int64)
+        self._sorted_rows = np.empty(0, dtype=np.int64)
+
+        self._centroids: np.ndarray | None = None
+        self._offsets: np.ndarray | None = None
+
+        self._delta: list[np.ndarray] = []
+        self._delta_ids: list[np.ndarray] = []
+        self._removed: list[np.ndarray] = []
+
+    # ============================
+    # LOAD / SAVE
+    # ============================
+    @classmethod
+    def load(cls, path: str, nprobe: int = 8) -> "VectorIndex | None":
+        meta_path = os.path.join(path, META_FILE)
+        stamp = _meta_stamp(path)
+        if stamp is None:
+            return None
+
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+
+        index = cls(meta["dim"], path=path, nprobe=nprobe)
+        index.generation = meta.get("generation", 0)
+        index._stamp = stamp
+
+        def file(name):
+            return os.path.join(path, _versioned(name, index.generation))
+
+        index._set_base(
+            np.load(file(VECTORS_FILE), mmap_mode="r"),
+            np.load(file(IDS_FILE)),
+        )
+        if meta.get("nlist"):
+            index._centroids = np.load(file(CENTROIDS_FILE))
+            index._offsets = np.load(file(OFFSETS_FILE))
+        return index
+
+    def save(self, nlist: int | None = None):
+        """
+        Compact delta + tombstones into a new base segment and write it
+        as the next generation; meta.json is replaced last, so readers
+        see either the old or the new generation. `nlist` retrains the
+        IVF lists (0 = flat index); by default the current centroids
+        are reused.
+        """
+        self._install(self._compact(nlist))
+
+    async def asave(self, nlist: int | None = None):
+        """
+        save() with the compaction and file writes in a worker thread.
+        The result is installed on the calling loop, so searches running
+        meanwhile see the old segments until one swap. The index must not
+        be mutated until it returns (hold `index_lock`).
+        """
+        self._install(await asyncio.to_thread(self._compact, nlist))
+
+    def _compact(self, nlist: int | None) -> dict:
+        """
+        Build (and write) the compacted base without touching `self`;
+        returns the attributes `_install` swaps in.
+        """
+        vectors, ids = self._live_rows()
+
+        centroids = offsets = None
+        if nlist is None:
+            centroids = self._centroids
+            nlist = len(centroids) if centroids is not None else 0
+        else:
+            nlist = min(nlist, len(ids))
+            if nlist > 0:
+                centroids = self._kmeans(vectors, nlist)
+
+        if nlist > 0:
+            assign = self._assign(vectors, centroids)
+            order = np.argsort(assign, kind="stable")
+            vectors, ids = vectors[order], ids[order]
+            offsets = np.searchsorted(assign[order], np.arange(nlist + 1))
+
+        state = {"_centroids": centroids, "_offsets": offsets}
+        if self.path:
+            os.makedirs(self.path, exist_ok=True)
+            generation = max(self.generation, _disk_generation(self.path)) + 1
+            self._write(VECTORS_FILE, generation, vectors)
+            self._write(IDS_FILE, generation, ids)
+            if centroids is not None:
+                self._write(CENTROIDS_FILE, generation, centroids)
+                self._write(OFFSETS_FILE, generation, offsets)
+            meta_tmp = os.path.join(self.path, META_FILE + ".tmp")
+            with open(meta_tmp, "w", encoding="utf-8") as f:
+                json.dump({
+                    "dim": self.dim,
+                    "nlist": nlist,
+                    "count": len(ids),
+                    "generation": generation,
+                }, f)
+            os.replace(meta_tmp, os.path.join(self.path, META_FILE))
+            state["generation"] = generation
+            state["_stamp"] = _meta_stamp(self.path)
+            vectors = np.load(
+                os.path.join(self.path, _versioned(VECTORS_FILE, generation)),
+                mmap_mode="r",
+            )
+
+        state.update(self._base_state(vectors, ids))
+        return state
+
+    def _install(self, state: dict):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._delta, self._delta_ids, self._removed = [], [], []
+        if self.path:
+            self._prune_generations()
+
+    def _write(self, name: str, generation: int, array: np.ndarray):
+        path = os.path.join(self.path, _versioned(name, generation))
+        tmp = path + ".tmp.npy"
+        np.save(tmp, array)
+        os.replace(tmp, path)
+
+    def _prune_generations(self):
+        """
+        Delete array files older than the previous generation (a reader
+        may have just read the previous meta.json and not opened its
+        files yet). Mapped files stay readable until unmapped.
+        """
+        keep = {
+            _versioned(name, generation)
+            for name in ARRAY_FILES
+            for generation in (self.generation, self.generation - 1)
+        }
+        stems = tuple(os.path.splitext(name)[0] + "." for name in ARRAY_FILES)
+        for name in os.listdir(self.path):
+            if (
+                name.endswith(".npy")
+                and ".tmp" not in name
+                and name.startswith(stems)
+                and name not in keep
+            ):
+                try:
+                    os.remove(os.path.join(self.path, name))
+                except OSError:
+                    pass
+
+    def _set_base(self, vectors: np.ndarray, ids: np.ndarray):
+        for name, value in self._base_state(vectors, ids).items():
+            setattr(self, name, value)
+
+    @staticmethod
+    def _base_state(vectors: np.ndarray, ids: np.ndarray) -> dict:
+        ids = np.asarray(ids, dtype=np.int64)
+        sorted_rows = np.argsort(ids, kind="stable")
+        return {
+            "_base": vectors,
+            "_base_ids": ids,
+            "_alive": np.ones(len(ids), dtype=bool),
+            "_sorted_rows": sorted_rows,
+            "_sorted_ids": ids[sorted_rows],
+        }
+
+    def _live_rows(self) -> tuple[np.ndarray, np.ndarray]:
+        parts = [np.asarray(self._base[self._alive])] + self._delta
+        id_parts = [self._base_ids[self._alive]] + self._delta_ids
+        return (
+            np.concatenate(parts) if parts else np.empty((0, self.dim), np.float32),
+            np.concatenate(id_parts),
+        )
+
+    # ============================
+    # IVF
+    # ============================
+    @staticmethod
+    def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        out = np.empty(len(vectors), dtype=np.int64)
+        for i in range(0, len(vectors), ASSIGN_BATCH):
+            out[i:i + ASSIGN_BATCH] = np.argmax(
+                vectors[i:i + ASSIGN_BATCH] @ centroids.T, axis=1
+            )
+        return out
+
+    def _kmeans(self, vectors: np.ndarray, nlist: int) -> np.ndarray:
+        """
+        Spherical k-means on a sample (up to 64 points per list).
+        """
+        rng = np.random.default_rng(0)
+        sample_size = min(len(vectors), nlist * 64, KMEANS_MAX_SAMPLE)
+        sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+
+        for _ in range(KMEANS_ITERATIONS):
+            assign = self._assign(sample, centroids)
+            order = np.argsort(assign, kind="stable")
+            sorted_assign = assign[order]
+            starts = np.flatnonzero(
+                np.concatenate(([True], sorted_assign[1:] != sorted_assign[:-1]))
+            )
+
+            sums = np.zeros_like(centroids)
+            sums[sorted_assign[starts]] = np.add.reduceat(sample[order], starts)
+
+            empty = np.bincount(assign, minlength=nlist) == 0
+            sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+            centroids = _normalize(sums)
+
+        return centroids
+
+    # ============================
+    # MUTATION
+    # ============================
+    def add(self, ids, vectors):
+        """
+        Add (or replace) vectors without rebuilding the base segment.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        vectors = _normalize(np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim))
+        self.remove(ids)
+        self._append(ids, vectors)
+
+    def _append(self, ids: np.ndarray, vectors: np.ndarray):
+        """
+        Add rows whose ids are known not to be in the index (no
+        replace check, so bulk loads stay linear).
+        """
+        self._delta.append(vectors)
+        self._delta_ids.append(ids)
+
+    def remove(self, ids):
+        ids = np.asarray(ids, dtype=np.int64)
+        if not len(ids):
+            return
+        self._removed.append(ids)
+
+        pos = np.searchsorted(self._sorted_ids, ids)
+        pos = pos[pos < len(self._sorted_ids)]
+        hit = pos[np.isin(self._sorted_ids[pos], ids)]
+        self._alive[self._sorted_rows[hit]] = False
+
+        if self._delta_ids:
+            keep = [~np.isin(d, ids) for d in self._delta_ids]
+            self._delta = [v[k] for v, k in zip(self._delta, keep)]
+            self._delta_ids = [d[k] for d, k in zip(self._delta_ids, keep)]
+
+    def replay(self, other: "VectorIndex"):
+        """
+        Apply `other`'s unsaved changes (tombstones, then delta) on top
+        of this index. They stay unsaved here as well.
+        """
+        for ids in other._removed:
+            self.remove(ids)
+        for ids, vectors in zip(other._delta_ids, other._delta):
+            self.add(ids, vectors)
+
+    def __len__(self):
+        return int(self._alive.sum()) + sum(len(d) for d in self._delta_ids)
+
+    # ============================
+    # SEARCH
+    # ============================
+    def _base_candidates(self, q: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (scores, row indices) for the scanned part of the base segment.
+        IVF lists are contiguous row ranges, so they are scored as slices
+        of the memory map without gathering vectors.
+        """
+        if self._centroids is None:
+            return self._base @ q, np.arange(len(self._base_ids))
+
+        lists = _top_k(self._centroids @ q, self.nprobe)
+        ranges = [(self._offsets[l], self._offsets[l + 1]) for l in lists]
+        scores = np.concatenate([self._base[a:b] @ q for a, b in ranges])
+        rows = np.concatenate([np.arange(a, b) for a, b in ranges])
+        return scores, rows
+
+    def search(self, query, top_k: int = 5) -> list[tuple[int, float]]:
+        """
+        Top-k (id, cosine similarity) pairs, best first.
+        """
+        q = _normalize(np.asarray(query, dtype=np.float32).reshape(self.dim))
+
+        scores, rows = self._base_candidates(q)
+        alive = self._alive[rows]
+        ids = self._base_ids[rows][alive]
+        scores = scores[alive]
+
+        if self._delta:
+            delta = np.concatenate(self._delta)
+            ids = np.concatenate([ids, np.concatenate(self._delta_ids)])
+            scores = np.concatenate([scores, delta @ q])
+
+        best = _top_k(scores, top_k)
+        return [(int(ids[i]), float(scores[i])) for i in best]
+
+
+# ============================
+# PROCESS-WIDE INDEX
+# ============================
+_index: VectorIndex | None = None
+
+# Held while the shared index is mutated or saved from async code, so a
+# rebuild cannot swap in a snapshot that misses concurrent changes
+index_lock = asyncio.Lock()
+
+
+def _refresh():
+    """
+    Swap in a newer generation saved by another process (e.g. the
+    ingestion CLI), replaying this process's unsaved changes onto it.
+    Costs one stat() when nothing changed.
+    """
+    global _index
+    if _index is None or _index.path is None:
+        return
+    stamp = _meta_stamp(_index.path)
+    if stamp is None or stamp == _index._stamp:
+        return
+
+    fresh = VectorIndex.load(_index.path, nprobe=_index.nprobe)
+    if fresh is None or fresh.generation <= _index.generation:
+        _index._stamp = stamp
+        return
+    if fresh.dim == _index.dim:
+        fresh.replay(_index)
+    _index = fresh
+
+
+def get_vector_index(dim: int) -> VectorIndex:
+    """
+    The shared index, memory-mapped from VECTOR_INDEX_DIR on first use
+    and reloaded whenever a newer generation is saved.
+    """
+    global _index
+    if _index is None:
+        _index = VectorIndex.load(
+            settings.VECTOR_INDEX_DIR, nprobe=settings.VECTOR_INDEX_NPROBE
+        ) or VectorIndex(
+            dim, path=settings.VECTOR_INDEX_DIR, nprobe=settings.VECTOR_INDEX_NPROBE
+        )
+    else:
+        _refresh()
+    return _index
+
+
+def get_loaded_index() -> VectorIndex | None:
+    """
+    The shared index if it exists in memory or on disk, else None.
+    """
+    global _index
+    if _index is None:
+        _index = VectorIndex.load(
+            settings.VECTOR_INDEX_DIR, nprobe=settings.VECTOR_INDEX_NPROBE
+        )
+    else:
+        _refresh()
+    return _index
+
+
+async def save_vector_index():
+    """
+    Compact and persist the shared index on top of the latest on-disk
+    generation, so vectors saved by another process are kept. A flat
+    index is switched to IVF once the corpus crosses
+    VECTOR_INDEX_IVF_THRESHOLD. The work runs in a worker thread; call
+    with `index_lock` held.
+    """
+    if _index is None:
+        return
+    _refresh()
+    nlist = None if _index._centroids is not None else ivf_lists_for(len(_index))
+    await _index.asave(nlist=nlist)
+
+
+def ivf_lists_for(count: int) -> int:
+    """
+    IVF list count for a corpus size (flat below the threshold).
+    """
+    if count < settings.VECTOR_INDEX_IVF_THRESHOLD:
+        return 0
+    return int(2 * np.sqrt(count))
+
+
+async def rebuild_from_db() -> VectorIndex | None:
+    """
+    Rebuild the shared index from `document_embeddings` and persist it.
+
+    Runs under `index_lock`: ingestion commits rows first and updates the
+    index under the lock, so changes made while the rebuild streams are
+    applied to the new index once it is swapped in.
+    """
+    async with index_lock:
+        return await _rebuild_from_db()
+
+
+async def _rebuild_from_db() -> VectorIndex | None:
+    global _index
+    from app.crud import documents as documents_crud
+    from app.db.session import AsyncSessionLocal
+
+    index = None
+    skipped = 0
+    async with AsyncSessionLocal() as db:
+        async for batch in documents_crud.stream_embeddings(db):
+            ids, vectors = [], []
+            for doc_id, blob in batch:
+                try:
+                    vector = unpack_vector(blob, index.dim if index else None)
+                except ValueError:
+                    skipped += 1
+                    continue
+                if index is None:
+                    index = VectorIndex(
+                        len(vector),
+                        path=settings.VECTOR_INDEX_DIR,
+                        nprobe=settings.VECTOR_INDEX_NPROBE,
+                    )
+                ids.append(doc_id)
+                vectors.append(vector)
+            if vectors:
+                # Primary keys are unique, so rows are appended unchecked
+                index._append(
+                    np.asarray(ids, dtype=np.int64), _normalize(np.stack(vectors))
+                )
+
+    if skipped:
+        print(f"Vector index rebuild: skipped {skipped} undecodable embeddings")
+    if index is None:
+        return None
+
+    await index.asave(nlist=ivf_lists_for(len(index)))
+    _index = index
+    print(f"Vector index rebuilt: {len(index)} documents")
+    return index
+
+
+async def ensure_vector_index():
+    """
+    Startup hook: build the on-disk index if it is missing.
+    """
+    if os.path.exists(os.path.join(settings.VECTOR_INDEX_DIR, META_FILE)):
+        return
+    try:
+        await rebuild_from_db()
+    except Exception as e:
+        print(f"Vector index rebuild failed: {e}")
@@ -0,0 +1,54 @@
+# app/services/warmup.py
+
+import asyncio
+
+from app.core.config import settings
+from app.services.embeddings import get_embeddings_store
+from app.services.llm_client import get_llm_client
+
+# component -> "pending" | "loading" | "ready" | "disabled" | "failed: <reason>"
+_status: dict[str, str] = {
+    "embeddings": "pending",
+    "llm": "pending",
+}
+
+
+def _load_embeddings():
+    get_embeddings_store().load()
+
+
+def _load_llm():
+    get_llm_client()
+
+
+_LOADERS = {
+    "embeddings": _load_embeddings,
+    "llm": _load_llm,
+}
+
+
+async def warm_up():
+    """
+    Load heavy services in a worker thread so the API can serve
+    requests (health checks included) while they initialize.
+    """
+    for name, load in _LOADERS.items():
+        # The LLM is optional: without a key only chat is unavailable
+        if name == "llm" and not settings.GEMINI_API_KEY:
+            _status[name] = "disabled"
+            continue
+        _status[name] = "loading"
+        try:
+            await asyncio.to_thread(load)
+            _status[name] = "ready"
+        except Exception as e:
+            print(f"Warm-up of {name} failed: {e}")
+            _status[name] = f"failed: {e}"
+
+
+def status() -> dict[str, str]:
+    return dict(_status)
+
+
+def is_ready() -> bool:
+    return all(s in ("ready", "disabled") for s in _status.values())
@@ -0,0 +1,19 @@
+# app/tasks/celery_app.py
+
+from celery import Celery
+
+from app.core.config import settings
+
+celery_app = Celery(
+    "bullseye",
+    broker=settings.REDIS_URL,
+    backend=settings.REDIS_URL,
+    include=["app.tasks.fetch_prices"],
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    timezone="Asia/Kolkata",
+)
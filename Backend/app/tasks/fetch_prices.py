@@ -1,76 +1,96 @@
 # app/tasks/fetch_prices.py
+
+# On-demand Celery entry points for ad-hoc symbol lists. Scheduled
+# collection is done by the long-lived collector worker
+# (python -m app.services.collector), which builds bars from a stream of
+# ticks. A one-shot task only sees a single quote per symbol, which never
+# closes a bar, so these tasks store the provider's recent 1-minute
+# candles instead (only the gap since the newest stored bar is fetched).
+
 from .celery_app import celery_app
 import asyncio
-import datetime
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from app.db.session import engine
+from app.services import candle_store
+from app.services.collector import collector
+from app.services.http_clients import close_clients
+from app.services.market_providers.router import get_upstox_provider
+from app.services.symbol_resolver import get_canonical_symbol, get_instrument_key
+
+RESOLUTION = "1"
+# One session of 1-minute bars
+MAX_BARS = 375
+# Symbols fetched concurrently
+CONCURRENCY = 8
+
+
+def _run(coro):
+    """
+    Run a coroutine on a fresh event loop. Pooled DB and HTTP connections
+    are bound to the loop that opened them, so they are released before
+    the loop closes.
+    """
+    async def main():
+        try:
+            return await coro
+        finally:
+            await close_clients()
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+async def _store_recent_bars(symbols: list[str]) -> dict:
+    provider = get_upstox_provider()
+    slots = asyncio.Semaphore(CONCURRENCY)
+    failed = []
+
+    async def store(symbol: str):
+        try:
+            async with slots:
+                await candle_store.get_candles(
+                    symbol, get_instrument_key(symbol), RESOLUTION, MAX_BARS, provider
+                )
+        except Exception as e:
+            print(f"Storing bars for {symbol} failed: {e}")
+            failed.append(symbol)
 
-from app.core.config import settings
-from app.models import Asset, Price
-from app.services.market_providers.router import get_provider
+    # One stored asset per instrument, however it was spelled
+    symbols = list(dict.fromkeys(get_canonical_symbol(s) for s in symbols))
+    await asyncio.gather(*(store(s) for s in symbols))
+    return {
+        "symbols": len(symbols),
+        "stored": len(symbols) - len(failed),
+        "failed": failed,
+    }
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    future=True,
-    echo=False,
-)
 
-AsyncSessionLocal = sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-)
+async def _store_universe() -> dict:
+    return await _store_recent_bars(await collector.universe())
 
 
 @celery_app.task
 def fetch_and_store(symbol: str):
     """
     Celery task (sync entrypoint).
-    Fetches latest quote using market provider and stores it in DB.
+    Stores the recent 1-minute bars of one symbol.
     """
+    return _run(_store_recent_bars([symbol]))
 
-    async def _run():
-        provider = await get_provider(symbol)
-        quote = await provider.fetch_quote(symbol)
-
-        # Provider-safe guard
-        if not isinstance(quote, dict) or "price" not in quote:
-            return {"status": "no_data", "symbol": symbol}
-
-        timestamp = datetime.datetime.utcfromtimestamp(
-            quote.get("timestamp", int(datetime.datetime.utcnow().timestamp()))
-        )
-
-        async with AsyncSessionLocal() as db:
-            # Find or create asset
-            res = await db.execute(
-                Asset.__table__.select().where(Asset.symbol == symbol)
-            )
-            row = res.first()
-
-            if row:
-                asset_id = row[0]
-            else:
-                asset = Asset(symbol=symbol, name=symbol)
-                db.add(asset)
-                await db.commit()
-                await db.refresh(asset)
-                asset_id = asset.id
-
-            price = Price(
-                asset_id=asset_id,
-                timestamp=timestamp,
-                open=quote.get("open", quote["price"]),
-                high=quote.get("high", quote["price"]),
-                low=quote.get("low", quote["price"]),
-                close=quote["price"],
-                volume=quote.get("volume", 0.0),
-            )
-
-            db.add(price)
-            await db.commit()
-
-        return {"status": "ok", "symbol": symbol, "price": quote["price"]}
-
-    return asyncio.run(_run())
+
+@celery_app.task
+def fetch_and_store_many(symbols: list[str]):
+    """
+    Celery task (sync entrypoint).
+    Same as fetch_and_store, for a whole watchlist.
+    """
+    return _run(_store_recent_bars(symbols))
+
+
+@celery_app.task
+def collect_prices():
+    """
+    Celery task (sync entrypoint).
+    Stores recent 1-minute bars for the whole tracked universe.
+    """
+    return _run(_store_universe())
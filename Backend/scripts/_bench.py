@@ -0,0 +1,131 @@
+# scripts/_bench.py
+
+# Helpers shared by the benchmark scripts. Run them from Backend/:
+#
+#   python -m scripts.bench_upsert --help
+#
+# Scripts that touch the database default to a throwaway SQLite file,
+# so they never write to the configured one; pass --database-url to
+# measure a real server. The URL has to be chosen before any `app`
+# module is imported (the engines are built at import time), which is
+# why the scripts import the app inside main().
+
+import argparse
+import asyncio
+import atexit
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+
+def parser(description: str, database: bool = True) -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description=description)
+    if database:
+        p.add_argument(
+            "--database-url",
+            help="database to benchmark (default: a temporary SQLite file)",
+        )
+    return p
+
+
+def temp_dir() -> str:
+    path = tempfile.mkdtemp(prefix="bullseye-bench-")
+    atexit.register(shutil.rmtree, path, ignore_errors=True)
+    return path
+
+
+def use_database(url: str | None) -> str:
+    """
+    Point the app's settings at `url`, or at a fresh SQLite file.
+    Must run before the first `app` import.
+    """
+    if url is None:
+        url = f"sqlite+aiosqlite:///{os.path.join(temp_dir(), 'bench.db')}"
+    os.environ["DATABASE_URL"] = url
+    os.environ["DATABASE_READ_URL"] = ""
+    return url
+
+
+async def create_schema():
+    from app.db.migrations import run_migrations
+    from app.db.session import engine
+    from app.models import Base
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(run_migrations)
+
+
+def latency(samples: list[float]) -> str:
+    """
+    "p50 / p95 / max" of durations in seconds, as milliseconds.
+    """
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return (
+        f"p50 {statistics.median(ordered) * 1000:.2f} ms, "
+        f"p95 {p95 * 1000:.2f} ms, max {ordered[-1] * 1000:.2f} ms"
+    )
+
+
+def rate(count: int, seconds: float, unit: str) -> str:
+    return f"{count} {unit} in {seconds:.2f}s ({count / seconds if seconds else 0:,.0f} {unit}/s)"
+
+
+class LoopMonitor:
+    """
+    Longest event-loop stall while active: a task wakes every
+    `interval` seconds and records how late it was.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.max_stall = 0.0
+        self._task: asyncio.Task | None = None
+        self._slept_at = 0.0
+
+    def _check(self):
+        late = time.perf_counter() - self._slept_at - self.interval
+        self.max_stall = max(self.max_stall, late)
+
+    async def _watch(self):
+        while True:
+            self._slept_at = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self._check()
+
+    async def __aenter__(self):
+        self._task = asyncio.create_task(self._watch())
+        await asyncio.sleep(0)  # start watching before the caller's work
+        return self
+
+    async def __aexit__(self, *exc):
+        # A stall that lasts until the caller's work ends is only seen here
+        self._check()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+def stub_encoder(dim: int = 384, call_ms: float = 20.0, text_ms: float = 1.0):
+    """
+    Stand-in for SentenceTransformer.encode when the model is not
+    installed: a fixed cost per call plus a cost per text, slept (the
+    real model releases the GIL too), with one vector per distinct text
+    for the run.
+    """
+    import numpy as np
+
+    def encode(texts: list[str]):
+        time.sleep((call_ms + text_ms * len(texts)) / 1000)
+        vectors = np.stack([
+            np.random.default_rng(abs(hash(text)) % 2**32).standard_normal(dim)
+            for text in texts
+        ]).astype(np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    return encode
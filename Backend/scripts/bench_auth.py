@@ -0,0 +1,67 @@
+# scripts/bench_auth.py
+
+# get_current_user per request: JWT decode plus a user query every time
+# (caches disabled) against the token and user caches.
+#
+#   python -m scripts.bench_auth [--requests 2000] [--concurrency 20]
+
+import asyncio
+import time
+
+from scripts._bench import create_schema, latency, parser, rate, use_database
+
+
+async def _requests(token: str, count: int, concurrency: int) -> tuple[list[float], float]:
+    from fastapi.security import HTTPAuthorizationCredentials
+
+    from app.api import deps
+    from app.db.session import AsyncSessionLocal
+
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    slots = asyncio.Semaphore(concurrency)
+    samples = []
+
+    async def one():
+        async with slots, AsyncSessionLocal() as db:
+            started = time.perf_counter()
+            await deps.get_current_user(credentials, db)
+            samples.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(count)))
+    return samples, time.perf_counter() - started
+
+
+async def main(args):
+    from app import models
+    from app.api import deps
+    from app.api.v1.auth import create_access_token
+    from app.db.session import AsyncSessionLocal, dispose_engines
+    from app.services.auth_cache import AuthCache
+
+    await create_schema()
+    try:
+        async with AsyncSessionLocal() as db:
+            user = models.User(email=f"bench-{time.time_ns()}@example.com", hashed_password="x")
+            db.add(user)
+            await db.commit()
+        token = create_access_token(str(user.id))
+
+        for label, cache in (
+            ("uncached", AuthCache(token_entries=0, user_ttl=0)),
+            ("cached  ", AuthCache()),
+        ):
+            deps.auth_cache = cache
+            samples, seconds = await _requests(token, args.requests, args.concurrency)
+            print(f"{label} {rate(args.requests, seconds, 'requests')}, {latency(samples)}")
+    finally:
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    p = parser("Auth dependency (token and user cache) benchmark")
+    p.add_argument("--requests", type=int, default=2000)
+    p.add_argument("--concurrency", type=int, default=20)
+    args = p.parse_args()
+    use_database(args.database_url)
+    asyncio.run(main(args))
@@ -0,0 +1,111 @@
+# scripts/bench_db_pool.py
+
+# Connection pool under concurrency: recent-bar reads at increasing
+# concurrency, with a writer upserting bars alongside (SQLite runs in
+# WAL mode, so readers should not wait on it). Reports throughput,
+# latency and the peak pool usage seen.
+#
+#   python -m scripts.bench_db_pool [--queries 2000] [--concurrency 1,10,50]
+
+import asyncio
+import time
+
+from scripts._bench import create_schema, latency, parser, rate, use_database
+
+MINUTE_MS = 60_000
+# Monday 2023-11-13, 09:15 IST
+START_MS = 1_699_847_100_000
+
+
+def _bar(asset_id: int, i: int) -> dict:
+    from app.crud.prices import to_datetime
+
+    return {
+        "asset_id": asset_id,
+        "resolution": "1",
+        "timestamp": to_datetime(START_MS + i * MINUTE_MS),
+        "open": 100.0, "high": 101.0, "low": 99.0, "close": 100.5, "volume": 1000.0,
+    }
+
+
+async def _writer(asset_id: int, stop: asyncio.Event) -> tuple[int, int]:
+    from app.crud import prices as prices_crud
+    from app.db.session import AsyncSessionLocal
+
+    written = errors = 0
+    i = 10_000
+    while not stop.is_set():
+        try:
+            async with AsyncSessionLocal() as db:
+                await prices_crud.upsert_prices(db, [_bar(asset_id, i + n) for n in range(50)])
+            written += 50
+        except Exception:
+            errors += 1
+        i += 50
+        await asyncio.sleep(0.01)
+    return written, errors
+
+
+async def _level(asset_id: int, queries: int, concurrency: int):
+    from app.crud import prices as prices_crud
+    from app.db.session import AsyncReadSessionLocal, pool_stats
+
+    slots = asyncio.Semaphore(concurrency)
+    samples = []
+    peak = {"checked_out": 0, "overflow": 0}
+
+    async def one():
+        async with slots:
+            started = time.perf_counter()
+            async with AsyncReadSessionLocal() as db:
+                await prices_crud.get_recent_prices(db, asset_id, 100, resolution="1")
+                primary = pool_stats()["primary"]
+                for key in peak:
+                    peak[key] = max(peak[key], primary.get(key, 0))
+            samples.append(time.perf_counter() - started)
+
+    stop = asyncio.Event()
+    writer = asyncio.create_task(_writer(asset_id, stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(queries)))
+    seconds = time.perf_counter() - started
+    stop.set()
+    written, errors = await writer
+
+    print(
+        f"concurrency {concurrency:>4}: {rate(queries, seconds, 'reads')}, {latency(samples)}, "
+        f"peak checked out {peak['checked_out']} (overflow {peak['overflow']}), "
+        f"writer {written} bars / {errors} errors"
+    )
+
+
+async def main(args):
+    from app.core.config import settings
+    from app.crud import assets as assets_crud, prices as prices_crud
+    from app.db.session import AsyncSessionLocal, dispose_engines
+
+    await create_schema()
+    try:
+        async with AsyncSessionLocal() as db:
+            asset_id = (await assets_crud.get_or_create_asset_ids(db, ["BENCHPOOL"]))["BENCHPOOL"]
+            await prices_crud.upsert_prices(db, [_bar(asset_id, i) for i in range(2000)])
+
+        print(f"pool size {settings.DB_POOL_SIZE}, max overflow {settings.DB_MAX_OVERFLOW}")
+        for concurrency in args.concurrency:
+            await _level(asset_id, args.queries, concurrency)
+    finally:
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    p = parser("Database pool concurrency benchmark")
+    p.add_argument("--queries", type=int, default=2000, help="reads per concurrency level")
+    p.add_argument(
+        "--concurrency",
+        type=lambda s: [int(n) for n in s.split(",")],
+        default=[1, 10, 50],
+        help="comma-separated concurrency levels",
+    )
+    args = p.parse_args()
+    use_database(args.database_url)
+    asyncio.run(main(args))
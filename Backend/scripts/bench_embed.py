@@ -0,0 +1,66 @@
+# scripts/bench_embed.py
+
+# Embedding micro-batching: many concurrent single-text embed() calls
+# through the EmbeddingWorker, once with batching disabled (batch size 1)
+# and once with the configured batch size and wait. Uses the configured
+# SentenceTransformer, or a stub with a fixed per-call cost (--stub).
+#
+#   python -m scripts.bench_embed [--requests 256] [--stub]
+
+import asyncio
+import time
+
+from scripts._bench import LoopMonitor, latency, parser, rate, stub_encoder
+
+
+async def _run(worker, texts: list[str]):
+    samples = []
+
+    async def one(text):
+        started = time.perf_counter()
+        await worker.embed(text)
+        samples.append(time.perf_counter() - started)
+
+    async with LoopMonitor() as loop:
+        started = time.perf_counter()
+        await asyncio.gather(*(one(t) for t in texts))
+        seconds = time.perf_counter() - started
+    return samples, seconds, loop.max_stall
+
+
+async def main(args):
+    from app.core.config import settings
+    from app.services.embedding_worker import EmbeddingWorker
+
+    if args.stub:
+        encode = stub_encoder()
+    else:
+        from sentence_transformers import SentenceTransformer
+
+        model = SentenceTransformer(settings.EMBEDDING_MODEL)
+        encode = lambda texts: model.encode(
+            texts, batch_size=len(texts), show_progress_bar=False
+        )
+        encode(["warm up"])
+
+    texts = [f"Bench sentence {i}: RSI divergence on the daily chart." for i in range(args.requests)]
+    for label, batch_size in (("unbatched", 1), ("batched  ", settings.EMBEDDING_BATCH_SIZE)):
+        worker = EmbeddingWorker(
+            encode,
+            max_batch_size=batch_size,
+            max_wait_ms=settings.EMBEDDING_BATCH_WAIT_MS,
+            workers=settings.EMBEDDING_WORKERS,
+        )
+        samples, seconds, stall = await _run(worker, texts)
+        print(
+            f"{label} {rate(len(texts), seconds, 'texts')}, "
+            f"avg batch {worker.stats()['avg_batch_size']:.1f}, "
+            f"{latency(samples)}, loop stall {stall * 1000:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    p = parser("Embedding micro-batching benchmark", database=False)
+    p.add_argument("--requests", type=int, default=256, help="concurrent embed() calls")
+    p.add_argument("--stub", action="store_true", help="use a stub encoder instead of the model")
+    asyncio.run(main(p.parse_args()))
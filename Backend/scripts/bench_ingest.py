@@ -0,0 +1,85 @@
+# scripts/bench_ingest.py
+
+# Document ingestion throughput: synthetic documents through the full
+# pipeline (chunk, hash, embed, upsert, vector index, compaction), then
+# the same documents again (all chunks unchanged) and with a tenth of
+# them edited. Also reports the longest event-loop stall, which
+# compaction in a worker thread keeps short. Uses the configured
+# embedding model, or a stub encoder (--stub).
+#
+#   python -m scripts.bench_ingest [--documents 200] [--stub]
+
+import asyncio
+import os
+import random
+
+from scripts._bench import (
+    LoopMonitor,
+    create_schema,
+    parser,
+    stub_encoder,
+    temp_dir,
+    use_database,
+)
+
+WORDS = (
+    "revenue margin guidance quarter growth demand outlook capex debt "
+    "dividend order book pricing volume exports rupee inflation rate"
+).split()
+
+
+def _text(rng: random.Random, chars: int) -> str:
+    words = []
+    length = 0
+    while length < chars:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+async def _pass(label: str, documents: list[dict]):
+    from app.services.ingestion import ingest
+
+    async with LoopMonitor() as loop:
+        result = await ingest(documents)
+    print(
+        f"{label} {result.documents} docs / {result.chunks} chunks in "
+        f"{result.seconds:.2f}s ({result.chunks_per_second:,.0f} chunks/s): "
+        f"{result.written} written, {result.unchanged} unchanged, "
+        f"loop stall {loop.max_stall * 1000:.1f} ms"
+    )
+
+
+async def main(args):
+    from app.db.session import dispose_engines
+    from app.services.embeddings import get_embeddings_store
+
+    await create_schema()
+    if args.stub:
+        get_embeddings_store().worker.encode = stub_encoder()
+
+    rng = random.Random(0)
+    documents = [
+        {"id": f"bench-{i}", "text": _text(rng, args.chars)}
+        for i in range(args.documents)
+    ]
+    try:
+        await _pass("new      ", documents)
+        await _pass("unchanged", documents)
+        for doc in documents[::10]:
+            doc["text"] = _text(rng, args.chars)
+        await _pass("10% edits", documents)
+    finally:
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    p = parser("Document ingestion throughput benchmark")
+    p.add_argument("--documents", type=int, default=200)
+    p.add_argument("--chars", type=int, default=6000, help="characters per document")
+    p.add_argument("--stub", action="store_true", help="use a stub encoder instead of the model")
+    args = p.parse_args()
+    use_database(args.database_url)
+    os.environ["VECTOR_INDEX_DIR"] = temp_dir()
+    asyncio.run(main(args))
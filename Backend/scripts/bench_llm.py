@@ -0,0 +1,87 @@
+# scripts/bench_llm.py
+
+# LLM client latency: building the client (the google-genai import is
+# the cold-start cost that warm-up moves off the first request), the
+# first achat() against later ones, and time to first chunk for
+# aopen_stream(). Uses the real Gemini API when GEMINI_API_KEY is set,
+# or a local stub with a fixed response delay (--stub).
+#
+#   python -m scripts.bench_llm [--calls 10] [--stub --delay-ms 300]
+
+import asyncio
+import json
+import os
+import time
+
+from scripts._bench import latency, parser
+
+SYSTEM = "You are a concise market assistant."
+QUESTION = "In one sentence, what does an RSI above 70 suggest?"
+
+
+def _stub_transport(delay: float):
+    import httpx
+
+    def candidate(text):
+        return {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}]}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(delay)
+        if request.url.path.endswith(":streamGenerateContent"):
+            body = "".join(
+                f"data: {json.dumps(candidate(word + ' '))}\r\n\r\n"
+                for word in "An RSI above 70 suggests overbought conditions.".split()
+            )
+            return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+        return httpx.Response(200, json=candidate("Overbought."))
+
+    return httpx.MockTransport(handler)
+
+
+async def main(args):
+    from app.services.llm_client import LLMClient
+
+    http_options = None
+    if args.stub:
+        os.environ.setdefault("GEMINI_API_KEY", "stub")
+        http_options = {
+            "base_url": "https://gemini.stub/",
+            "async_client_args": {"transport": _stub_transport(args.delay_ms / 1000)},
+        }
+
+    started = time.perf_counter()
+    client = LLMClient(http_options=http_options)
+    print(f"client (cold)     {(time.perf_counter() - started) * 1000:.1f} ms")
+    started = time.perf_counter()
+    LLMClient(http_options=http_options)
+    print(f"client (warm)     {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    started = time.perf_counter()
+    await client.achat(SYSTEM, QUESTION)
+    print(f"achat (first)     {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    samples = []
+    for _ in range(args.calls):
+        started = time.perf_counter()
+        await client.achat(SYSTEM, QUESTION)
+        samples.append(time.perf_counter() - started)
+    print(f"achat             {latency(samples)}")
+
+    first, total = [], []
+    for _ in range(args.calls):
+        started = time.perf_counter()
+        chunks = await client.aopen_stream(SYSTEM, QUESTION)
+        first.append(time.perf_counter() - started)
+        async for _ in chunks:
+            pass
+        total.append(time.perf_counter() - started)
+    print(f"stream 1st chunk  {latency(first)}")
+    print(f"stream complete   {latency(total)}")
+
+
+if __name__ == "__main__":
+    p = parser("LLM client latency benchmark", database=False)
+    p.add_argument("--calls", type=int, default=10)
+    p.add_argument("--stub", action="store_true", help="answer from a local stub, not Gemini")
+    p.add_argument("--delay-ms", type=float, default=300, help="stub response delay")
+    asyncio.run(main(p.parse_args()))
@@ -0,0 +1,57 @@
+# scripts/bench_login.py
+
+# Concurrent password checks, as in a login burst: bcrypt verify called
+# inline on the event loop against the bounded PasswordHasher pool. The
+# loop stall is how long any other request would have waited.
+#
+#   python -m scripts.bench_login [--logins 32] [--workers 2]
+
+import asyncio
+import time
+
+from scripts._bench import LoopMonitor, latency, parser, rate
+
+
+async def _burst(verify, hashed: str, count: int):
+    samples = []
+
+    # Latency counts from the start of the burst: inline checks also
+    # wait for every check that ran before them
+    async def one():
+        await verify("s3cret", hashed)
+        samples.append(time.perf_counter() - started)
+
+    async with LoopMonitor() as loop:
+        started = time.perf_counter()
+        results = await asyncio.gather(*(one() for _ in range(count)), return_exceptions=True)
+        seconds = time.perf_counter() - started
+    failed = sum(isinstance(r, Exception) for r in results)
+    return samples, seconds, loop.max_stall, failed
+
+
+async def main(args):
+    from app.crud.users import hash_password, verify_password
+    from app.services.password_hasher import PasswordHasher
+
+    hashed = hash_password("s3cret")
+
+    async def inline(plain, hashed):
+        return verify_password(plain, hashed)
+
+    hasher = PasswordHasher(workers=args.workers, max_queued=args.max_queued)
+    for label, verify in (("inline", inline), ("pool  ", hasher.verify)):
+        samples, seconds, stall, failed = await _burst(verify, hashed, args.logins)
+        print(
+            f"{label} {rate(len(samples), seconds, 'logins')}, {latency(samples)}, "
+            f"loop stall {stall * 1000:.1f} ms, rejected {failed}"
+        )
+
+
+if __name__ == "__main__":
+    from app.core.config import settings
+
+    p = parser("Login burst (bcrypt pool) benchmark", database=False)
+    p.add_argument("--logins", type=int, default=32, help="concurrent password checks")
+    p.add_argument("--workers", type=int, default=settings.PASSWORD_HASH_WORKERS)
+    p.add_argument("--max-queued", type=int, default=settings.PASSWORD_HASH_MAX_QUEUE)
+    asyncio.run(main(p.parse_args()))
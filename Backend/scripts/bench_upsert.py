@@ -0,0 +1,90 @@
+# scripts/bench_upsert.py
+
+# Price storage: row-by-row create_price() against the chunked bulk
+# upsert_prices(), for new bars and for re-sent ones (the ON CONFLICT
+# path), then recent-bar reads served by the (asset_id, resolution,
+# timestamp) index.
+#
+#   python -m scripts.bench_upsert [--assets 20] [--bars 5000]
+
+import asyncio
+import random
+import time
+
+from scripts._bench import create_schema, latency, parser, rate, use_database
+
+MINUTE_MS = 60_000
+# Monday 2023-11-13, 09:15 IST
+START_MS = 1_699_847_100_000
+
+
+def _bars(asset_id: int, count: int) -> list[dict]:
+    from app.crud.prices import to_datetime
+
+    rows = []
+    price = 100.0
+    for i in range(count):
+        close = price + random.uniform(-1, 1)
+        rows.append({
+            "asset_id": asset_id,
+            "resolution": "1",
+            "timestamp": to_datetime(START_MS + i * MINUTE_MS),
+            "open": price,
+            "high": max(price, close) + 0.5,
+            "low": min(price, close) - 0.5,
+            "close": close,
+            "volume": float(random.randint(100, 10_000)),
+        })
+        price = close
+    return rows
+
+
+async def main(args):
+    from app.crud import assets as assets_crud, prices as prices_crud
+    from app.db.session import AsyncSessionLocal, dispose_engines
+
+    await create_schema()
+    try:
+        async with AsyncSessionLocal() as db:
+            ids = await assets_crud.get_or_create_asset_ids(
+                db, [f"BENCH{i}" for i in range(args.assets + 1)]
+            )
+        asset_ids = [ids[f"BENCH{i}"] for i in range(args.assets)]
+
+        # Baseline: one statement and one commit per bar
+        single = _bars(ids[f"BENCH{args.assets}"], args.single)
+        async with AsyncSessionLocal() as db:
+            started = time.perf_counter()
+            for row in single:
+                await prices_crud.create_price(db, **row)
+            print("create_price   ", rate(len(single), time.perf_counter() - started, "bars"))
+
+        rows = [row for asset_id in asset_ids for row in _bars(asset_id, args.bars)]
+        for label in ("upsert (new)   ", "upsert (resent)"):
+            async with AsyncSessionLocal() as db:
+                started = time.perf_counter()
+                await prices_crud.upsert_prices(db, rows)
+                print(label, rate(len(rows), time.perf_counter() - started, "bars"))
+
+        samples = []
+        async with AsyncSessionLocal() as db:
+            for _ in range(args.queries):
+                started = time.perf_counter()
+                await prices_crud.get_recent_prices(
+                    db, random.choice(asset_ids), 100, resolution="1"
+                )
+                samples.append(time.perf_counter() - started)
+        print("recent 100 bars", latency(samples))
+    finally:
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    p = parser("Bulk price upsert and recent-bar read benchmark")
+    p.add_argument("--assets", type=int, default=20)
+    p.add_argument("--bars", type=int, default=5000, help="bars per asset")
+    p.add_argument("--single", type=int, default=500, help="bars for the row-by-row baseline")
+    p.add_argument("--queries", type=int, default=200)
+    args = p.parse_args()
+    use_database(args.database_url)
+    asyncio.run(main(args))
@@ -0,0 +1,122 @@
+# tests/test_auth_cache.py
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app import models
+from app.api import deps
+from app.api.v1.auth import create_access_token
+from app.crud import users as users_crud
+from app.services import auth_cache as auth_cache_module
+from app.services.auth_cache import AuthCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(auth_cache_module.time, "time", lambda: now[0])
+    return now
+
+
+def test_users_expire_after_ttl(clock):
+    cache = AuthCache(user_ttl=30)
+    cache.put_user(1, 100, "alice")
+    clock[0] += 29
+    assert cache.get_user(1, 100) == "alice"
+    clock[0] += 2
+    assert cache.get_user(1, 100) is None
+    assert cache.stats()["users"] == {"entries": 0, "hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+def test_zero_ttl_disables_the_user_cache(clock):
+    cache = AuthCache(user_ttl=0)
+    cache.put_user(1, 100, "alice")
+    assert cache.get_user(1, 100) is None
+
+
+def test_claims_expire_with_the_token(clock):
+    cache = AuthCache()
+    cache.put_claims("token", 1, 100, exp=clock[0] + 60)
+    assert cache.get_claims("token") == (1, 100)
+    clock[0] += 60
+    assert cache.get_claims("token") is None
+
+
+def test_caches_are_lru_bounded(clock):
+    cache = AuthCache(token_entries=2)
+    for token in ("a", "b"):
+        cache.put_claims(token, 1, 100, exp=clock[0] + 60)
+    cache.get_claims("a")
+    cache.put_claims("c", 1, 100, exp=clock[0] + 60)
+    assert cache.get_claims("b") is None
+    assert cache.get_claims("a") and cache.get_claims("c")
+
+
+def test_invalidate_drops_every_token_of_a_user(clock):
+    cache = AuthCache()
+    cache.put_user(1, 100, "alice")
+    cache.put_user(1, 200, "alice")
+    cache.put_user(2, 100, "bob")
+    cache.invalidate_user(1)
+    assert cache.get_user(1, 100) is None and cache.get_user(1, 200) is None
+    assert cache.get_user(2, 100) == "bob"
+
+
+# ===============================
+# get_current_user
+# ===============================
+def test_user_is_cached_until_the_row_changes(tmp_path, monkeypatch):
+    cache = AuthCache()
+    monkeypatch.setattr(auth_cache_module, "auth_cache", cache)
+    monkeypatch.setattr(deps, "auth_cache", cache)
+
+    lookups = []
+    get_user_by_id = users_crud.get_user_by_id
+
+    async def counting(db, user_id):
+        lookups.append(user_id)
+        return await get_user_by_id(db, user_id)
+
+    monkeypatch.setattr(users_crud, "get_user_by_id", counting)
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'auth.db'}")
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def current_user(token):
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+        async with sessions() as db:
+            return await deps.get_current_user(credentials, db)
+
+    async def main():
+        async with engine.begin() as conn:
+            await conn.run_sync(models.Base.metadata.create_all)
+        async with sessions() as db:
+            user = models.User(email="a@example.com", hashed_password="x", full_name="A")
+            db.add(user)
+            await db.commit()
+        token = create_access_token(str(user.id))
+
+        try:
+            first = await current_user(token)
+            second = await current_user(token)
+            assert second is first and len(lookups) == 1
+
+            async with sessions() as db:
+                row = await db.get(models.User, user.id)
+                row.full_name = "B"
+                await db.commit()
+
+            third = await current_user(token)
+            assert third.full_name == "B" and len(lookups) == 2
+
+            with pytest.raises(HTTPException) as exc:
+                await current_user(token + "x")
+            assert exc.value.status_code == 401
+        finally:
+            await engine.dispose()
+
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+# tests/test_bar_aggregator.py
+
+import pytest
+
+from app.services import collector as collector_module
+from app.services.bar_aggregator import BarAggregator, merge_forming
+from app.services.collector import PriceCollector
+
+# Monday 2023-11-13, 09:15 IST
+MONDAY_OPEN = 1_699_847_100_000
+MINUTE = 60_000
+KEY = "NSE_EQ|INE002A01018"
+
+
+def test_ticks_build_and_close_bars():
+    agg = BarAggregator(["1"])
+    for i, price in enumerate([10.0, 12.0, 9.0, 11.0]):
+        agg.on_tick(KEY, price, MONDAY_OPEN + i * 10_000, symbol="RELIANCE")
+
+    assert agg.forming(KEY, "1") == {
+        "time": MONDAY_OPEN, "open": 10.0, "high": 12.0,
+        "low": 9.0, "close": 11.0, "volume": 0.0,
+    }
+
+    # First bar after startup is partial and never queued
+    agg.on_tick(KEY, 11.5, MONDAY_OPEN + MINUTE, symbol="RELIANCE")
+    assert agg.partial_skipped == 1 and not agg._pending
+    agg.on_tick(KEY, 11.2, MONDAY_OPEN + MINUTE + 30_000, symbol="RELIANCE")
+
+    agg.on_tick(KEY, 11.0, MONDAY_OPEN + 2 * MINUTE, symbol="RELIANCE")
+    assert [bar["time"] for _, _, bar in agg._pending] == [MONDAY_OPEN + MINUTE]
+
+
+def test_one_tick_per_bar_is_never_written():
+    # A 60-second collector feeding 1-minute bars
+    agg = BarAggregator(["1"])
+    for i in range(10):
+        agg.on_tick(KEY, 10.0 + i, MONDAY_OPEN + i * MINUTE, symbol="RELIANCE")
+    agg.close_expired(MONDAY_OPEN + 20 * MINUTE)
+
+    assert not agg._pending
+    assert agg.partial_skipped == 1 and agg.sparse_skipped == 9
+
+
+def test_collector_rejects_interval_too_long_for_bars(monkeypatch):
+    monkeypatch.setattr(collector_module, "bar_aggregator", BarAggregator(["1", "5"]))
+
+    PriceCollector(interval_seconds=30).check_interval()
+    with pytest.raises(ValueError, match="at most 30s"):
+        PriceCollector(interval_seconds=60).check_interval()
+
+
+def test_off_session_ticks_are_dropped():
+    agg = BarAggregator(["1"])
+    agg.on_tick(KEY, 10.0, MONDAY_OPEN - 5 * MINUTE, symbol="RELIANCE")
+    agg.on_tick(KEY, 10.0, MONDAY_OPEN + 400 * MINUTE, symbol="RELIANCE")
+    agg.on_tick(KEY, 10.0, MONDAY_OPEN - 2 * 86_400_000, symbol="RELIANCE")
+
+    assert agg.off_session_ticks == 3
+    assert agg.forming(KEY, "1") is None
+    assert agg.close_expired(MONDAY_OPEN + 500 * MINUTE) == 0
+    assert not agg._pending
+
+
+def test_merge_forming_extends_last_candle():
+    candles = [{"time": 0, "open": 1.0, "high": 2.0, "low": 1.0, "close": 2.0, "volume": 50.0}]
+    bar = {"time": 0, "open": 2.0, "high": 3.0, "low": 0.5, "close": 2.5, "volume": 0.0}
+
+    merged = merge_forming(candles, bar)
+    assert merged[-1] == {"time": 0, "open": 1.0, "high": 3.0, "low": 0.5, "close": 2.5, "volume": 50.0}
+    assert candles[0]["high"] == 2.0
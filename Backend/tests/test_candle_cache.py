@@ -0,0 +1,111 @@
+# tests/test_candle_cache.py
+
+import asyncio
+import time
+
+from app.services.candle_cache import CandleCache
+
+MINUTE = 60_000
+
+
+def _candles(n, start=None):
+    # Recent 1-minute bars, so the tail refresh only asks for a few
+    start = start if start is not None else (int(time.time() * 1000) // MINUTE - n) * MINUTE
+    return [
+        {"time": start + i * MINUTE, "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 10.0}
+        for i in range(n)
+    ]
+
+
+class CountingFetch:
+    def __init__(self, candles, delay=0.02):
+        self.candles = candles
+        self.delay = delay
+        self.limits = []
+
+    async def __call__(self, limit):
+        self.limits.append(limit)
+        await asyncio.sleep(self.delay)
+        return [dict(c) for c in self.candles[-limit:]]
+
+
+def test_concurrent_misses_share_one_fetch():
+    cache = CandleCache()
+    fetch = CountingFetch(_candles(50))
+
+    async def main():
+        return await asyncio.gather(
+            *(cache.get_or_fetch("K", "1", 50, fetch) for _ in range(5))
+        )
+
+    results = asyncio.run(main())
+    assert fetch.limits == [50]
+    assert cache.misses == 1 and cache.coalesced == 4
+    assert all(r == results[0] for r in results)
+
+
+def test_returned_candles_are_copies():
+    cache = CandleCache()
+    fetch = CountingFetch(_candles(20))
+
+    async def main():
+        first = await cache.get_or_fetch("K", "1", 20, fetch)
+        first[0]["rsi"] = 55.0
+        first.pop()
+        return await cache.get_or_fetch("K", "1", 20, fetch)
+
+    second = asyncio.run(main())
+    assert len(second) == 20
+    assert "rsi" not in second[0]
+    assert fetch.limits == [20]  # served from cache
+
+
+def test_expired_entry_fetches_only_the_tail():
+    cache = CandleCache()
+    candles = _candles(30)
+    fetch = CountingFetch(candles, delay=0)
+
+    async def main():
+        await cache.get_or_fetch("K", "1", 30, fetch)
+        cache._entries[("K", "1", 30)].expires_at = 0
+
+        # The forming bar moved on and a new bar opened
+        fresh = dict(candles[-1], close=9.0)
+        new = dict(candles[-1], time=candles[-1]["time"] + MINUTE)
+        fetch.candles = candles[:-1] + [fresh, new]
+        return await cache.get_or_fetch("K", "1", 30, fetch)
+
+    merged = asyncio.run(main())
+    assert fetch.limits[0] == 30 and fetch.limits[1] < 30
+    assert cache.refreshes == 1
+    assert len(merged) == 30
+    assert merged[-2]["close"] == 9.0
+    assert merged[-1]["time"] == candles[-1]["time"] + MINUTE
+    times = [c["time"] for c in merged]
+    assert times == sorted(set(times))
+
+
+def test_lru_eviction():
+    cache = CandleCache(max_entries=2)
+    fetch = CountingFetch(_candles(5), delay=0)
+
+    async def main():
+        await cache.get_or_fetch("A", "1", 5, fetch)
+        await cache.get_or_fetch("B", "1", 5, fetch)
+        await cache.get_or_fetch("A", "1", 5, fetch)  # A most recent
+        await cache.get_or_fetch("C", "1", 5, fetch)
+
+    asyncio.run(main())
+    assert set(k[0] for k in cache._entries) == {"A", "C"}
+
+
+def test_empty_responses_are_not_cached():
+    cache = CandleCache()
+    fetch = CountingFetch([], delay=0)
+
+    async def main():
+        await cache.get_or_fetch("K", "1", 10, fetch)
+        await cache.get_or_fetch("K", "1", 10, fetch)
+
+    asyncio.run(main())
+    assert fetch.limits == [10, 10]
@@ -0,0 +1,30 @@
+# tests/test_chat_api.py
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.main import app
+from app.services import llm_client
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # No GEMINI_API_KEY: get_llm_client() raises RuntimeError
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    monkeypatch.setattr(llm_client, "_client", None)
+    app.dependency_overrides[deps.get_current_user] = lambda: object()
+    try:
+        yield TestClient(app)  # no lifespan: startup tasks stay off
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.mark.parametrize("path, body", [
+    ("/api/chat/query", {"question": "hi"}),
+    ("/api/chat/query/stream", {"question": "hi"}),
+    ("/api/chat/explain-indicators", {"symbol": "ABC", "rsi": 50}),
+])
+def test_unconfigured_llm_is_503(client, path, body):
+    response = client.post(path, json=body)
+    assert response.status_code == 503
@@ -0,0 +1,100 @@
+# tests/test_collector.py
+
+import asyncio
+import io
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app import models
+from app.services import collector as collector_module, instrument_registry
+from app.services.bar_aggregator import BarAggregator
+from app.services.collector import PriceCollector
+
+# Monday 2023-11-13, 09:15 IST
+MONDAY_OPEN_S = 1_699_847_100
+
+MASTER = "\n".join([
+    "instrument_key,tradingsymbol,name,expiry,strike,lot_size,instrument_type,option_type,exchange",
+    "NSE_EQ|INE002A01018,RELIANCE,RELIANCE INDUSTRIES LTD,,,1,EQUITY,,NSE_EQ",
+    "NSE_EQ|INE467B01029,TCS,TATA CONSULTANCY SERV LT,,,1,EQUITY,,NSE_EQ",
+    "NSE_EQ|INE009A01021,INFY,INFOSYS LIMITED,,,1,EQUITY,,NSE_EQ",
+])
+
+
+@pytest.fixture(autouse=True)
+def table(monkeypatch):
+    frame = instrument_registry._read_master(io.StringIO(MASTER))
+    monkeypatch.setattr(
+        instrument_registry, "_table", instrument_registry.InstrumentTable.from_frame(frame)
+    )
+
+
+class FakeProvider:
+    def __init__(self):
+        self.calls = []
+
+    async def fetch_quotes(self, keys):
+        self.calls.append(sorted(keys))
+        return {
+            key: {"price": 100.0 + i, "timestamp": MONDAY_OPEN_S}
+            for i, key in enumerate(sorted(keys))
+        }
+
+
+def test_cycle_quotes_each_instrument_once(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'collector.db'}")
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr(collector_module, "AsyncSessionLocal", sessions)
+    monkeypatch.setattr(collector_module.settings, "COLLECTOR_SYMBOLS", "INFY, tcs")
+
+    provider = FakeProvider()
+    monkeypatch.setattr(collector_module, "get_upstox_provider", lambda: provider)
+    aggregator = BarAggregator(["1"])
+    monkeypatch.setattr(collector_module, "bar_aggregator", aggregator)
+
+    collector = PriceCollector(interval_seconds=15)
+
+    async def main():
+        async with engine.begin() as conn:
+            await conn.run_sync(models.Base.metadata.create_all)
+        async with sessions() as db:
+            db.add_all(
+                models.Asset(symbol=s)
+                for s in ("reliance", "NSE:RELIANCE", "TCS", "NOSUCH")
+            )
+            await db.commit()
+        try:
+            universe = await collector.universe()
+            return universe, await collector.collect_once()
+        finally:
+            await engine.dispose()
+
+    universe, result = asyncio.run(main())
+
+    assert universe == ["reliance", "NSE:RELIANCE", "TCS", "NOSUCH", "INFY"]
+    # Unresolvable symbols are skipped; spellings of one instrument share a quote
+    assert provider.calls == [
+        ["NSE_EQ|INE002A01018", "NSE_EQ|INE009A01021", "NSE_EQ|INE467B01029"]
+    ]
+    assert result["symbols"] == 5 and result["quoted"] == 3
+    assert aggregator.ticks == 3
+    assert aggregator._symbols == {
+        "NSE_EQ|INE002A01018": "RELIANCE",
+        "NSE_EQ|INE009A01021": "INFY",
+        "NSE_EQ|INE467B01029": "TCS",
+    }
+    assert collector.stats()["cycles"] == 1
+
+
+def test_missing_quotes_are_not_ticks(monkeypatch):
+    class PartialProvider:
+        async def fetch_quotes(self, keys):
+            return {"NSE_EQ|INE467B01029": {"error": "no data"}}
+
+    monkeypatch.setattr(collector_module, "get_upstox_provider", PartialProvider)
+    aggregator = BarAggregator(["1"])
+    monkeypatch.setattr(collector_module, "bar_aggregator", aggregator)
+
+    result = asyncio.run(PriceCollector().collect_once(["TCS", "INFY"]))
+    assert result["quoted"] == 0 and aggregator.ticks == 0
@@ -0,0 +1,119 @@
+# tests/test_embedding_cache.py
+
+import asyncio
+
+import numpy as np
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app import models
+from app.services import embedding_cache
+from app.services.embedding_cache import EmbeddingCache, cache_key
+
+MODEL = "test-embedding"
+
+
+def _vec(i, dim=4):
+    return np.arange(dim, dtype=np.float32) + i
+
+
+def test_key_ignores_whitespace_and_width_but_not_model():
+    assert cache_key("RSI  is\noverbought", MODEL) == cache_key(" RSI is overbought ", MODEL)
+    assert cache_key("ＲＳＩ", MODEL) == cache_key("RSI", MODEL)
+    assert cache_key("RSI", MODEL) != cache_key("RSI", "other-model")
+
+
+# ===============================
+# MEMORY TIER
+# ===============================
+def test_memory_tier_is_lru_bounded():
+    cache = EmbeddingCache(MODEL, max_entries=2, persist=False)
+
+    async def main():
+        await cache.put_many({"a": _vec(0), "b": _vec(1)})
+        await cache.get_many(["a"])  # "b" is now least recently used
+        await cache.put_many({"c": _vec(2)})
+        return await cache.get_many(["a", "b", "c"])
+
+    found = asyncio.run(main())
+    assert set(found) == {"a", "c"}
+    assert found["c"].dtype == np.float32
+    assert cache.stats()["memory_hits"] == 3 and cache.stats()["misses"] == 1
+
+
+# ===============================
+# DB TIER
+# ===============================
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'embeddings.db'}")
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr(embedding_cache, "AsyncSessionLocal", sessions)
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(models.Base.metadata.create_all)
+
+    asyncio.run(create())
+    yield sessions
+    asyncio.run(engine.dispose())
+
+
+def test_db_tier_serves_a_fresh_process(db):
+    async def main():
+        await EmbeddingCache(MODEL).put_many({"a": _vec(0), "b": _vec(1)})
+        cache = EmbeddingCache(MODEL)
+        first = await cache.get_many(["a", "b", "c"])
+        second = await cache.get_many(["a"])
+        return cache, first, second
+
+    cache, first, second = asyncio.run(main())
+    assert set(first) == {"a", "b"}
+    np.testing.assert_array_equal(first["b"], _vec(1))
+    assert "a" in second
+    stats = cache.stats()
+    assert (stats["db_hits"], stats["memory_hits"], stats["misses"]) == (2, 1, 1)
+
+
+def test_undecodable_row_is_a_miss(db):
+    async def main():
+        async with db() as session:
+            session.add(models.EmbeddingCacheEntry(key="bad", model=MODEL, vector=b"\x00\x01\x02"))
+            await session.commit()
+        cache = EmbeddingCache(MODEL)
+        return cache, await cache.get_many(["bad"])
+
+    cache, found = asyncio.run(main())
+    assert found == {} and cache.misses == 1
+
+
+def test_db_tier_is_pruned_to_its_bound(db, monkeypatch):
+    monkeypatch.setattr(embedding_cache, "PRUNE_EVERY_WRITES", 4)
+    cache = EmbeddingCache(MODEL, db_max_entries=3)
+
+    async def main():
+        for i in range(4):
+            await cache.put_many({f"k{i}": _vec(i)})
+        async with db() as session:
+            return await session.scalar(
+                select(func.count()).select_from(models.EmbeddingCacheEntry)
+            )
+
+    assert asyncio.run(main()) == 3
+    assert cache.stats()["db_pruned"] == 1
+
+
+def test_failing_db_tier_only_costs_hit_rate(monkeypatch):
+    def broken():
+        raise ConnectionError("db down")
+
+    monkeypatch.setattr(embedding_cache, "AsyncSessionLocal", broken)
+    cache = EmbeddingCache(MODEL)
+
+    async def main():
+        await cache.put_many({"a": _vec(0)})
+        return await cache.get_many(["a", "b"])
+
+    assert set(asyncio.run(main())) == {"a"}
+    assert cache.misses == 1
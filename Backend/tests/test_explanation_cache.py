@@ -0,0 +1,72 @@
+# tests/test_explanation_cache.py
+
+import asyncio
+
+import pytest
+from pydantic import ValidationError
+
+from app.core.config import Settings
+from app.services.explanation_cache import ExplanationCache, indicator_bucket
+
+
+def test_bucket_steps_must_be_positive():
+    for name in ("EXPLAIN_CACHE_RSI_BUCKET", "EXPLAIN_CACHE_PCT_BUCKET"):
+        with pytest.raises(ValidationError):
+            Settings(**{name: 0})
+
+
+def test_near_identical_states_share_a_bucket():
+    # RSI 5-point bands, 0.5 % spreads (defaults)
+    a = indicator_bucket(61.2, 100.0, 101.1, 102.3)
+    b = indicator_bucket("63.9", 100.0, 101.4, 102.4)
+    assert a == b == (12, 2, 4)
+
+    assert indicator_bucket(65.0, 100.0, 101.1, 102.3)[0] == 13
+    # EMA crossing below SMA changes the bucket sign
+    assert indicator_bucket(61.2, 100.0, 99.9, 102.3)[1] == -1
+
+
+def test_missing_or_invalid_values_bucket_as_none():
+    assert indicator_bucket(None, None, "x", float("nan")) == (None, None, None)
+    assert indicator_bucket(150, 0, 1, 1) == (20, None, None)  # RSI clamped, no SMA base
+
+
+class CountingLLM:
+    def __init__(self, answer="Explained.", delay=0.02):
+        self.answer = answer
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.answer
+
+
+def test_concurrent_misses_share_one_generation():
+    cache = ExplanationCache()
+    llm = CountingLLM()
+
+    async def main():
+        return await asyncio.gather(*(
+            cache.get_or_generate("abc", 61 + i * 0.5, 100.0, 101.1, 102.3, llm)
+            for i in range(5)
+        ))
+
+    answers = asyncio.run(main())
+    assert answers == ["Explained."] * 5
+    assert llm.calls == 1
+    assert cache.misses == 1 and cache.coalesced == 4
+
+    # Later requests in the same bucket are hits
+    assert asyncio.run(cache.get_or_generate("ABC", 62, 100, 101.2, 102.2, llm)) == "Explained."
+    assert llm.calls == 1 and cache.hits == 1
+
+
+def test_error_answers_are_not_cached():
+    cache = ExplanationCache()
+    llm = CountingLLM(answer="AI service error: quota", delay=0)
+
+    asyncio.run(cache.get_or_generate("ABC", 50, 100, 100, 100, llm))
+    asyncio.run(cache.get_or_generate("ABC", 50, 100, 100, 100, llm))
+    assert llm.calls == 2 and not cache._entries
@@ -0,0 +1,50 @@
+# tests/test_indicator_state.py
+
+from app.services.indicator_state import IndicatorState
+from app.services.sessions import in_session, is_valid_resolution
+
+# Monday 2023-11-13, 09:15 IST
+MONDAY_OPEN = 1_699_847_100_000
+MINUTE = 60_000
+
+
+def _candles(n):
+    return [
+        {"time": MONDAY_OPEN + i * MINUTE, "close": 100.0 + (i % 5)}
+        for i in range(n)
+    ]
+
+
+def test_in_session_bounds():
+    assert in_session(MONDAY_OPEN)
+    assert in_session(MONDAY_OPEN + 375 * MINUTE)  # 15:30
+    assert not in_session(MONDAY_OPEN - MINUTE)
+    assert not in_session(MONDAY_OPEN + 376 * MINUTE)
+    assert not in_session(MONDAY_OPEN - 2 * 86_400_000)  # Saturday
+
+
+def test_off_hours_ticks_do_not_commit_bars():
+    state = IndicatorState(period=5, resolution="1")
+    state.seed(_candles(30))
+    before = state.values()
+
+    evening = MONDAY_OPEN + 10 * 60 * MINUTE  # 19:15 IST
+    for i in range(120):
+        after = state.on_tick(50.0, evening + i * MINUTE)
+
+    assert after == before
+
+
+def test_in_session_tick_closes_forming_bar():
+    state = IndicatorState(period=5, resolution="1")
+    state.seed(_candles(30))
+    before = state.values()
+
+    state.on_tick(130.0, MONDAY_OPEN + 31 * MINUTE)
+    assert state.values() != before
+
+
+def test_resolution_validation():
+    assert all(is_valid_resolution(r) for r in ("1", "5", "15", "30", "60", "D", "W"))
+    assert not is_valid_resolution("2")
+    assert not is_valid_resolution("")
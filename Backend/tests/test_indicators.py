@@ -0,0 +1,263 @@
+# tests/test_indicators.py
+
+# Parity of the vectorized indicator engine with plain-loop versions.
+# sma/ema/rsi below are the original list implementations; the others
+# are straightforward per-bar loops of the same definitions.
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+from app.services import indicators
+
+
+# ===============================
+# REFERENCE (loop) IMPLEMENTATIONS
+# ===============================
+def ref_sma(values, period=14):
+    result = []
+    for i in range(len(values)):
+        if i < period:
+            result.append(None)
+        else:
+            result.append(sum(values[i-period:i]) / period)
+    return result
+
+
+def ref_ema(values, period=14):
+    result = []
+    k = 2 / (period + 1)
+    ema_prev = None
+
+    for price in values:
+        if ema_prev is None:
+            ema_prev = price
+        else:
+            ema_prev = price * k + ema_prev * (1 - k)
+        result.append(ema_prev)
+
+    return result
+
+
+def ref_rsi(values, period=14):
+    gains = []
+    losses = []
+
+    for i in range(1, len(values)):
+        delta = values[i] - values[i - 1]
+        gains.append(max(delta, 0))
+        losses.append(abs(min(delta, 0)))
+
+    avg_gain = sum(gains[:period]) / period
+    avg_loss = sum(losses[:period]) / period
+
+    rsi_values = [None] * period
+
+    for i in range(period, len(values)):
+        avg_gain = (avg_gain * (period - 1) + gains[i - 1]) / period
+        avg_loss = (avg_loss * (period - 1) + losses[i - 1]) / period
+
+        rs = avg_gain / avg_loss if avg_loss != 0 else 0
+        rsi_values.append(100 - (100 / (1 + rs)))
+
+    return rsi_values
+
+
+def ref_macd(values, fast=12, slow=26, signal=9):
+    macd = [f - s for f, s in zip(ref_ema(values, fast), ref_ema(values, slow))]
+    signal_line = ref_ema(macd, signal)
+    return macd, signal_line, [m - s for m, s in zip(macd, signal_line)]
+
+
+def ref_bollinger(values, period=20, num_std=2.0):
+    mid, upper, lower = [], [], []
+    for i in range(len(values)):
+        if i < period - 1:
+            mid.append(None), upper.append(None), lower.append(None)
+            continue
+        window = values[i - period + 1:i + 1]
+        mean = sum(window) / period
+        std = math.sqrt(sum((v - mean) ** 2 for v in window) / period)
+        mid.append(mean)
+        upper.append(mean + num_std * std)
+        lower.append(mean - num_std * std)
+    return mid, upper, lower
+
+
+def ref_atr(high, low, close, period=14):
+    n = len(close)
+    out = [None] * n
+    if n < period:
+        return out
+    tr = []
+    for i in range(n):
+        if i == 0:
+            tr.append(high[0] - low[0])
+        else:
+            tr.append(max(
+                high[i] - low[i],
+                abs(high[i] - close[i - 1]),
+                abs(low[i] - close[i - 1]),
+            ))
+    avg = sum(tr[:period]) / period
+    out[period - 1] = avg
+    for i in range(period, n):
+        avg = (avg * (period - 1) + tr[i]) / period
+        out[i] = avg
+    return out
+
+
+def ref_vwap(high, low, close, volume, time=None):
+    out = []
+    cum_pv = cum_v = 0.0
+    session = None
+    for i in range(len(close)):
+        if time is not None:
+            day = (time[i] + indicators.IST_OFFSET_MS) // indicators.DAY_MS
+            if day != session:
+                session, cum_pv, cum_v = day, 0.0, 0.0
+        cum_pv += (high[i] + low[i] + close[i]) / 3 * volume[i]
+        cum_v += volume[i]
+        out.append(cum_pv / cum_v if cum_v else None)
+    return out
+
+
+# ===============================
+# FIXTURES
+# ===============================
+def _series(n, start=100.0, seed=7):
+    rng = random.Random(seed)
+    out, price = [], start
+    for _ in range(n):
+        price = max(1.0, price + rng.uniform(-1.5, 1.5))
+        out.append(round(price, 2))
+    return out
+
+
+def _ohlcv(n, seed=11):
+    rng = random.Random(seed)
+    close = _series(n, seed=seed)
+    high = [c + rng.uniform(0, 2) for c in close]
+    low = [c - rng.uniform(0, 2) for c in close]
+    volume = [float(rng.randint(0, 5000)) for _ in close]
+    # Two IST sessions, one bar per minute starting 09:15 IST
+    start = 1_700_020_500_000
+    time = [start + i * 60_000 for i in range(n // 2)]
+    time += [start + 86_400_000 + i * 60_000 for i in range(n - n // 2)]
+    return high, low, close, volume, time
+
+
+def assert_parity(actual, expected, rel=1e-9, abs_=1e-9):
+    actual = list(actual)
+    assert len(actual) == len(expected)
+    for i, (a, e) in enumerate(zip(actual, expected)):
+        a = None if a is None or (isinstance(a, float) and math.isnan(a)) else a
+        if e is None:
+            assert a is None, f"index {i}: expected warm-up gap, got {a}"
+        else:
+            assert a == pytest.approx(e, rel=rel, abs=abs_), f"index {i}"
+
+
+LENGTHS = [0, 1, 5, 13, 14, 15, 26, 200]
+
+
+# ===============================
+# LIST API
+# ===============================
+@pytest.mark.parametrize("n", LENGTHS)
+def test_sma_matches_loop(n):
+    values = _series(n)
+    assert_parity(indicators.sma(values, 14), ref_sma(values, 14))
+
+
+@pytest.mark.parametrize("n", LENGTHS)
+def test_ema_matches_loop(n):
+    values = _series(n)
+    assert_parity(indicators.ema(values, 14), ref_ema(values, 14))
+
+
+@pytest.mark.parametrize("n", LENGTHS)
+def test_rsi_matches_loop(n):
+    values = _series(n)
+    assert_parity(indicators.rsi(values, 14), ref_rsi(values, 14))
+
+
+def test_rsi_without_losses_is_zero():
+    values = [float(v) for v in range(1, 40)]
+    assert_parity(indicators.rsi(values, 14), ref_rsi(values, 14))
+
+
+# ===============================
+# ARRAY ENGINE
+# ===============================
+@pytest.mark.parametrize("n", LENGTHS)
+def test_sma_array_warm_up_is_nan(n):
+    out = indicators.sma_array(_series(n), 14)
+    assert len(out) == n
+    assert np.isnan(out[:min(n, 14)]).all()
+
+
+@pytest.mark.parametrize("n", LENGTHS)
+def test_macd_matches_loop(n):
+    values = _series(n)
+    for actual, expected in zip(indicators.macd_array(values), ref_macd(values)):
+        assert_parity(indicators.to_list(actual), expected)
+
+
+@pytest.mark.parametrize("n", LENGTHS)
+def test_bollinger_matches_loop(n):
+    values = _series(n)
+    for actual, expected in zip(indicators.bollinger_array(values), ref_bollinger(values)):
+        assert_parity(indicators.to_list(actual), expected)
+
+
+def test_bollinger_is_stable_at_high_price_levels():
+    # ~1e5 with sub-paisa moves: sum-of-squares variance cancels here
+    values = [100000.0 + 0.001 * ((i * 7) % 5) for i in range(300)]
+    mid, upper, lower = indicators.bollinger_array(values)
+    ref_mid, ref_upper, ref_lower = ref_bollinger(values)
+
+    assert not np.isnan(upper[19:]).any()
+    assert (upper[19:] >= mid[19:]).all()
+    band = [u - m for u, m in zip(ref_upper[19:], ref_mid[19:])]
+    assert_parity(upper[19:] - mid[19:], band, rel=1e-6, abs_=1e-9)
+
+
+@pytest.mark.parametrize("n", LENGTHS)
+def test_atr_matches_loop(n):
+    high, low, close, _, _ = _ohlcv(n)
+    assert_parity(
+        indicators.to_list(indicators.atr_array(high, low, close, 14)),
+        ref_atr(high, low, close, 14),
+    )
+
+
+@pytest.mark.parametrize("n", LENGTHS)
+@pytest.mark.parametrize("intraday", [True, False])
+def test_vwap_matches_loop(n, intraday):
+    high, low, close, volume, time = _ohlcv(n)
+    time = time if intraday else None
+    assert_parity(
+        indicators.to_list(indicators.vwap_array(high, low, close, volume, time)),
+        ref_vwap(high, low, close, volume, time),
+    )
+
+
+def test_vwap_zero_volume_is_undefined():
+    out = indicators.vwap_array([2.0, 3.0], [1.0, 2.0], [1.5, 2.5], [0.0, 0.0])
+    assert np.isnan(out).all()
+
+
+def test_compute_indicators_columns_have_input_length():
+    high, low, close, volume, time = _ohlcv(60)
+    ohlcv = {
+        "time": np.asarray(time, dtype=np.int64),
+        "high": np.asarray(high),
+        "low": np.asarray(low),
+        "close": np.asarray(close),
+        "volume": np.asarray(volume),
+    }
+    values = indicators.compute_indicators(ohlcv, period=14)
+    assert all(len(v) == 60 for v in values.values())
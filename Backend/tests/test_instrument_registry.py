@@ -0,0 +1,152 @@
+# tests/test_instrument_registry.py
+
+import io
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.main import app
+from app.services import instrument_registry
+from app.services.instrument_registry import InstrumentTable, canonical_symbol, option_chain
+from app.services.symbol_resolver import get_canonical_symbol
+
+TODAY = date.today()
+PAST = str(TODAY - timedelta(days=7))
+NEAR = str(TODAY + timedelta(days=3))
+FAR = str(TODAY + timedelta(days=31))
+
+HEADER = "instrument_key,tradingsymbol,name,expiry,strike,lot_size,instrument_type,option_type,exchange"
+ROWS = [
+    "NSE_EQ|INE002A01018,RELIANCE,RELIANCE INDUSTRIES LTD,,,1,EQUITY,,NSE_EQ",
+    "BSE_EQ|INE002A01018,RELIANCE,RELIANCE INDUSTRIES LTD,,,1,EQUITY,,BSE_EQ",
+    "NSE_EQ|INE330H01018,RELINFRA,RELIANCE INFRASTRUCTURE LTD,,,1,EQUITY,,NSE_EQ",
+    "NSE_EQ|INE467B01029,TCS,TATA CONSULTANCY SERV LT,,,1,EQUITY,,NSE_EQ",
+    "NSE_EQ|INE155A01022,TATAMOTORS,TATA MOTORS LIMITED,,,1,EQUITY,,NSE_EQ",
+    "NSE_EQ|INE009A01021,INFY,INFOSYS LIMITED,,,1,EQUITY,,NSE_EQ",
+    "NSE_EQ|INE758T01015,ZOMATO,ZOMATO LIMITED,,,1,EQUITY,,NSE_EQ",
+    # Derivatives are listed under the company name
+    f"NSE_FO|1,RELIANCE{PAST}FUT,RELIANCE INDUSTRIES LTD,{PAST},0,250,FUTSTK,FUT,NSE_FO",
+    f"NSE_FO|2,RELIANCE{NEAR}FUT,RELIANCE INDUSTRIES LTD,{NEAR},0,250,FUTSTK,FUT,NSE_FO",
+    f"NSE_FO|3,RELIANCE{NEAR}2600CE,RELIANCE INDUSTRIES LTD,{NEAR},2600,250,OPTSTK,CE,NSE_FO",
+    f"NSE_FO|4,RELIANCE{NEAR}2500PE,RELIANCE INDUSTRIES LTD,{NEAR},2500,250,OPTSTK,PE,NSE_FO",
+    f"NSE_FO|5,RELIANCE{FAR}FUT,RELIANCE INDUSTRIES LTD,{FAR},0,250,FUTSTK,FUT,NSE_FO",
+    f"BSE_FO|6,RELIANCE{NEAR}BFUT,RELIANCE INDUSTRIES LTD,{NEAR},0,250,FUTSTK,FUT,BSE_FO",
+]
+
+
+@pytest.fixture
+def table(monkeypatch):
+    frame = instrument_registry._read_master(io.StringIO("\n".join([HEADER] + ROWS)))
+    table = InstrumentTable.from_frame(frame)
+    monkeypatch.setattr(instrument_registry, "_table", table)
+    return table
+
+
+def _hits(results):
+    return [(r["symbol"], r["exchange"], r["match"]) for r in results]
+
+
+# ===============================
+# SEARCH RANKING
+# ===============================
+def test_exact_before_prefix_and_nse_before_bse(table):
+    hits = _hits(table.search("reliance", limit=20))
+    assert hits[:2] == [("RELIANCE", "NSE_EQ", "exact"), ("RELIANCE", "BSE_EQ", "exact")]
+    # Contract symbols complete the prefix; name matches come last
+    assert {m for _, _, m in hits[2:-1]} == {"symbol"}
+    assert hits[-1] == ("RELINFRA", "NSE_EQ", "name")
+
+
+def test_symbol_prefix_before_name_prefix(table):
+    hits = _hits(table.search("TA"))
+    assert hits[0] == ("TATAMOTORS", "NSE_EQ", "symbol")
+    assert ("TCS", "NSE_EQ", "name") in hits
+    assert hits.index(("TATAMOTORS", "NSE_EQ", "symbol")) < hits.index(("TCS", "NSE_EQ", "name"))
+
+
+def test_multi_word_name_prefix(table):
+    assert _hits(table.search("tata cons")) == [("TCS", "NSE_EQ", "name")]
+
+
+def test_fuzzy_only_without_direct_hits(table):
+    assert _hits(table.search("INFOSIS")) == [("INFY", "NSE_EQ", "fuzzy")]
+    assert all(r["match"] != "fuzzy" for r in table.search("INF"))
+
+
+def test_namespace_restricts_exchange(table):
+    assert _hits(table.search("BSE:RELIANCE", limit=1)) == [("RELIANCE", "BSE_EQ", "exact")]
+
+
+def test_derivatives_are_not_name_matched(table):
+    hits = table.search("reliance industries", limit=20)
+    assert [(r["symbol"], r["exchange"]) for r in hits] == [
+        ("RELIANCE", "NSE_EQ"), ("RELIANCE", "BSE_EQ"),
+    ]
+
+
+# ===============================
+# CANONICAL SYMBOL
+# ===============================
+def test_spellings_of_one_instrument_share_a_symbol(table):
+    assert {
+        canonical_symbol(s)
+        for s in ("reliance", " RELIANCE", "NSE:RELIANCE", "NSE_EQ:RELIANCE")
+    } == {"RELIANCE"}
+
+
+def test_non_default_segment_keeps_its_namespace(table):
+    assert canonical_symbol("BSE:RELIANCE") == "BSE_EQ:RELIANCE"
+    assert canonical_symbol("BSE_EQ:RELIANCE") == "BSE_EQ:RELIANCE"
+
+
+def test_unresolved_symbol_is_kept_as_given(table):
+    assert canonical_symbol("nosuch") is None
+    assert get_canonical_symbol(" nosuch ") == "NOSUCH"
+
+
+# ===============================
+# OPTION CHAIN
+# ===============================
+def test_default_expiry_is_nearest_unexpired(table):
+    chain = option_chain("RELIANCE")
+
+    assert chain["underlying"] == "RELIANCE INDUSTRIES LTD"
+    assert chain["expiry"] == NEAR
+    assert chain["expiries"] == [PAST, NEAR, FAR]
+    assert [(c["contract"], c["strike"]) for c in chain["contracts"] if c["exchange"] == "NSE_FO"] == [
+        ("FUT", 0.0), ("PE", 2500.0), ("CE", 2600.0),
+    ]
+
+
+def test_explicit_expiry_and_exchange(table):
+    chain = option_chain("RELIANCE INDUSTRIES LTD", expiry=FAR)
+    assert [c["instrument_key"] for c in chain["contracts"]] == ["NSE_FO|5"]
+
+    bse = option_chain("RELIANCE", exchange="bse")
+    assert [c["instrument_key"] for c in bse["contracts"]] == ["BSE_FO|6"]
+
+
+def test_unknown_underlying_is_empty(table):
+    assert option_chain("NOSUCH")["contracts"] == []
+
+
+def test_invalid_expiry_is_400(table):
+    app.dependency_overrides[deps.get_current_user] = lambda: object()
+    try:
+        response = TestClient(app).get(
+            "/api/market/instruments/option-chain",
+            params={"underlying": "RELIANCE", "expiry": "2024-13-45"},
+        )
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 400
+
+
+def test_instrument_routes_require_auth(table):
+    client = TestClient(app)
+    assert client.get("/api/market/instruments/search", params={"q": "REL"}).status_code == 401
+    assert client.get(
+        "/api/market/instruments/option-chain", params={"underlying": "RELIANCE"}
+    ).status_code == 401
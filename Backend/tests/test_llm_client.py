@@ -0,0 +1,121 @@
+# tests/test_llm_client.py
+
+# LLMClient against a stub Gemini API (httpx MockTransport).
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.api.v1 import chat
+from app.main import app
+from app.services import llm_client
+
+
+def _candidate(text):
+    return {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}]}
+
+
+class StubGemini:
+    """
+    Answers generateContent with JSON and streamGenerateContent with SSE
+    chunks; `status` != 200 returns a Google-style error body instead.
+    """
+
+    def __init__(self, chunks=("Hel", "lo"), status=200):
+        self.chunks = chunks
+        self.status = status
+        self.paths = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.paths.append(request.url.path)
+        if self.status != 200:
+            return httpx.Response(self.status, json={"error": {
+                "code": self.status, "message": "API key not valid", "status": "PERMISSION_DENIED",
+            }})
+        if request.url.path.endswith(":streamGenerateContent"):
+            body = "".join(f"data: {json.dumps(_candidate(c))}\r\n\r\n" for c in self.chunks)
+            return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+        return httpx.Response(200, json=_candidate("".join(self.chunks)))
+
+
+@pytest.fixture
+def make_client(monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(llm_client.settings, "GEMINI_BASE_URL", None)
+
+    def make(stub):
+        return llm_client.LLMClient(
+            http_options={"async_client_args": {"transport": httpx.MockTransport(stub)}}
+        )
+
+    return make
+
+
+def _collect(client, system="sys", message="hi"):
+    async def main():
+        tokens = await client.aopen_stream(system, message)
+        return [t async for t in tokens]
+
+    return asyncio.run(main())
+
+
+def test_achat_returns_text(make_client):
+    stub = StubGemini(chunks=("  An answer  ",))
+    answer = asyncio.run(make_client(stub).achat("sys", "hi"))
+
+    assert answer == "An answer"
+    assert stub.paths[-1].endswith("models/gemini-2.5-flash:generateContent")
+
+
+def test_achat_maps_errors_to_message(make_client):
+    answer = asyncio.run(make_client(StubGemini(status=403)).achat("sys", "hi"))
+    assert answer.startswith("AI service error:")
+
+
+def test_stream_yields_sse_chunks_in_order(make_client):
+    stub = StubGemini(chunks=("Markets ", "are ", "open."))
+    assert _collect(make_client(stub)) == ["Markets ", "are ", "open."]
+    assert stub.paths[-1].endswith(":streamGenerateContent")
+
+
+def test_stream_rejection_raises_before_first_token(make_client):
+    with pytest.raises(Exception):
+        _collect(make_client(StubGemini(status=403)))
+
+
+@pytest.fixture
+def api(make_client, monkeypatch):
+    async def prompt(payload, db):
+        return "sys", payload.question, ["doc#0"]
+
+    monkeypatch.setattr(chat, "_build_chat_prompt", prompt)
+    app.dependency_overrides[deps.get_current_user] = lambda: object()
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_stream_endpoint_sends_sources_tokens_done(api, make_client, monkeypatch):
+    monkeypatch.setattr(llm_client, "_client", make_client(StubGemini(chunks=("a", "b"))))
+
+    response = api.post("/api/chat/query/stream", json={"question": "q"})
+
+    assert response.status_code == 200
+    events = [e for e in response.text.split("\n\n") if e]
+    assert events[0] == 'event: sources\ndata: {"sources": ["doc#0"]}'
+    assert events[1:3] == ['data: {"token": "a"}', 'data: {"token": "b"}']
+    assert events[3] == "event: done\ndata: {}"
+
+
+def test_stream_endpoint_maps_upstream_rejection_to_503(api, make_client, monkeypatch):
+    monkeypatch.setattr(llm_client, "_client", make_client(StubGemini(status=403)))
+
+    response = api.post("/api/chat/query/stream", json={"question": "q"})
+
+    assert response.status_code == 503
+    assert response.json()["detail"].startswith("AI service error")
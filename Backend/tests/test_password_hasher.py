@@ -0,0 +1,84 @@
+# tests/test_password_hasher.py
+
+import asyncio
+import threading
+
+import pytest
+
+from app.services import password_hasher as hasher_module
+from app.services.password_hasher import HasherBusy, PasswordHasher
+
+
+def test_hash_and_verify_run_on_the_pool():
+    hasher = PasswordHasher(workers=1)
+
+    async def main():
+        hashed = await hasher.hash("s3cret")
+        return hashed, await hasher.verify("s3cret", hashed), await hasher.verify("nope", hashed)
+
+    hashed, good, bad = asyncio.run(main())
+    assert hashed != "s3cret" and good and not bad
+    assert hasher.stats()["completed"] == 3
+
+
+def test_calls_never_run_on_the_event_loop_thread(monkeypatch):
+    threads = []
+
+    def fake_hash(password):
+        threads.append(threading.current_thread().name)
+        return password[::-1]
+
+    monkeypatch.setattr(hasher_module, "hash_password", fake_hash)
+    hasher = PasswordHasher(workers=2)
+
+    async def main():
+        return await asyncio.gather(*(hasher.hash(f"pw{i}") for i in range(4)))
+
+    assert asyncio.run(main()) == ["0wp", "1wp", "2wp", "3wp"]
+    assert all(name.startswith("bcrypt") for name in threads)
+
+
+def _blocking_hasher(monkeypatch, workers, max_queued):
+    release = threading.Event()
+
+    def slow_hash(password):
+        release.wait(5)
+        return password
+
+    monkeypatch.setattr(hasher_module, "hash_password", slow_hash)
+    return PasswordHasher(workers=workers, max_queued=max_queued), release
+
+
+def test_at_most_workers_calls_run_at_once(monkeypatch):
+    hasher, release = _blocking_hasher(monkeypatch, workers=2, max_queued=10)
+
+    async def main():
+        calls = [asyncio.create_task(hasher.hash(str(i))) for i in range(5)]
+        await asyncio.sleep(0.05)
+        running, waiting = hasher.running, hasher.waiting
+        release.set()
+        await asyncio.gather(*calls)
+        return running, waiting
+
+    assert asyncio.run(main()) == (2, 3)
+    stats = hasher.stats()
+    assert stats["completed"] == 5 and stats["max_waiting"] == 3 and stats["running"] == 0
+
+
+def test_full_queue_is_rejected(monkeypatch):
+    hasher, release = _blocking_hasher(monkeypatch, workers=1, max_queued=1)
+
+    async def main():
+        running = asyncio.create_task(hasher.hash("a"))
+        await asyncio.sleep(0.02)
+        queued = asyncio.create_task(hasher.hash("b"))
+        await asyncio.sleep(0.02)
+        try:
+            with pytest.raises(HasherBusy):
+                await hasher.hash("c")
+        finally:
+            release.set()
+        return await asyncio.gather(running, queued)
+
+    assert asyncio.run(main()) == ["a", "b"]
+    assert hasher.stats()["rejected"] == 1
@@ -0,0 +1,127 @@
+# tests/test_price_ingest.py
+
+import asyncio
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app import models
+from app.crud import prices as prices_crud
+from app.schemas import PriceIn
+from app.services import price_ingest
+
+
+def _bar(ts: str, close: float = 10.0, symbol: str = "ABC") -> dict:
+    return {
+        "asset_symbol": symbol,
+        "timestamp": ts,
+        "open": 9.0,
+        "high": 11.0,
+        "low": 8.0,
+        "close": close,
+        "volume": 100.0,
+    }
+
+
+async def _records(items):
+    for row, record in enumerate(items):
+        yield row, record
+
+
+def _run_ingest(tmp_path, items):
+    async def main():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ingest.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(models.Base.metadata.create_all)
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            result = await price_ingest.ingest(db, _records(items))
+            rows = (await db.execute(select(models.Price))).scalars().all()
+        await engine.dispose()
+        return result, rows
+
+    return asyncio.run(main())
+
+
+def test_offset_timestamps_are_normalized_to_utc():
+    price = PriceIn.model_validate(_bar("2024-01-02T09:15:00+05:30"))
+    assert price.timestamp == datetime(2024, 1, 2, 3, 45, tzinfo=timezone.utc)
+
+    naive = PriceIn.model_validate(_bar("2024-01-02T03:45:00"))
+    assert naive.timestamp == price.timestamp
+
+
+def test_duplicates_are_reported_and_last_row_wins(tmp_path):
+    result, rows = _run_ingest(tmp_path, [
+        _bar("2024-01-02T09:15:00+05:30", close=1.0),
+        _bar("2024-01-02T03:45:00Z", close=2.0),  # same bar as row 0
+        _bar("2024-01-02T03:46:00Z", close=3.0),
+        {"asset_symbol": "ABC"},
+    ])
+
+    assert result.accepted == 2
+    assert result.duplicates == [0]
+    assert [r.row for r in result.rejected] == [3]
+
+    closes = {prices_crud.to_millis(r.timestamp): r.close for r in rows}
+    first = int(datetime(2024, 1, 2, 3, 45, tzinfo=timezone.utc).timestamp() * 1000)
+    assert closes == {first: 2.0, first + 60_000: 3.0}
+
+
+def test_unknown_resolution_is_rejected(tmp_path):
+    result, rows = _run_ingest(tmp_path, [
+        dict(_bar("2024-01-02T03:45:00Z"), resolution="banana"),
+        dict(_bar("2024-01-02T03:45:00Z"), resolution="d"),
+    ])
+
+    assert [r.row for r in result.rejected] == [0]
+    assert "resolution" in result.rejected[0].error
+    assert [r.resolution for r in rows] == ["D"]
+
+
+def test_dedup_is_per_chunk(tmp_path, monkeypatch):
+    monkeypatch.setattr(price_ingest, "INGEST_CHUNK_SIZE", 2)
+    result, rows = _run_ingest(tmp_path, [
+        _bar("2024-01-02T03:45:00Z", close=1.0),
+        _bar("2024-01-02T03:45:00Z", close=2.0),  # same chunk: duplicate
+        _bar("2024-01-02T03:46:00Z", close=3.0),
+        _bar("2024-01-02T03:45:00Z", close=4.0),  # next chunk: overwrites
+    ])
+
+    assert result.duplicates == [0]
+    assert result.accepted == 3
+    assert sorted(r.close for r in rows) == [3.0, 4.0]
+
+
+async def _lines(text):
+    for line in text.split("\n"):
+        yield line
+
+
+def _parse_csv(text):
+    async def main():
+        return [item async for item in price_ingest._iter_csv(_lines(text))]
+
+    return asyncio.run(main())
+
+
+def test_csv_quoted_fields_may_contain_newlines():
+    records = _parse_csv(
+        'asset_symbol,note,close\n'
+        'ABC,"two\nlines, with comma",10.5\n'
+        '\n'
+        'XYZ,"say ""hi""",11\n'
+    )
+
+    assert records == [
+        (0, {"asset_symbol": "ABC", "note": "two\nlines, with comma", "close": "10.5"}),
+        (1, {"asset_symbol": "XYZ", "note": 'say "hi"', "close": "11"}),
+    ]
+
+
+def test_csv_bad_rows_are_reported_in_place():
+    records = _parse_csv('a,b\n1,2\n1,2,3\n"open\n')
+
+    assert records[0] == (0, {"a": "1", "b": "2"})
+    assert records[1][0] == 1 and isinstance(records[1][1], ValueError)
+    assert records[2][0] == 2 and isinstance(records[2][1], ValueError)
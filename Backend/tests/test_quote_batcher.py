@@ -0,0 +1,94 @@
+# tests/test_quote_batcher.py
+
+import asyncio
+
+from app.services.market_providers.batcher import QuoteBatcher
+from app.services.market_providers.upstox import UpstoxProvider
+
+
+class FakeProvider(UpstoxProvider):
+    """
+    Upstox provider whose bulk LTP call is a counted, slow fake.
+    """
+
+    def __init__(self, delay: float = 0.05):
+        super().__init__()
+        self.access_token = "test"
+        self.delay = delay
+        self.calls: list[list[str]] = []
+
+    async def fetch_quotes(self, instrument_keys):
+        self.calls.append(sorted(instrument_keys))
+        await asyncio.sleep(self.delay)
+        return {key: {"price": 100.0, "timestamp": 0} for key in instrument_keys}
+
+
+def test_concurrent_fetch_quote_is_one_upstream_call():
+    provider = FakeProvider()
+
+    async def main():
+        return await asyncio.gather(
+            *(provider.fetch_quote(key) for key in ["A", "B", "A", "C", "A"])
+        )
+
+    quotes = asyncio.run(main())
+    assert provider.calls == [["A", "B", "C"]]
+    assert all(q["price"] == 100.0 for q in quotes)
+
+
+def test_requests_during_upstream_call_join_it():
+    provider = FakeProvider(delay=0.1)
+
+    async def main():
+        first = [asyncio.create_task(provider.fetch_quote("A")) for _ in range(3)]
+        await asyncio.sleep(0.05)  # window closed, upstream call running
+        late = [asyncio.create_task(provider.fetch_quote("A")) for _ in range(3)]
+        return await asyncio.gather(*first, *late)
+
+    quotes = asyncio.run(main())
+    assert provider.calls == [["A"]]
+    assert len(quotes) == 6
+
+
+def test_new_keys_during_upstream_call_start_next_window():
+    provider = FakeProvider(delay=0.1)
+
+    async def main():
+        first = asyncio.create_task(provider.fetch_quote("A"))
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(provider.fetch_quote("B"))
+        await asyncio.gather(first, second)
+
+    asyncio.run(main())
+    assert provider.calls == [["A"], ["B"]]
+
+
+def test_errors_reach_every_waiter():
+    async def fail(keys):
+        raise RuntimeError("upstream down")
+
+    batcher = QuoteBatcher(fail)
+
+    async def main():
+        return await asyncio.gather(
+            batcher.get("A"), batcher.get("A"), batcher.get("B"),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert not batcher._inflight and not batcher._pending
+
+
+def test_cancelled_caller_does_not_cancel_others():
+    provider = FakeProvider(delay=0.05)
+
+    async def main():
+        leaver = asyncio.create_task(provider.fetch_quote("A"))
+        stayer = asyncio.create_task(provider.fetch_quote("A"))
+        await asyncio.sleep(0.02)
+        leaver.cancel()
+        return await stayer
+
+    assert asyncio.run(main())["price"] == 100.0
+    assert provider.calls == [["A"]]
@@ -0,0 +1,77 @@
+# tests/test_resample.py
+
+from app.services.resample import resample_candles
+from app.services.sessions import DAY_MS, IST_OFFSET_MS
+
+# Monday 2023-11-13, 09:15 IST
+MONDAY_OPEN = 1_699_847_100_000
+MONDAY_MIDNIGHT = MONDAY_OPEN - (9 * 60 + 15) * 60_000
+MINUTE = 60_000
+
+
+def _bars(start, n, step):
+    return [
+        {
+            "time": start + i * step,
+            "open": 100.0 + i,
+            "high": 101.0 + i,
+            "low": 99.0 + i,
+            "close": 100.5 + i,
+            "volume": 10.0,
+        }
+        for i in range(n)
+    ]
+
+
+def _ist_minutes(ts_ms):
+    return (ts_ms + IST_OFFSET_MS) % DAY_MS // MINUTE
+
+
+def test_intraday_buckets_anchor_to_session_open():
+    bars = resample_candles(_bars(MONDAY_OPEN, 375, MINUTE), "5")
+
+    assert len(bars) == 75
+    assert _ist_minutes(bars[0]["time"]) == 9 * 60 + 15
+    assert _ist_minutes(bars[1]["time"]) == 9 * 60 + 20
+    assert _ist_minutes(bars[-1]["time"]) == 15 * 60 + 25
+
+    first = bars[0]
+    assert first["open"] == 100.0
+    assert first["close"] == 104.5
+    assert first["high"] == 105.0
+    assert first["low"] == 99.0
+    assert first["volume"] == 50.0
+
+
+def test_hourly_buckets_are_09_15_to_10_15():
+    bars = resample_candles(_bars(MONDAY_OPEN, 375, MINUTE), "60")
+
+    assert [_ist_minutes(b["time"]) for b in bars] == [
+        9 * 60 + 15 + 60 * i for i in range(7)
+    ]
+    # The last hour is the 15:15-15:30 stub
+    assert bars[-1]["volume"] == 150.0
+
+
+def test_daily_to_weekly_starts_on_monday():
+    # Mon..Fri, then the next Mon..Wed
+    days = [MONDAY_MIDNIGHT + d * DAY_MS for d in (0, 1, 2, 3, 4, 7, 8, 9)]
+    daily = [dict(b, time=t) for b, t in zip(_bars(0, len(days), 1), days)]
+
+    weekly = resample_candles(daily, "W")
+
+    assert [b["time"] for b in weekly] == [MONDAY_MIDNIGHT, MONDAY_MIDNIGHT + 7 * DAY_MS]
+    assert weekly[0]["open"] == 100.0 and weekly[0]["close"] == 104.5
+    assert weekly[1]["open"] == 105.0 and weekly[1]["close"] == 107.5
+    assert weekly[0]["volume"] == 50.0
+
+
+def test_intraday_to_daily_stamps_ist_midnight():
+    bars = _bars(MONDAY_OPEN, 375, MINUTE) + _bars(MONDAY_OPEN + DAY_MS, 10, MINUTE)
+    daily = resample_candles(bars, "D")
+
+    assert [b["time"] for b in daily] == [MONDAY_MIDNIGHT, MONDAY_MIDNIGHT + DAY_MS]
+
+
+def test_empty_input():
+    assert resample_candles([], "5") == []
@@ -0,0 +1,172 @@
+# tests/test_vector_index.py
+
+import asyncio
+import json
+import time
+
+import numpy as np
+import pytest
+
+from app.services import vector_index
+from app.services.vector_index import pack_vector, unpack_vector
+
+
+def test_packed_vectors_starting_with_bracket_byte_roundtrip():
+    # Find float32 vectors whose first byte is 0x5B ("[")
+    rng = np.random.default_rng(0)
+    found = 0
+    for _ in range(5000):
+        vector = rng.standard_normal(8).astype(np.float32)
+        blob = pack_vector(vector)
+        if blob[:1] != b"[":
+            continue
+        found += 1
+        np.testing.assert_array_equal(unpack_vector(blob, dim=8), vector)
+    assert found > 0
+
+
+def test_bracket_both_ends_binary_is_not_json():
+    vector = np.frombuffer(b"[\x00\x80?\x00\x00\x80]", dtype=np.float32)
+    np.testing.assert_array_equal(unpack_vector(vector.tobytes()), vector)
+
+
+def test_legacy_json_rows():
+    values = [0.5, -1.0, 2.0]
+    np.testing.assert_array_equal(unpack_vector(json.dumps(values)), values)
+    np.testing.assert_array_equal(unpack_vector(json.dumps(values).encode()), values)
+
+
+def test_invalid_blobs_raise_value_error():
+    with pytest.raises(ValueError):
+        unpack_vector(b"\x00\x01\x02")
+    with pytest.raises(ValueError):
+        unpack_vector(pack_vector([1.0, 2.0]), dim=3)
+
+
+# ===============================
+# SHARED INDEX ACROSS PROCESSES
+# ===============================
+@pytest.fixture
+def index_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_index.settings, "VECTOR_INDEX_DIR", str(tmp_path))
+    monkeypatch.setattr(vector_index, "_index", None)
+    return tmp_path
+
+
+def _unit(i, dim=4):
+    vector = np.zeros(dim, dtype=np.float32)
+    vector[i % dim] = 1.0
+    return vector
+
+
+def test_api_picks_up_index_saved_by_another_process(index_dir):
+    seed = vector_index.VectorIndex(4, path=str(index_dir))
+    seed.add([1, 2], np.stack([_unit(0), _unit(1)]))
+    seed.save()
+
+    api = vector_index.get_loaded_index()
+    api.add([4], _unit(3)[None])  # unsaved in the API process
+
+    # The ingestion CLI saves a newer generation
+    cli = vector_index.VectorIndex.load(str(index_dir))
+    cli.add([3], _unit(2)[None])
+    cli.remove([1])
+    cli.save()
+
+    index = vector_index.get_loaded_index()
+    assert index is not api
+    assert index.search(_unit(2), top_k=1)[0][0] == 3
+    assert index.search(_unit(3), top_k=1)[0][0] == 4
+    assert len(index) == 3
+
+    # Saving from the API keeps the CLI's vectors
+    asyncio.run(vector_index.save_vector_index())
+    on_disk = vector_index.VectorIndex.load(str(index_dir))
+    assert sorted(on_disk._base_ids.tolist()) == [2, 3, 4]
+
+
+def test_save_prunes_old_generations(index_dir):
+    index = vector_index.VectorIndex(4, path=str(index_dir))
+    for i in range(4):
+        index.add([i], _unit(i)[None])
+        index.save()
+
+    assert index.generation == 4
+    names = {p.name for p in index_dir.iterdir()}
+    assert {"vectors.4.npy", "vectors.3.npy", "ids.4.npy"} <= names
+    assert "vectors.1.npy" not in names and "vectors.2.npy" not in names
+    assert len(vector_index.VectorIndex.load(str(index_dir))) == 4
+
+
+def test_rebuild_from_db_loads_every_decodable_row(index_dir, tmp_path, monkeypatch):
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from app import models
+    from app.db import session as db_session
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'rebuild.db'}")
+    monkeypatch.setattr(
+        db_session, "AsyncSessionLocal", async_sessionmaker(engine, expire_on_commit=False)
+    )
+    rng = np.random.default_rng(1)
+    vectors = rng.standard_normal((250, 8)).astype(np.float32)
+
+    async def main():
+        async with engine.begin() as conn:
+            await conn.run_sync(models.Base.metadata.create_all)
+        async with db_session.AsyncSessionLocal() as db:
+            db.add_all(
+                models.DocumentEmbedding(
+                    doc_id=f"doc#{i}", text="t", embedding=pack_vector(v)
+                )
+                for i, v in enumerate(vectors)
+            )
+            db.add(models.DocumentEmbedding(doc_id="bad#0", text="t", embedding=b"\x00\x01\x02"))
+            await db.commit()
+        try:
+            return await vector_index.rebuild_from_db()
+        finally:
+            await engine.dispose()
+
+    index = asyncio.run(main())
+    assert len(index) == 250
+    assert vector_index.get_loaded_index() is index
+    best_id, score = index.search(vectors[42], top_k=1)[0]
+    assert best_id == 43 and score == pytest.approx(1.0, abs=1e-5)
+    assert len(vector_index.VectorIndex.load(str(index_dir))) == 250
+
+
+def test_asave_keeps_the_event_loop_free(index_dir, monkeypatch):
+    index = vector_index.VectorIndex(4, path=str(index_dir))
+    index.add([1, 2], np.stack([_unit(0), _unit(1)]))
+
+    compact = vector_index.VectorIndex._compact
+
+    def slow_compact(self, nlist):
+        time.sleep(0.2)
+        return compact(self, nlist)
+
+    monkeypatch.setattr(vector_index.VectorIndex, "_compact", slow_compact)
+
+    async def main():
+        ticks = 0
+        results = []
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                # Searches during the save see the old (delta) rows
+                results.append(index.search(_unit(1), top_k=1)[0][0])
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        await index.asave()
+        task.cancel()
+        return ticks, results
+
+    ticks, results = asyncio.run(main())
+    assert ticks >= 5
+    assert set(results) == {2}
+    assert index.generation == 1 and not index._delta
+    assert len(vector_index.VectorIndex.load(str(index_dir))) == 2